@@ -0,0 +1,82 @@
+"""
+Shared response cache for the public catalog endpoints (jobs, courses, tasks).
+
+Entries are keyed by catalog name, a per-catalog version number and the
+normalized query string. Any write that can change a catalog bumps its version,
+so older entries are simply never read again and expire on their own.
+"""
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+
+def _version_key(catalog):
+    return f'catalog:{catalog}:version'
+
+
+def catalog_version(catalog):
+    version = cache.get(_version_key(catalog))
+    if version is None:
+        cache.add(_version_key(catalog), 1, timeout=None)
+        version = cache.get(_version_key(catalog), 1)
+    return version
+
+
+def bump_catalog_version(catalog):
+    try:
+        cache.incr(_version_key(catalog))
+    except ValueError:
+        cache.add(_version_key(catalog), 2, timeout=None)
+
+
+def invalidate_catalog(catalog):
+    """
+    Invalidate a catalog now and again once the surrounding transaction commits.
+
+    The second bump discards anything a concurrent reader cached from the
+    pre-commit state, so readers never keep a stale approval around.
+    """
+    bump_catalog_version(catalog)
+    transaction.on_commit(lambda: bump_catalog_version(catalog))
+
+
+def normalized_params(request):
+    """The query string with blank values dropped, whitespace stripped and keys sorted."""
+    params = sorted(
+        (key, value.strip())
+        for key, values in request.GET.lists()
+        for value in values
+        if value.strip()
+    )
+    return urlencode(params)
+
+
+def catalog_cache_key(catalog, request):
+    digest = hashlib.md5(normalized_params(request).encode()).hexdigest()
+    return f'catalog:{catalog}:v{catalog_version(catalog)}:{digest}'
+
+
+def cache_catalog_response(catalog):
+    """
+    Cache successful responses of a catalog list view.
+
+    Apply below @api_view/@permission_classes so authentication still runs first.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            key = catalog_cache_key(catalog, request)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+            return response
+        return wrapped
+    return decorator
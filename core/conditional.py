@@ -0,0 +1,57 @@
+"""
+Conditional GET support (ETag / If-None-Match) for DRF function views.
+
+Each view supplies a cheap validator function that never serializes the body,
+typically a catalog version number (see core/cache.py) or a small aggregate
+over the rows the view would return.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import catalog_version, normalized_params
+
+
+def _matches(if_none_match, etag):
+    if if_none_match.strip() == '*':
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in tags)
+
+
+def make_etag(*parts):
+    return '"' + hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest() + '"'
+
+
+def etag_response(etag_func):
+    """
+    Answer GETs with 304 Not Modified when If-None-Match matches etag_func's value.
+
+    etag_func(request, *args, **kwargs) returns a quoted ETag or None (no validator).
+    Apply below @api_view/@permission_classes so authentication runs first.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs)
+            if etag is not None and _matches(request.headers.get('If-None-Match', ''), etag):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = view(request, *args, **kwargs)
+                if etag is None or response.status_code != 200:
+                    return response
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapped
+    return decorator
+
+
+def catalog_etag(catalog):
+    """Validator for catalog-backed views: the catalog version plus the path and normalized query."""
+    def etag_func(request, *args, **kwargs):
+        return make_etag(catalog, catalog_version(catalog), request.path, normalized_params(request))
+    return etag_func
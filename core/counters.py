@@ -0,0 +1,23 @@
+"""
+Denormalized counter rows moved with F-expression deltas.
+
+Writers never read-modify-write a counter: each change is an UPDATE adding the
+delta in the database, so concurrent writers cannot overwrite each other.
+"""
+from django.db import models
+
+
+def counter_rows(model, changes, **key):
+    """
+    The queryset holding the counter row at key, creating the row first if any
+    delta in changes is an increment. Rows are only ever created by increments;
+    a decrement may race deletion of the row's parent and must not recreate it.
+    """
+    if any(delta > 0 for delta in changes.values()):
+        model.objects.bulk_create([model(**key)], ignore_conflicts=True)
+    return model.objects.filter(**key)
+
+
+def increments(changes):
+    """{field: delta} as UPDATE keyword arguments adding each delta to its field."""
+    return {field: models.F(field) + delta for field, delta in changes.items()}
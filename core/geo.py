@@ -0,0 +1,132 @@
+"""
+Location helpers: geohash encoding, distances and radius queries.
+
+Free-text locations ("Lagos, Nigeria") are resolved against the bundled
+gazetteer (core/data/african_cities.csv, loaded into Location). Radius queries
+cover the search circle with a handful of geohash cells and turn each into an
+indexed range lookup on Location.geohash before computing exact distances.
+"""
+import csv
+import math
+from pathlib import Path
+
+from django.db import models
+
+from .models import Location
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'african_cities.csv'
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+GEOHASH_PRECISION = 9
+
+EARTH_RADIUS_KM = 6371.0
+
+# Upper bound on the number of geohash cells a radius query may expand into.
+MAX_COVER_CELLS = 16
+
+
+def normalize_name(name):
+    return ' '.join(name.lower().split())
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bit, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        if target >= middle:
+            value = (value << 1) | 1
+            bounds[0] = middle
+        else:
+            value <<= 1
+            bounds[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bit, value = 0, 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """(height, width) in degrees of a geohash cell."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """Geohash prefixes whose cells together cover the circle's bounding box."""
+    lat_delta = radius_km / 111.0
+    lon_delta = radius_km / (111.0 * max(math.cos(math.radians(latitude)), 0.01))
+    south, north = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    west, east = max(longitude - lon_delta, -180.0), min(longitude + lon_delta, 180.0)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash_cell_size(precision)
+        rows = math.ceil((north - south) / height) + 1
+        cols = math.ceil((east - west) / width) + 1
+        if rows * cols <= MAX_COVER_CELLS or precision == 1:
+            break
+
+    cells = set()
+    for row in range(rows):
+        for col in range(cols):
+            cells.add(geohash_encode(
+                min(south + row * height, north),
+                min(west + col * width, east),
+                precision
+            ))
+    return sorted(cells)
+
+
+def cells_query(cells, field='geohash'):
+    """Q matching geohashes inside any of the cells, as B-tree range lookups."""
+    condition = models.Q()
+    for cell in cells:
+        # '{' sorts right after 'z', the last geohash character
+        condition |= models.Q(**{f'{field}__gte': cell, f'{field}__lt': cell + '{'})
+    return condition
+
+
+def locations_within(latitude, longitude, radius_km):
+    """Return {location_id: distance_km} for gazetteer locations inside the radius."""
+    candidates = Location.objects.filter(cells_query(covering_cells(latitude, longitude, radius_km)))
+    distances = {}
+    for location_id, lat, lon in candidates.values_list('id', 'latitude', 'longitude'):
+        distance = haversine_km(latitude, longitude, lat, lon)
+        if distance <= radius_km:
+            distances[location_id] = distance
+    return distances
+
+
+def resolve_location(text):
+    """Match free text such as "Lagos, Nigeria" to a gazetteer Location, or None."""
+    parts = [normalize_name(part) for part in text.split(',') if part.strip()]
+    if not parts:
+        return None
+    matches = list(Location.objects.filter(key=parts[0]))
+    if len(matches) > 1 and len(parts) > 1:
+        matches = [match for match in matches if normalize_name(match.country) == parts[-1]] or matches
+    return matches[0] if matches else None
+
+
+def gazetteer_rows(path=GAZETTEER_PATH):
+    with open(path, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            latitude, longitude = float(row['latitude']), float(row['longitude'])
+            yield {
+                'name': row['name'],
+                'key': normalize_name(row['name']),
+                'country': row['country'],
+                'latitude': latitude,
+                'longitude': longitude,
+                'geohash': geohash_encode(latitude, longitude),
+            }
@@ -0,0 +1,9 @@
+import uuid
+
+
+def parse_uuid(value):
+    """The UUID that value spells, or None if it is not one (for per-item bulk results)."""
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
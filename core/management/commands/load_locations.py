@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core.geo import gazetteer_rows, resolve_location
+from core.models import Location, UserProfile
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "Load the bundled gazetteer of African cities and re-resolve job and profile locations"
+
+    def handle(self, *args, **options):
+        for row in gazetteer_rows():
+            Location.objects.update_or_create(name=row.pop('name'), country=row.pop('country'), defaults=row)
+
+        for model in (Job, UserProfile):
+            resolved = 0
+            batch = []
+            places = {}
+            for instance in model.objects.exclude(location='').only('pk', 'location', 'place').iterator(chunk_size=500):
+                if instance.location not in places:
+                    places[instance.location] = resolve_location(instance.location)
+                instance.place = places[instance.location]
+                resolved += instance.place is not None
+                batch.append(instance)
+                if len(batch) == 500:
+                    model.objects.bulk_update(batch, ['place'])
+                    batch = []
+            model.objects.bulk_update(batch, ['place'])
+            self.stdout.write(f"{model.__name__}: resolved {resolved} locations.")
+
+        self.stdout.write(self.style.SUCCESS(f"Gazetteer holds {Location.objects.count()} locations."))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from core.geo import gazetteer_rows
+
+
+def load_gazetteer(apps, schema_editor):
+    Location = apps.get_model('core', 'Location')
+    Location.objects.bulk_create([Location(**row) for row in gazetteer_rows()], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_company_website'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('key', models.CharField(db_index=True, max_length=100)),
+                ('country', models.CharField(max_length=100)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('geohash', models.CharField(db_index=True, max_length=12)),
+            ],
+            options={
+                'unique_together': {('name', 'country')},
+            },
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='place',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='profiles', to='core.location'),
+        ),
+        migrations.RunPython(load_gazetteer, migrations.RunPython.noop),
+    ]
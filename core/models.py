@@ -15,11 +15,29 @@ class User(AbstractUser):
 
 
 
+class Location(models.Model):
+    # A gazetteer city (core/data/african_cities.csv), see core/geo.py
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, db_index=True)  # normalized name used for lookups
+    country = models.CharField(max_length=100)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    geohash = models.CharField(max_length=12, db_index=True)
+
+    class Meta:
+        unique_together = ('name', 'country')
+
+    def __str__(self):
+        return f"{self.name}, {self.country}"
+
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
     date_of_birth = models.DateField(blank=True, null=True)
     location = models.CharField(max_length=100, blank=True)
+    # Gazetteer match for `location`, kept in sync on save
+    place = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='profiles')
     skills = models.TextField(blank=True, help_text="Comma-separated skills")
     experience_level = models.CharField(
         max_length=20,
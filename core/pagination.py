@@ -0,0 +1,83 @@
+import base64
+import json
+
+from django.db import models
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(values, direction):
+    payload = json.dumps({'v': [str(value) for value in values], 'd': direction})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, model, ordering):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction = payload['v'], payload['d']
+        if direction not in ('next', 'prev') or len(values) != len(ordering):
+            raise InvalidCursor(token)
+        fields = [model._meta.get_field(name.lstrip('-')) for name in ordering]
+        return [field.to_python(value) for field, value in zip(fields, values)], direction
+    except InvalidCursor:
+        raise
+    except Exception:
+        raise InvalidCursor(token)
+
+
+def _after(ordering, values):
+    """Q matching rows strictly after `values` in the given ordering."""
+    condition = models.Q()
+    for index, name in enumerate(ordering):
+        field = name.lstrip('-')
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        step = models.Q(**{f'{field}__{lookup}': values[index]})
+        for previous, value in zip(ordering[:index], values[:index]):
+            step &= models.Q(**{previous.lstrip('-'): value})
+        condition |= step
+    return condition
+
+
+def _reverse(ordering):
+    return [name[1:] if name.startswith('-') else f'-{name}' for name in ordering]
+
+
+def keyset_paginate(queryset, ordering, cursor=None, page_size=10):
+    """
+    Seek-method pagination over a unique ordering such as ['-posted_at', '-id'].
+
+    Each page is a single indexed range scan of page_size + 1 rows, no matter how
+    deep the client has scrolled. Returns (rows, next_cursor, previous_cursor).
+    Raises InvalidCursor for tokens that were not produced by this function.
+    """
+    model = queryset.model
+    direction = 'next'
+    if cursor:
+        values, direction = decode_cursor(cursor, model, ordering)
+        if direction == 'next':
+            queryset = queryset.filter(_after(ordering, values))
+        else:
+            queryset = queryset.filter(_after(_reverse(ordering), values))
+
+    if direction == 'next':
+        rows = list(queryset.order_by(*ordering)[:page_size + 1])
+    else:
+        rows = list(queryset.order_by(*_reverse(ordering))[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == 'prev':
+        rows.reverse()
+
+    def position(row):
+        return [getattr(row, name.lstrip('-')) for name in ordering]
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if has_more or direction == 'prev':
+            next_cursor = encode_cursor(position(rows[-1]), 'next')
+        if cursor and (has_more or direction == 'next'):
+            previous_cursor = encode_cursor(position(rows[0]), 'prev')
+    return rows, next_cursor, previous_cursor
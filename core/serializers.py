@@ -50,7 +50,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
 
 class CompanySerializer(serializers.ModelSerializer):
-    owner = serializers.CharField(source='employer.id', read_only=True)
+    owner = serializers.CharField(source='employer_id', read_only=True)
     website = serializers.URLField(required=False, allow_blank=True)
 
     class Meta:
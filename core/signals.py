@@ -0,0 +1,10 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .geo import resolve_location
+from .models import UserProfile
+
+
+@receiver(pre_save, sender=UserProfile)
+def resolve_profile_place(sender, instance, **kwargs):
+    instance.place = resolve_location(instance.location)
@@ -0,0 +1,25 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class Echo:
+    """File-like object whose write() hands the line back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(header, rows):
+    """Yield CSV lines one row at a time, for StreamingHttpResponse."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(fields, rows):
+    """Yield one JSON object per line, keyed by fields, for StreamingHttpResponse."""
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + '\n'
@@ -1,9 +1,13 @@
+import io
+
+from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
-from .models import UserProfile, Company
+from .geo import covering_cells, geohash_encode, locations_within, resolve_location
+from .models import Location, UserProfile, Company
 
 User = get_user_model()
 
@@ -52,3 +56,82 @@ class AuthAPITest(APITestCase):
         if response.status_code != status.HTTP_201_CREATED:
             print(f"Response data: {response.data}")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+class GeoTest(TestCase):
+    def test_geohash_and_cell_cover(self):
+        self.assertEqual(geohash_encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        cells = covering_cells(6.5244, 3.3792, 100)
+        self.assertLessEqual(len(cells), 16)
+        abeokuta = Location.objects.get(name='Abeokuta')
+        self.assertTrue(any(abeokuta.geohash.startswith(cell) for cell in cells))
+
+    def test_gazetteer_loaded_and_resolvable(self):
+        self.assertTrue(Location.objects.filter(name='Nairobi', country='Kenya').exists())
+        self.assertEqual(resolve_location(' nairobi , Kenya').name, 'Nairobi')
+        self.assertIsNone(resolve_location('Atlantis'))
+        distances = locations_within(-1.2921, 36.8219, 200)
+        self.assertIn(Location.objects.get(name='Nakuru').pk, distances)
+        self.assertNotIn(Location.objects.get(name='Mombasa').pk, distances)
+
+    def test_load_locations_resolves_existing_profiles(self):
+        user = User.objects.create_user(username='learner', email='learner@example.com', password='testpass123')
+        UserProfile.objects.create(user=user, location='Accra')
+        UserProfile.objects.filter(user=user).update(place=None)
+        call_command('load_locations', stdout=io.StringIO())
+        self.assertEqual(UserProfile.objects.get(user=user).place.name, 'Accra')
+
+
+class DashboardStatsTest(APITestCase):
+    def setUp(self):
+        from courses.models import Course, CourseEnrollment
+        from jobs.models import Job, JobApplication
+
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', is_staff=True
+        )
+        self.facilitator = User.objects.create_user(
+            username='facilitator', email='facilitator@example.com', password='testpass123', is_facilitator=True
+        )
+        self.employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='testpass123', is_employer=True
+        )
+        self.learner = User.objects.create_user(
+            username='learner', email='learner@example.com', password='testpass123'
+        )
+        course = Course.objects.create(
+            name='Python Basics', description='Learn Python', facilitator=self.facilitator, is_approved=True
+        )
+        CourseEnrollment.objects.create(course=course, learner=self.learner)
+        company = Company.objects.create(name='Tech Corp', description='A tech company', employer=self.employer)
+        job = Job.objects.create(company=company, title='Python Developer', description='Django APIs', is_approved=True)
+        JobApplication.objects.create(job=job, applicant=self.learner)
+        self.url = reverse('dashboard-stats')
+
+    def get_stats(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_admin_stats(self):
+        stats = self.get_stats(self.admin)
+        self.assertEqual(stats['total_users'], 4)
+        self.assertEqual(stats['total_enrollments'], 1)
+        self.assertEqual(stats['total_applications'], 1)
+
+    def test_facilitator_stats(self):
+        stats = self.get_stats(self.facilitator)
+        self.assertEqual(stats['my_courses'], 1)
+        self.assertEqual(stats['total_enrollments'], 1)
+
+    def test_employer_stats(self):
+        stats = self.get_stats(self.employer)
+        self.assertEqual(stats['my_jobs'], 1)
+        self.assertEqual(stats['total_applications'], 1)
+        self.assertEqual(stats['applications_by_status']['pending'], 1)
+
+    def test_learner_stats(self):
+        stats = self.get_stats(self.learner)
+        self.assertEqual(stats['my_enrollments'], 1)
+        self.assertEqual(stats['my_applications'], 1)
+        self.assertEqual(stats['wallet_balance'], 0.0)
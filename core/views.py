@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db.models import Sum
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
@@ -164,7 +165,7 @@ def dashboard_stats(request):
     
     if user.is_staff:  # Admin
         from courses.models import Course, CourseEnrollment
-        from jobs.models import Job, JobApplication
+        from jobs.models import Job, JobApplicationStats
         from earn.models import MicroTask, TaskSubmission
         
         stats = {
@@ -175,35 +176,42 @@ def dashboard_stats(request):
             'pending_course_approvals': Course.objects.filter(is_approved=False).count(),
             'pending_job_approvals': Job.objects.filter(is_approved=False).count(),
             'total_enrollments': CourseEnrollment.objects.count(),
-            'total_applications': JobApplication.objects.count(),
+            'total_applications': JobApplicationStats.objects.aggregate(total=Sum('total'))['total'] or 0,
             'total_submissions': TaskSubmission.objects.count(),
         }
     
     elif user.is_facilitator:
-        from courses.models import Course, CourseEnrollment
+        from courses.models import Course, CourseDailyStats
         
         user_courses = Course.objects.filter(facilitator=user)
         stats = {
             'my_courses': user_courses.count(),
             'approved_courses': user_courses.filter(is_approved=True).count(),
             'pending_courses': user_courses.filter(is_approved=False).count(),
-            'total_enrollments': CourseEnrollment.objects.filter(course__facilitator=user).count(),
+            'total_enrollments': CourseDailyStats.objects.filter(
+                course__facilitator=user
+            ).aggregate(total=Sum('enrollments'))['total'] or 0,
         }
     
     elif user.is_employer:
-        from jobs.models import Job, JobApplication
+        from jobs.counters import STATUSES
+        from jobs.models import Job, JobApplicationStats
         from earn.models import MicroTask, TaskSubmission
         
         user_companies = Company.objects.filter(employer=user)
         user_jobs = Job.objects.filter(company__employer=user)
         user_tasks = MicroTask.objects.filter(created_by=user)
+        application_counts = JobApplicationStats.objects.filter(job__company__employer=user).aggregate(
+            total=Sum('total'), **{status: Sum(status) for status in STATUSES}
+        )
         
         stats = {
             'my_companies': user_companies.count(),
             'my_jobs': user_jobs.count(),
             'approved_jobs': user_jobs.filter(is_approved=True).count(),
             'pending_jobs': user_jobs.filter(is_approved=False).count(),
-            'total_applications': JobApplication.objects.filter(job__company__employer=user).count(),
+            'total_applications': application_counts['total'] or 0,
+            'applications_by_status': {status: application_counts[status] or 0 for status in STATUSES},
             'my_tasks': user_tasks.count(),
             'active_tasks': user_tasks.filter(is_active=True).count(),
             'total_task_submissions': TaskSubmission.objects.filter(task__created_by=user).count(),
@@ -1,4 +1,6 @@
 from django.contrib import admin
+
+from core.cache import invalidate_catalog
 from .models import Course, CourseEnrollment
 
 # Register your models here.
@@ -13,11 +15,13 @@ class CourseAdmin(admin.ModelAdmin):
 
     def approve_courses(self, request, queryset):
         queryset.update(is_approved=True)
+        invalidate_catalog('courses')
         self.message_user(request, f"{queryset.count()} courses approved.")
     approve_courses.short_description = "Approve selected courses"
 
     def disapprove_courses(self, request, queryset):
         queryset.update(is_approved=False)
+        invalidate_catalog('courses')
         self.message_user(request, f"{queryset.count()} courses disapproved.")
     disapprove_courses.short_description = "Disapprove selected courses"
 
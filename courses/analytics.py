@@ -0,0 +1,199 @@
+"""
+Per-course, per-day analytics rollups (CourseDailyStats).
+
+Enrollment events are turned into deltas keyed by (course_id, day) and applied
+with F-expression UPDATEs, so the analytics endpoint only ever reads the small
+rollup table. Times to complete are kept as log-scaled histograms
+(BUCKETS_PER_DOUBLING buckets per doubling of hours), which makes the median
+mergeable across days at roughly 10% resolution.
+"""
+import math
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.counters import counter_rows, increments
+from .models import CourseDailyStats, CourseEnrollment
+
+COUNT_FIELDS = ('enrollments', 'progress_total', 'completions')
+
+BUCKETS_PER_DOUBLING = 4
+
+
+def duration_bucket(enrolled_at, completed_at):
+    hours = max((completed_at - enrolled_at).total_seconds() / 3600, 0)
+    return int(math.log2(1 + hours) * BUCKETS_PER_DOUBLING)
+
+
+def bucket_hours(bucket):
+    """Geometric midpoint of a histogram bucket, in hours."""
+    return 2 ** ((bucket + 0.5) / BUCKETS_PER_DOUBLING) - 1
+
+
+def median_hours(histogram):
+    count = sum(histogram.values())
+    if not count:
+        return None
+    seen = 0
+    for bucket in sorted(histogram, key=int):
+        seen += histogram[bucket]
+        if seen * 2 >= count:
+            return round(bucket_hours(int(bucket)), 1)
+
+
+def completion_of(enrollment):
+    """The completion time if the enrollment counts as completed, else None."""
+    return enrollment.completed_at if enrollment.completed else None
+
+
+def add_enrollment(deltas, enrollment, sign):
+    key = (enrollment.course_id, timezone.localdate(enrollment.enrolled_at))
+    deltas[key]['enrollments'] += sign
+    deltas[key]['progress_total'] += sign * enrollment.progress
+    completed_at = completion_of(enrollment)
+    if completed_at:
+        add_completion(deltas, enrollment.course_id, enrollment.enrolled_at, completed_at, sign)
+
+
+def add_completion(deltas, course_id, enrolled_at, completed_at, sign):
+    key = (course_id, timezone.localdate(completed_at))
+    deltas[key]['completions'] += sign
+    deltas[key][('hours', duration_bucket(enrolled_at, completed_at))] += sign
+
+
+def add_progress(deltas, enrollment, old_progress):
+    key = (enrollment.course_id, timezone.localdate(enrollment.enrolled_at))
+    deltas[key]['progress_total'] += enrollment.progress - old_progress
+
+
+def apply_deltas(deltas):
+    """Apply {(course_id, day): Counter} deltas to the rollups, one UPDATE per row touched."""
+    for (course_id, day), changes in deltas.items():
+        changes = {field: delta for field, delta in changes.items() if delta}
+        if not changes:
+            continue
+        rows = counter_rows(CourseDailyStats, changes, course_id=course_id, day=day)
+        updates = increments({field: delta for field, delta in changes.items() if field in COUNT_FIELDS})
+        hours = {field[1]: delta for field, delta in changes.items() if field not in COUNT_FIELDS}
+        with transaction.atomic():
+            if hours:
+                histogram = rows.select_for_update().values_list('completion_hours', flat=True).first()
+                if histogram is None:
+                    continue
+                for bucket, delta in hours.items():
+                    histogram[str(bucket)] = histogram.get(str(bucket), 0) + delta
+                updates['completion_hours'] = {bucket: count for bucket, count in histogram.items() if count > 0}
+            rows.update(**updates)
+
+
+def record_saved(enrollment, created):
+    deltas = defaultdict(Counter)
+    if created:
+        add_enrollment(deltas, enrollment, 1)
+    else:
+        stored_progress = getattr(enrollment, '_stored_progress', None)
+        if stored_progress is not None:
+            add_progress(deltas, enrollment, stored_progress)
+        if hasattr(enrollment, '_stored_completion'):
+            old, new = enrollment._stored_completion, completion_of(enrollment)
+            if old != new:
+                if old:
+                    add_completion(deltas, enrollment.course_id, enrollment.enrolled_at, old, -1)
+                if new:
+                    add_completion(deltas, enrollment.course_id, enrollment.enrolled_at, new, 1)
+    apply_deltas(deltas)
+
+
+def record_deleted(enrollment):
+    deltas = defaultdict(Counter)
+    add_enrollment(deltas, enrollment, -1)
+    apply_deltas(deltas)
+
+
+def rollup_rows(enrollments, chunk_size=2000):
+    """
+    Compute {(course_id, day): Counter} rollups for an enrollment queryset.
+
+    Cohort sizes and progress sums come from one grouped query; completion
+    histograms from a streamed pass over completed rows only.
+    """
+    deltas = defaultdict(Counter)
+    cohorts = (
+        enrollments.order_by()
+        .annotate(day=TruncDate('enrolled_at'))
+        .values('course_id', 'day')
+        .annotate(enrollments=models.Count('pk'), progress_total=models.Sum('progress'))
+    )
+    for row in cohorts:
+        deltas[(row['course_id'], row['day'])].update(
+            enrollments=row['enrollments'], progress_total=row['progress_total']
+        )
+    completed = (
+        enrollments.order_by()
+        .filter(completed=True, completed_at__isnull=False)
+        .values_list('course_id', 'enrolled_at', 'completed_at')
+    )
+    for course_id, enrolled_at, completed_at in completed.iterator(chunk_size=chunk_size):
+        add_completion(deltas, course_id, enrolled_at, completed_at, 1)
+    return deltas
+
+
+def stats_instances(deltas, model=CourseDailyStats):
+    for (course_id, day), changes in deltas.items():
+        yield model(
+            course_id=course_id,
+            day=day,
+            **{field: changes[field] for field in COUNT_FIELDS},
+            completion_hours={
+                str(field[1]): count for field, count in changes.items() if field not in COUNT_FIELDS
+            },
+        )
+
+
+@transaction.atomic
+def rebuild(chunk_size=2000):
+    """Recompute every rollup from the enrollments table. Returns the number of rows written."""
+    deltas = rollup_rows(CourseEnrollment.objects.all(), chunk_size=chunk_size)
+    CourseDailyStats.objects.all().delete()
+    created = CourseDailyStats.objects.bulk_create(stats_instances(deltas), batch_size=500)
+    return len(created)
+
+
+def course_analytics(course_id, start=None, end=None):
+    """Totals and a daily series for one course, read from the rollups only."""
+    rows = CourseDailyStats.objects.filter(course_id=course_id)
+    if start:
+        rows = rows.filter(day__gte=start)
+    if end:
+        rows = rows.filter(day__lte=end)
+
+    totals = Counter()
+    histogram = Counter()
+    daily = []
+    for row in rows.order_by('day').values('day', *COUNT_FIELDS, 'completion_hours'):
+        totals.update({field: row[field] for field in COUNT_FIELDS})
+        histogram.update(row['completion_hours'])
+        daily.append({
+            'day': row['day'],
+            'enrollments': row['enrollments'],
+            'completions': row['completions'],
+            'average_progress': _average(row['progress_total'], row['enrollments']),
+            'median_hours_to_complete': median_hours(row['completion_hours']),
+        })
+
+    return {
+        'totals': {
+            'enrollments': totals['enrollments'],
+            'completions': totals['completions'],
+            'completion_rate': _average(totals['completions'], totals['enrollments'], digits=3),
+            'average_progress': _average(totals['progress_total'], totals['enrollments']),
+            'median_hours_to_complete': median_hours(histogram),
+        },
+        'daily': daily,
+    }
+
+
+def _average(total, count, digits=1):
+    return round(total / count, digits) if count else None
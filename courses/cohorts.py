@@ -0,0 +1,109 @@
+"""
+Bulk cohort enrollment.
+
+Learners are given as user ids, emails or usernames (one per line/CSV row or a
+JSON list), resolved with a few batched IN lookups and enrolled with
+bulk_create(ignore_conflicts=True), so the unique (course, learner) constraint
+settles races with concurrent single enrollments.
+"""
+import csv
+import io
+import uuid
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from core.models import User
+from . import analytics
+from .models import CourseEnrollment
+
+MAX_COHORT_SIZE = 20000
+
+# Unknown entries echoed back in the summary; the count is always exact.
+MAX_REPORTED_UNKNOWN = 100
+
+HEADER_NAMES = {'id', 'email', 'username', 'learner', 'user'}
+
+
+def parse_csv(text):
+    """Entries from the first non-empty cell of every CSV row, skipping a header row."""
+    entries = []
+    for row in csv.reader(io.StringIO(text)):
+        cells = [cell.strip() for cell in row if cell.strip()]
+        if cells:
+            entries.append(cells[0])
+    if entries and entries[0].lower() in HEADER_NAMES:
+        entries = entries[1:]
+    return entries
+
+
+def _as_uuid(value):
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        return None
+
+
+def resolve_users(entries, batch_size=1000):
+    """Map each entry to a user id, or None if no user matches."""
+    kinds = defaultdict(set)
+    for entry in entries:
+        if _as_uuid(entry):
+            kinds['id'].add(entry)
+        elif '@' in entry:
+            kinds['email'].add(entry)
+        else:
+            kinds['username'].add(entry)
+
+    resolved = {}
+    for field, values in kinds.items():
+        values = list(values)
+        for start in range(0, len(values), batch_size):
+            lookup = {f'{field}__in': values[start:start + batch_size]}
+            for user_id, value in User.objects.filter(**lookup).values_list('id', field):
+                resolved[str(value)] = user_id
+    return {entry: resolved.get(str(_as_uuid(entry) or entry)) for entry in entries}
+
+
+def enroll_cohort(course, entries, batch_size=1000):
+    """
+    Enroll the learners named by entries. Returns a summary with the number of
+    enrollments created, entries skipped (already enrolled or repeated) and
+    unknown entries.
+    """
+    entries = [str(entry).strip() for entry in entries if str(entry).strip()]
+    users = resolve_users(entries, batch_size=batch_size)
+    unknown = [entry for entry in entries if users[entry] is None]
+    learner_ids = list(dict.fromkeys(user_id for user_id in users.values() if user_id is not None))
+
+    created = 0
+    for start in range(0, len(learner_ids), batch_size):
+        batch = learner_ids[start:start + batch_size]
+        with transaction.atomic():
+            enrolled = set(
+                CourseEnrollment.objects.filter(course=course, learner_id__in=batch).values_list('learner_id', flat=True)
+            )
+            new = [
+                CourseEnrollment(course=course, learner_id=learner_id)
+                for learner_id in batch if learner_id not in enrolled
+            ]
+            CourseEnrollment.objects.bulk_create(new, ignore_conflicts=True)
+            # Primary keys are generated here, so refetching them tells which rows won any race
+            inserted = list(
+                CourseEnrollment.objects.filter(pk__in=[enrollment.pk for enrollment in new])
+                .only('id', 'course_id', 'enrolled_at', 'progress', 'completed', 'completed_at')
+            )
+            # bulk_create sends no signals; keep the analytics rollups in step here
+            deltas = defaultdict(Counter)
+            for enrollment in inserted:
+                analytics.add_enrollment(deltas, enrollment, 1)
+            analytics.apply_deltas(deltas)
+        created += len(inserted)
+
+    matched = len(entries) - len(unknown)
+    return {
+        'created': created,
+        'skipped': matched - created,
+        'unknown': len(unknown),
+        'unknown_entries': unknown[:MAX_REPORTED_UNKNOWN],
+    }
@@ -0,0 +1,42 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courses import cohorts
+from courses.models import Course
+
+
+class Command(BaseCommand):
+    help = "Enroll a cohort of learners (ids, emails or usernames from a CSV or JSON file) in a course"
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id')
+        parser.add_argument('path', help="CSV file (first column) or JSON list; '-' reads stdin")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        course = Course.objects.filter(pk=options['course_id']).first()
+        if course is None:
+            raise CommandError(f"Course {options['course_id']} does not exist")
+
+        if options['path'] == '-':
+            text = sys.stdin.read()
+        else:
+            with open(options['path'], encoding='utf-8-sig') as handle:
+                text = handle.read()
+
+        if options['path'].endswith('.json'):
+            entries = json.loads(text)
+            if not isinstance(entries, list):
+                raise CommandError("JSON input must be a list of learners")
+        else:
+            entries = cohorts.parse_csv(text)
+
+        summary = cohorts.enroll_cohort(course, entries, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {summary['created']} enrollments, skipped {summary['skipped']}, "
+            f"{summary['unknown']} unknown."
+        ))
+        for entry in summary['unknown_entries']:
+            self.stdout.write(f"  unknown: {entry}")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from courses.progress import flush_progress
+
+
+class Command(BaseCommand):
+    help = "Write buffered course progress updates to the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        updated = flush_progress(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Flushed progress for {updated} enrollments."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from courses.recommendations import MIN_CO_ENROLLMENTS, TOP_K, rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the co-enrollment course recommendations"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=TOP_K)
+        parser.add_argument('--min-co-enrollments', type=int, default=MIN_CO_ENROLLMENTS)
+
+    def handle(self, *args, **options):
+        rows = rebuild(top_k=options['top_k'], min_co_enrollments=options['min_co_enrollments'])
+        self.stdout.write(self.style.SUCCESS(f"Stored {rows} course recommendations."))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_created_at_courseenrollment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseenrollment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
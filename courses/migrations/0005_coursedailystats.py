@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_course_stats(apps, schema_editor):
+    from courses.analytics import rollup_rows, stats_instances
+    CourseEnrollment = apps.get_model('courses', 'CourseEnrollment')
+    CourseDailyStats = apps.get_model('courses', 'CourseDailyStats')
+    deltas = rollup_rows(CourseEnrollment.objects.all())
+    CourseDailyStats.objects.bulk_create(stats_instances(deltas, model=CourseDailyStats), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_enrollment_roster_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('enrollments', models.IntegerField(default=0)),
+                ('progress_total', models.BigIntegerField(default=0)),
+                ('completions', models.IntegerField(default=0)),
+                ('completion_hours', models.JSONField(default=dict)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='courses.course')),
+            ],
+            options={
+                'unique_together': {('course', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill_course_stats, migrations.RunPython.noop),
+    ]
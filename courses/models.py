@@ -28,10 +28,60 @@ class CourseEnrollment(models.Model):
     progress = models.IntegerField(default=0)  # Progress percentage (0-100)
     completed = models.BooleanField(default=False)
     completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('course', 'learner')  # Prevent duplicate enrollments
+        indexes = [
+            # Serves the facilitator roster: filter by completion, sort/range by progress
+            models.Index(fields=['course', 'completed', 'progress'], name='enrollment_roster_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so a later save() can move the analytics rollups
+        instance._stored_progress = instance.__dict__.get('progress')
+        if 'completed' in instance.__dict__ and 'completed_at' in instance.__dict__:
+            instance._stored_completion = instance.completed_at if instance.completed else None
+        return instance
 
     def __str__(self):
         return f"{self.learner.username} enrolled in {self.course.name}"
 
+
+class CourseDailyStats(models.Model):
+    # Analytics rollup per course and day, maintained incrementally by
+    # courses/analytics.py; `python manage.py rebuild_course_analytics` backfills it.
+    # Enrollment and progress figures belong to the day learners enrolled,
+    # completion figures to the day they completed.
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    enrollments = models.IntegerField(default=0)
+    progress_total = models.BigIntegerField(default=0)
+    completions = models.IntegerField(default=0)
+    # {bucket: count} histogram of hours from enrollment to completion, see analytics.duration_bucket
+    completion_hours = models.JSONField(default=dict)
+
+    class Meta:
+        unique_together = ('course', 'day')
+
+    def __str__(self):
+        return f"Stats for {self.course_id} on {self.day}"
+
+
+
+class CourseSimilarity(models.Model):
+    # Precomputed "learners who took this also took" neighbours, rebuilt in
+    # batch by courses/recommendations.py; rank 1 is the most similar course.
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='similar_courses')
+    similar = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    co_enrollments = models.IntegerField()
+
+    class Meta:
+        unique_together = ('course', 'rank')
+
+    def __str__(self):
+        return f"{self.similar_id} similar to {self.course_id} (#{self.rank})"
@@ -0,0 +1,139 @@
+"""
+Write-coalescing buffer for course progress pings.
+
+Learning clients report progress every few seconds. With buffering enabled
+(COURSE_PROGRESS_BUFFERING) only the latest value per enrollment is kept in a
+fast store and flush_progress() writes all of them with bulk_update on a
+schedule. Completing a course is never buffered: the view writes
+completed/completed_at straight away and drops any pending value.
+
+The store is a Redis hash when REDIS_URL is set, otherwise a per-process dict
+(development and tests).
+"""
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import analytics
+from .models import CourseEnrollment
+
+REDIS_KEY = 'courses:progress:pending'
+
+
+class LocalProgressBuffer:
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def record(self, enrollment_id, progress):
+        with self._lock:
+            self._pending[str(enrollment_id)] = progress
+
+    def discard(self, enrollment_id):
+        with self._lock:
+            self._pending.pop(str(enrollment_id), None)
+
+    def pending(self, enrollment_ids):
+        with self._lock:
+            return {
+                str(enrollment_id): self._pending[str(enrollment_id)]
+                for enrollment_id in enrollment_ids if str(enrollment_id) in self._pending
+            }
+
+    def drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, entries):
+        # Values recorded since the drain are newer and win
+        with self._lock:
+            for enrollment_id, progress in entries.items():
+                self._pending.setdefault(enrollment_id, progress)
+
+
+class RedisProgressBuffer:
+    def __init__(self):
+        from django_redis import get_redis_connection
+        self._redis = get_redis_connection('default')
+
+    def record(self, enrollment_id, progress):
+        self._redis.hset(REDIS_KEY, str(enrollment_id), progress)
+
+    def discard(self, enrollment_id):
+        self._redis.hdel(REDIS_KEY, str(enrollment_id))
+
+    def pending(self, enrollment_ids):
+        keys = [str(enrollment_id) for enrollment_id in enrollment_ids]
+        if not keys:
+            return {}
+        values = self._redis.hmget(REDIS_KEY, keys)
+        return {key: int(value) for key, value in zip(keys, values) if value is not None}
+
+    def drain(self):
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hgetall(REDIS_KEY)
+        pipe.delete(REDIS_KEY)
+        entries, _ = pipe.execute()
+        return {key.decode(): int(value) for key, value in entries.items()}
+
+    def restore(self, entries):
+        pipe = self._redis.pipeline(transaction=False)
+        for enrollment_id, progress in entries.items():
+            pipe.hsetnx(REDIS_KEY, enrollment_id, progress)
+        pipe.execute()
+
+
+_local_buffer = LocalProgressBuffer()
+
+
+def get_buffer():
+    if settings.REDIS_URL:
+        return RedisProgressBuffer()
+    return _local_buffer
+
+
+def is_enabled():
+    return settings.COURSE_PROGRESS_BUFFERING
+
+
+def flush_progress(batch_size=500):
+    """Write every buffered progress value to the database. Returns the number of rows updated."""
+    buffer = get_buffer()
+    entries = buffer.drain()
+    if not entries:
+        return 0
+
+    try:
+        updated = 0
+        ids = list(entries)
+        now = timezone.now()
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            changed = []
+            deltas = defaultdict(Counter)
+            with transaction.atomic():
+                # Locked, and completed rows skipped: a completion recorded after the drain
+                # must not be overwritten by an older buffered value
+                rows = (
+                    CourseEnrollment.objects.select_for_update()
+                    .filter(pk__in=batch, completed=False)
+                    .only('id', 'course_id', 'enrolled_at', 'progress')
+                )
+                for enrollment in rows:
+                    old_progress, enrollment.progress = enrollment.progress, entries[str(enrollment.pk)]
+                    if enrollment.progress != old_progress:
+                        # bulk_update skips auto_now; updated_at drives the enrollment ETags
+                        enrollment.updated_at = now
+                        changed.append(enrollment)
+                        analytics.add_progress(deltas, enrollment, old_progress)
+                CourseEnrollment.objects.bulk_update(changed, ['progress', 'updated_at'])
+                analytics.apply_deltas(deltas)
+            updated += len(changed)
+    except Exception:
+        buffer.restore(entries)
+        raise
+    return updated
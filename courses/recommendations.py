@@ -0,0 +1,105 @@
+"""
+Item-to-item course recommendations from co-enrollments.
+
+The batch job lets the database build the sparse course x course
+co-occurrence matrix (a grouped self-join of the enrollments table, streamed
+in course order), scores each pair by cosine similarity
+co / sqrt(enrollments_a * enrollments_b) and keeps the top K neighbours per
+course in CourseSimilarity. Serving is a read of that table by (course, rank).
+"""
+import heapq
+import math
+
+from django.db import connection, models, transaction
+
+from core.cache import invalidate_catalog
+from .models import Course, CourseEnrollment, CourseSimilarity
+
+TOP_K = 10
+
+# Pairs sharing fewer learners than this are treated as noise.
+MIN_CO_ENROLLMENTS = 2
+
+# Bumped after each rebuild; part of the get_course ETag.
+RECOMMENDATIONS_CATALOG = 'course_recommendations'
+
+
+def co_enrollment_pairs(min_co_enrollments=MIN_CO_ENROLLMENTS, fetch_size=10000):
+    """Yield (course_id, other_course_id, shared_learners), grouped by course_id."""
+    table = connection.ops.quote_name(CourseEnrollment._meta.db_table)
+    sql = (
+        f"SELECT a.course_id, b.course_id, COUNT(*) FROM {table} a "
+        f"JOIN {table} b ON b.learner_id = a.learner_id AND b.course_id <> a.course_id "
+        f"GROUP BY a.course_id, b.course_id "
+        f"HAVING COUNT(*) >= %s "
+        f"ORDER BY a.course_id"
+    )
+    to_python = Course._meta.pk.to_python
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [min_co_enrollments])
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            for course_id, other_id, shared in rows:
+                yield to_python(course_id), to_python(other_id), shared
+
+
+def top_neighbours(top_k=TOP_K, min_co_enrollments=MIN_CO_ENROLLMENTS):
+    """Yield CourseSimilarity rows (unsaved), top_k per course, most similar first."""
+    sizes = dict(CourseEnrollment.objects.order_by().values_list('course_id').annotate(models.Count('pk')))
+    approved = set(Course.objects.filter(is_approved=True).values_list('pk', flat=True))
+
+    def ranked(course_id, candidates):
+        best = heapq.nlargest(top_k, candidates)
+        for rank, (score, shared, similar_id) in enumerate(best, start=1):
+            yield CourseSimilarity(
+                course_id=course_id, similar_id=similar_id, rank=rank,
+                score=round(score, 6), co_enrollments=shared
+            )
+
+    current, candidates = None, []
+    for course_id, other_id, shared in co_enrollment_pairs(min_co_enrollments):
+        if course_id != current:
+            yield from ranked(current, candidates)
+            current, candidates = course_id, []
+        if other_id in approved:
+            candidates.append((shared / math.sqrt(sizes[course_id] * sizes[other_id]), shared, other_id))
+    yield from ranked(current, candidates)
+
+
+def rebuild(top_k=TOP_K, min_co_enrollments=MIN_CO_ENROLLMENTS):
+    """Recompute every course's neighbours. Returns the number of rows written."""
+    rows = list(top_neighbours(top_k, min_co_enrollments))
+    with transaction.atomic():
+        CourseSimilarity.objects.all().delete()
+        CourseSimilarity.objects.bulk_create(rows, batch_size=1000)
+        invalidate_catalog(RECOMMENDATIONS_CATALOG)
+    return len(rows)
+
+
+def also_taken(course_id, limit=TOP_K):
+    """Courses most often taken by this course's learners."""
+    rows = (
+        CourseSimilarity.objects.filter(course_id=course_id, similar__is_approved=True)
+        .order_by('rank')
+        .values_list('similar_id', 'similar__name', 'score')[:limit]
+    )
+    return [{'id': similar_id, 'name': name, 'score': score} for similar_id, name, score in rows]
+
+
+def recommended_for(user, exclude=None, limit=TOP_K):
+    """Courses similar to the learner's enrollments that they have not taken yet."""
+    enrolled = CourseEnrollment.objects.filter(learner=user).values('course_id')
+    suggestions = (
+        CourseSimilarity.objects.filter(course__in=enrolled, similar__is_approved=True)
+        .exclude(similar__in=enrolled)
+    )
+    if exclude is not None:
+        suggestions = suggestions.exclude(similar_id=exclude)
+    rows = (
+        suggestions.values_list('similar_id', 'similar__name')
+        .annotate(total=models.Sum('score'))
+        .order_by('-total')[:limit]
+    )
+    return [{'id': similar_id, 'name': name, 'score': round(total, 6)} for similar_id, name, total in rows]
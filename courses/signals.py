@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import invalidate_catalog
+from . import analytics
+from .models import Course, CourseEnrollment
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_catalog(sender, **kwargs):
+    invalidate_catalog('courses')
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def roll_up_enrollment_save(sender, instance, created, **kwargs):
+    analytics.record_saved(instance, created)
+    instance._stored_progress = instance.progress
+    instance._stored_completion = analytics.completion_of(instance)
+
+
+@receiver(post_delete, sender=CourseEnrollment)
+def roll_up_enrollment_delete(sender, instance, **kwargs):
+    analytics.record_deleted(instance)
@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from . import progress, recommendations
+
+
+@shared_task
+def flush_progress():
+    return progress.flush_progress()
+
+
+@shared_task
+def rebuild_recommendations():
+    return recommendations.rebuild()
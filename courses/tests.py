@@ -1,9 +1,16 @@
+from unittest import mock
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
-from .models import Course, CourseEnrollment
+from django.utils import timezone
+from . import analytics, progress, recommendations
+from .models import Course, CourseDailyStats, CourseEnrollment
 
 User = get_user_model()
 
@@ -55,3 +62,372 @@ class CourseEnrollmentTest(TestCase):
         self.assertEqual(enrollment.learner, self.learner)
         self.assertEqual(enrollment.progress, 0)
         self.assertFalse(enrollment.completed)
+
+class CourseCatalogCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.facilitator = User.objects.create_user(
+            username='facilitator',
+            email='facilitator@example.com',
+            password='testpass123',
+            is_facilitator=True
+        )
+        self.course = Course.objects.create(
+            name='Python Basics',
+            description='Learn Python programming fundamentals',
+            facilitator=self.facilitator
+        )
+        self.client.force_authenticate(user=self.facilitator)
+
+    def test_repeat_reads_served_from_cache(self):
+        url = reverse('list-courses')
+        self.client.get(url, {'search': 'python'})
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'search': ' python', 'facilitator': ''})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_admin_approval_invalidates(self):
+        url = reverse('list-courses')
+        self.assertEqual(self.client.get(url).data, [])
+
+        self.client.force_login(self.admin)
+        self.client.post(reverse('admin:courses_course_changelist'), {
+            'action': 'approve_courses',
+            '_selected_action': [self.course.pk],
+        })
+        self.assertEqual([course['name'] for course in self.client.get(url).data], ['Python Basics'])
+
+class CourseConditionalGetTest(APITestCase):
+    def setUp(self):
+        self.facilitator = User.objects.create_user(
+            username='facilitator',
+            email='facilitator@example.com',
+            password='testpass123',
+            is_facilitator=True
+        )
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@example.com',
+            password='testpass123'
+        )
+        self.course = Course.objects.create(
+            name='Python Basics',
+            description='Learn Python programming fundamentals',
+            facilitator=self.facilitator,
+            is_approved=True
+        )
+        self.enrollment = CourseEnrollment.objects.create(course=self.course, learner=self.learner)
+        self.client.force_authenticate(user=self.learner)
+
+    def revalidate(self, url):
+        etag = self.client.get(url)['ETag']
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_catalog_endpoints_return_not_modified(self):
+        for url in (reverse('list-courses'), reverse('get-course', args=[self.course.pk])):
+            response = self.revalidate(url)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response.content, b'')
+
+        etag = self.client.get(reverse('list-courses'))['ETag']
+        self.course.name = 'Python Fundamentals'
+        self.course.save()
+        response = self.client.get(reverse('list-courses'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_enrollments_revalidate_until_progress_changes(self):
+        url = reverse('my-enrollments')
+        self.assertEqual(self.revalidate(url).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        etag = self.client.get(url)['ETag']
+        self.client.put(reverse('update-progress', args=[self.enrollment.pk]), {'progress': 40})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+class CourseRosterTest(APITestCase):
+    def setUp(self):
+        self.facilitator = User.objects.create_user(
+            username='facilitator',
+            email='facilitator@example.com',
+            password='testpass123',
+            is_facilitator=True
+        )
+        self.course = Course.objects.create(
+            name='Python Basics',
+            description='Learn Python programming fundamentals',
+            facilitator=self.facilitator,
+            is_approved=True
+        )
+        for index in range(12):
+            learner = User.objects.create(username=f'learner{index}', email=f'learner{index}@example.com')
+            CourseEnrollment.objects.create(
+                course=self.course, learner=learner, progress=index * 5, completed=index >= 10
+            )
+        self.url = reverse('course-roster', args=[self.course.pk])
+        self.client.force_authenticate(user=self.facilitator)
+
+    def test_pages_sorted_by_progress(self):
+        response = self.client.get(self.url, {'sort': '-progress', 'page_size': 5})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['progress'] for row in response.data['results']], [55, 50, 45, 40, 35])
+
+        progress = []
+        cursor = ''
+        while True:
+            page = self.client.get(self.url, {'sort': 'progress', 'page_size': 5, 'cursor': cursor}).data
+            progress += [row['progress'] for row in page['results']]
+            cursor = page['next']
+            if not cursor:
+                break
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(len(progress), 12)
+
+    def test_filters(self):
+        response = self.client.get(self.url, {'completed': 'false', 'min_progress': 20, 'count': 'true'})
+        self.assertEqual(response.data['count'], 6)
+        self.assertTrue(all(20 <= row['progress'] <= 45 for row in response.data['results']))
+
+        response = self.client.get(self.url, {'sort': 'name'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_independent_of_page_size(self):
+        # Session/auth lookups are bypassed by force_authenticate: course + one joined page query
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {'page_size': 3})
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {'page_size': 12})
+
+    def test_other_users_forbidden(self):
+        self.client.force_authenticate(user=User.objects.get(username='learner0'))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+@override_settings(COURSE_PROGRESS_BUFFERING=True)
+class BufferedProgressTest(APITestCase):
+    def setUp(self):
+        self.facilitator = User.objects.create_user(
+            username='facilitator',
+            email='facilitator@example.com',
+            password='testpass123',
+            is_facilitator=True
+        )
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@example.com',
+            password='testpass123'
+        )
+        self.course = Course.objects.create(
+            name='Python Basics',
+            description='Learn Python programming fundamentals',
+            facilitator=self.facilitator,
+            is_approved=True
+        )
+        self.enrollment = CourseEnrollment.objects.create(course=self.course, learner=self.learner)
+        self.url = reverse('update-progress', args=[self.enrollment.pk])
+        self.client.force_authenticate(user=self.learner)
+        progress.get_buffer().drain()
+
+    def test_pings_coalesce_into_one_write(self):
+        for value in (10, 20, 30):
+            response = self.client.put(self.url, {'progress': value})
+            self.assertEqual(response.data['progress'], value)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.progress, 0)
+
+        # Reads see the buffered value before it is flushed
+        response = self.client.get(reverse('my-enrollments'))
+        self.assertEqual(response.data[0]['progress'], 30)
+
+        self.assertEqual(progress.flush_progress(), 1)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.progress, 30)
+        self.assertEqual(progress.flush_progress(), 0)
+
+    def test_completion_is_written_immediately(self):
+        self.client.put(self.url, {'progress': 90})
+        self.client.put(self.url, {'progress': 100})
+        self.enrollment.refresh_from_db()
+        self.assertTrue(self.enrollment.completed)
+        self.assertIsNotNone(self.enrollment.completed_at)
+        self.assertEqual(self.enrollment.progress, 100)
+        # The stale 90 was dropped rather than flushed over the completion
+        self.assertEqual(progress.flush_progress(), 0)
+
+    def test_flush_never_overwrites_a_later_completion(self):
+        self.client.put(self.url, {'progress': 80})
+        buffer = progress.get_buffer()
+        drain = buffer.drain
+
+        def drain_then_complete():
+            entries = drain()
+            # The learner finishes while the flush holds the stale 80
+            self.client.put(self.url, {'progress': 100})
+            return entries
+
+        with mock.patch.object(buffer, 'drain', drain_then_complete):
+            self.assertEqual(progress.flush_progress(), 0)
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.progress, self.enrollment.completed), (100, True))
+        stats = CourseDailyStats.objects.get(course=self.course)
+        self.assertEqual((stats.progress_total, stats.completions), (100, 1))
+
+    def test_invalid_progress_rejected(self):
+        response = self.client.put(self.url, {'progress': 150})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CourseAnalyticsTest(APITestCase):
+    def setUp(self):
+        self.facilitator = User.objects.create_user(
+            username='facilitator',
+            email='facilitator@example.com',
+            password='testpass123',
+            is_facilitator=True
+        )
+        self.course = Course.objects.create(
+            name='Python Basics',
+            description='Learn Python programming fundamentals',
+            facilitator=self.facilitator,
+            is_approved=True
+        )
+        self.enrollments = [
+            CourseEnrollment.objects.create(
+                course=self.course,
+                learner=User.objects.create(username=f'learner{index}', email=f'learner{index}@example.com')
+            )
+            for index in range(4)
+        ]
+        self.url = reverse('course-analytics', args=[self.course.pk])
+        self.client.force_authenticate(user=self.facilitator)
+
+    def complete(self, enrollment, hours):
+        enrollment.progress = 100
+        enrollment.completed = True
+        enrollment.completed_at = enrollment.enrolled_at + timezone.timedelta(hours=hours)
+        enrollment.save()
+
+    def test_rollups_follow_enrollment_events(self):
+        self.complete(self.enrollments[0], 10)
+        self.complete(self.enrollments[1], 30)
+        self.enrollments[2].progress = 40
+        self.enrollments[2].save()
+        self.enrollments[3].delete()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        totals = response.data['totals']
+        self.assertEqual(totals['enrollments'], 3)
+        self.assertEqual(totals['completions'], 2)
+        self.assertEqual(totals['completion_rate'], 0.667)
+        self.assertEqual(totals['average_progress'], 80.0)
+        self.assertAlmostEqual(totals['median_hours_to_complete'], 10, delta=1.5)
+
+    def test_backfill_matches_incremental_rollups(self):
+        self.complete(self.enrollments[0], 5)
+        self.enrollments[1].progress = 70
+        self.enrollments[1].save()
+        incremental = analytics.course_analytics(self.course.pk)
+
+        CourseDailyStats.objects.all().delete()
+        analytics.rebuild()
+        self.assertEqual(analytics.course_analytics(self.course.pk), incremental)
+
+    def test_learners_forbidden(self):
+        self.client.force_authenticate(user=self.enrollments[0].learner)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BulkEnrollTest(APITestCase):
+    def setUp(self):
+        self.facilitator = User.objects.create_user(
+            username='facilitator',
+            email='facilitator@example.com',
+            password='testpass123',
+            is_facilitator=True
+        )
+        self.course = Course.objects.create(
+            name='Python Basics',
+            description='Learn Python programming fundamentals',
+            facilitator=self.facilitator,
+            is_approved=True
+        )
+        self.learners = [
+            User.objects.create(username=f'learner{index}', email=f'learner{index}@example.com')
+            for index in range(6)
+        ]
+        CourseEnrollment.objects.create(course=self.course, learner=self.learners[0])
+        self.url = reverse('bulk-enroll', args=[self.course.pk])
+        self.client.force_authenticate(user=self.facilitator)
+
+    def test_json_entries_by_id_email_and_username(self):
+        learners = [
+            'learner0',  # already enrolled
+            str(self.learners[1].pk),
+            'learner2@example.com',
+            'learner3',
+            'learner3',  # repeated
+            'nobody',
+        ]
+        response = self.client.post(self.url, {'learners': learners}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(response.data['skipped'], 2)
+        self.assertEqual(response.data['unknown_entries'], ['nobody'])
+        self.assertEqual(CourseEnrollment.objects.filter(course=self.course).count(), 4)
+        self.assertEqual(analytics.course_analytics(self.course.pk)['totals']['enrollments'], 4)
+
+    def test_csv_upload(self):
+        upload = SimpleUploadedFile('cohort.csv', b'email\nlearner4@example.com\nlearner5@example.com\n')
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['unknown'], 0)
+
+    def test_other_facilitators_forbidden(self):
+        self.client.force_authenticate(user=self.learners[1])
+        response = self.client.post(self.url, {'learners': ['learner2']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CourseRecommendationTest(APITestCase):
+    def setUp(self):
+        self.facilitator = User.objects.create_user(
+            username='facilitator',
+            email='facilitator@example.com',
+            password='testpass123',
+            is_facilitator=True
+        )
+        self.python, self.django, self.sql, self.design = [
+            Course.objects.create(name=name, description=name, facilitator=self.facilitator, is_approved=True)
+            for name in ('Python', 'Django', 'SQL', 'Design')
+        ]
+        # Three learners took Python with Django, two with SQL, one with Design
+        for index, others in enumerate([
+            [self.django, self.sql], [self.django, self.sql], [self.django], [self.design]
+        ]):
+            learner = User.objects.create(username=f'learner{index}', email=f'learner{index}@example.com')
+            for course in [self.python] + others:
+                CourseEnrollment.objects.create(course=course, learner=learner)
+        recommendations.rebuild()
+
+        self.learner = User.objects.create(username='newcomer', email='newcomer@example.com')
+        CourseEnrollment.objects.create(course=self.python, learner=self.learner)
+        self.client.force_authenticate(user=self.learner)
+
+    def test_also_taken_ranked_by_similarity(self):
+        response = self.client.get(reverse('get-course', args=[self.python.pk]))
+        self.assertEqual([course['name'] for course in response.data['also_taken']], ['Django', 'SQL'])
+
+    def test_personalized_suggestions(self):
+        response = self.client.get(reverse('get-course', args=[self.sql.pk]))
+        # Python is taken and SQL is the course being viewed
+        self.assertEqual([course['name'] for course in response.data['recommended']], ['Django'])
+
+    def test_etag_changes_with_enrollments(self):
+        url = reverse('get-course', args=[self.python.pk])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        CourseEnrollment.objects.create(course=self.django, learner=self.learner)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
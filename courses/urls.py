@@ -1,7 +1,8 @@
 from django.urls import path
 from .views import (
     list_courses, create_course, get_course, update_course, delete_course,
-    enroll_in_course, my_enrollments, update_progress, course_enrollments
+    enroll_in_course, my_enrollments, update_progress, course_enrollments,
+    course_roster, course_analytics, bulk_enroll
 )
 
 urlpatterns = [
@@ -16,4 +17,7 @@ urlpatterns = [
     path('my-enrollments/', my_enrollments, name='my-enrollments'),
     path('enrollments/<uuid:enrollment_id>/progress/', update_progress, name='update-progress'),
     path('<uuid:course_id>/enrollments/', course_enrollments, name='course-enrollments'),
+    path('<uuid:course_id>/enroll/bulk/', bulk_enroll, name='bulk-enroll'),
+    path('<uuid:course_id>/roster/', course_roster, name='course-roster'),
+    path('<uuid:course_id>/analytics/', course_analytics, name='course-analytics'),
 ]
\ No newline at end of file
@@ -1,17 +1,24 @@
 from django.shortcuts import render, get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.db import models
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from . import analytics, cohorts, progress, recommendations
 from .models import Course, CourseEnrollment
 from .serializers import CourseSerializer, CourseEnrollmentSerializer
+from core.cache import cache_catalog_response, catalog_version
+from core.conditional import catalog_etag, etag_response, make_etag
 from core.models import User
+from core.pagination import InvalidCursor, keyset_paginate
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@etag_response(catalog_etag('courses'))
+@cache_catalog_response('courses')
 def list_courses(request):
     courses = Course.objects.filter(is_approved=True)
     
@@ -57,12 +64,27 @@ def create_course(request):
     return Response(data={"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
 
 
+def course_etag(request, course_id):
+    # Personalized suggestions depend on the learner's enrollments and the last rebuild
+    enrollments = CourseEnrollment.objects.filter(learner=request.user).aggregate(
+        count=models.Count('pk'), latest=models.Max('enrolled_at')
+    )
+    return make_etag(
+        catalog_etag('courses')(request, course_id),
+        catalog_version(recommendations.RECOMMENDATIONS_CATALOG),
+        request.user.pk, enrollments['count'], enrollments['latest']
+    )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@etag_response(course_etag)
 def get_course(request, course_id):
     course = get_object_or_404(Course, pk=course_id)
-    serializer = CourseSerializer(course)
-    return Response(serializer.data)
+    data = CourseSerializer(course).data
+    data['also_taken'] = recommendations.also_taken(course.pk)
+    data['recommended'] = recommendations.recommended_for(request.user, exclude=course.pk)
+    return Response(data)
 
 
 @api_view(['PUT'])
@@ -118,10 +140,65 @@ def enroll_in_course(request, course_id):
     return Response({"message": "Successfully enrolled", "enrollment": serializer.data}, status=status.HTTP_201_CREATED)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_enroll(request, course_id):
+    course = get_object_or_404(Course, pk=course_id)
+    
+    # Only facilitator of the course or admin can enroll cohorts
+    if not (course.facilitator_id == request.user.pk or request.user.is_staff):
+        return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
+    
+    if not course.is_approved:
+        return Response({"message": "Course is not approved yet"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Learners come as a CSV upload or a JSON list of ids, emails or usernames
+    upload = request.FILES.get('file')
+    if upload is not None:
+        try:
+            entries = cohorts.parse_csv(upload.read().decode('utf-8-sig'))
+        except UnicodeDecodeError:
+            return Response({"message": "CSV file must be UTF-8 encoded"}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        entries = request.data.get('learners')
+        if not isinstance(entries, list):
+            return Response({"message": "Provide a CSV file or a learners list"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if not entries:
+        return Response({"message": "No learners given"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(entries) > cohorts.MAX_COHORT_SIZE:
+        return Response({"message": f"At most {cohorts.MAX_COHORT_SIZE} learners per request"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    summary = cohorts.enroll_cohort(course, entries)
+    return Response(summary, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK)
+
+
+def buffered_progress(enrollment_ids):
+    # Progress pings not yet flushed to the database
+    if not progress.is_enabled():
+        return {}
+    return progress.get_buffer().pending(enrollment_ids)
+
+
+def enrollments_etag(request):
+    # Row count and newest change of the learner's enrollments, plus course renames
+    enrollments = CourseEnrollment.objects.filter(learner=request.user)
+    summary = enrollments.aggregate(count=models.Count('pk'), updated=models.Max('updated_at'))
+    pending = buffered_progress(enrollments.values_list('pk', flat=True)) if summary['count'] else {}
+    return make_etag(
+        request.user.pk, summary['count'], summary['updated'], catalog_version('courses'), sorted(pending.items())
+    )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@etag_response(enrollments_etag)
 def my_enrollments(request):
-    enrollments = CourseEnrollment.objects.filter(learner=request.user)
+    enrollments = list(CourseEnrollment.objects.filter(learner=request.user).select_related('course', 'learner'))
+    pending = buffered_progress([enrollment.pk for enrollment in enrollments])
+    for enrollment in enrollments:
+        enrollment.progress = pending.get(str(enrollment.pk), enrollment.progress)
     serializer = CourseEnrollmentSerializer(enrollments, many=True)
     return Response(serializer.data)
 
@@ -131,13 +208,27 @@ def my_enrollments(request):
 def update_progress(request, enrollment_id):
     enrollment = get_object_or_404(CourseEnrollment, pk=enrollment_id, learner=request.user)
     
-    progress = request.data.get('progress', enrollment.progress)
-    if progress == 100 and not enrollment.completed:
+    try:
+        value = int(request.data.get('progress', enrollment.progress))
+    except (TypeError, ValueError):
+        return Response({"message": "Progress must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    if not 0 <= value <= 100:
+        return Response({"message": "Progress must be between 0 and 100"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if value == 100 and not enrollment.completed:
+        # Completion is written immediately, never buffered
         enrollment.completed = True
         enrollment.completed_at = timezone.now()
-    
-    enrollment.progress = progress
-    enrollment.save()
+        enrollment.progress = value
+        enrollment.save()
+        if progress.is_enabled():
+            progress.get_buffer().discard(enrollment.pk)
+    elif progress.is_enabled():
+        progress.get_buffer().record(enrollment.pk, value)
+        enrollment.progress = value
+    else:
+        enrollment.progress = value
+        enrollment.save()
     
     serializer = CourseEnrollmentSerializer(enrollment)
     return Response(serializer.data)
@@ -152,6 +243,83 @@ def course_enrollments(request, course_id):
     if not (course.facilitator == request.user or request.user.is_staff):
         return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
     
-    enrollments = CourseEnrollment.objects.filter(course=course)
+    enrollments = CourseEnrollment.objects.filter(course=course).select_related('course', 'learner')
     serializer = CourseEnrollmentSerializer(enrollments, many=True)
     return Response(serializer.data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def course_analytics(request, course_id):
+    course = get_object_or_404(Course, pk=course_id)
+    
+    # Only facilitator of the course or admin can view analytics
+    if not (course.facilitator_id == request.user.pk or request.user.is_staff):
+        return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
+    
+    start = parse_date(request.GET.get('from', '') or '1900-01-01')
+    end = parse_date(request.GET.get('to', '') or '9999-12-31')
+    if start is None or end is None:
+        return Response({"message": "from and to must be dates (YYYY-MM-DD)"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = analytics.course_analytics(course.pk, start, end)
+    data['course'] = course.pk
+    data['course_name'] = course.name
+    return Response(data)
+
+
+# Roster sort options; each ends in the primary key so keyset pages are stable
+ROSTER_ORDERINGS = {
+    'progress': ['progress', 'id'],
+    '-progress': ['-progress', '-id'],
+    'enrolled_at': ['enrolled_at', 'id'],
+    '-enrolled_at': ['-enrolled_at', '-id'],
+}
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def course_roster(request, course_id):
+    course = get_object_or_404(Course, pk=course_id)
+    
+    # Only facilitator of the course or admin can view the roster
+    if not (course.facilitator_id == request.user.pk or request.user.is_staff):
+        return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
+    
+    sort = request.GET.get('sort', '-enrolled_at')
+    if sort not in ROSTER_ORDERINGS:
+        return Response({"message": f"sort must be one of: {', '.join(ROSTER_ORDERINGS)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    enrollments = CourseEnrollment.objects.filter(course=course).select_related('course', 'learner')
+    
+    # Filter by completion and progress range
+    completed = request.GET.get('completed', '')
+    if completed in ('true', 'false'):
+        enrollments = enrollments.filter(completed=completed == 'true')
+    try:
+        if request.GET.get('min_progress'):
+            enrollments = enrollments.filter(progress__gte=int(request.GET['min_progress']))
+        if request.GET.get('max_progress'):
+            enrollments = enrollments.filter(progress__lte=int(request.GET['max_progress']))
+        page_size = min(max(int(request.GET.get('page_size', 50)), 1), 200)
+    except ValueError:
+        return Response({"message": "Progress bounds and page_size must be integers"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        page, next_cursor, previous_cursor = keyset_paginate(
+            enrollments, ROSTER_ORDERINGS[sort], cursor=request.GET.get('cursor', ''), page_size=page_size
+        )
+    except InvalidCursor:
+        return Response({"message": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = {
+        'results': CourseEnrollmentSerializer(page, many=True).data,
+        'next': next_cursor,
+        'previous': previous_cursor,
+        'page_size': page_size,
+    }
+    if request.GET.get('count') == 'true':
+        data['count'] = enrollments.count()
+    return Response(data)
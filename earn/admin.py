@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import MicroTask, TaskSubmission, Wallet, Transaction
+from .approvals import approve_submissions
+from .models import MicroTask, TaskSubmission, Wallet, Transaction, WorkItem, Payout
 
 # Register your models here.
 
@@ -9,17 +10,32 @@ class MicroTaskAdmin(admin.ModelAdmin):
     list_filter = ('is_active', 'created_at', 'task_type')
     search_fields = ('title', 'created_by__username')
 
+@admin.register(WorkItem)
+class WorkItemAdmin(admin.ModelAdmin):
+    list_display = ('task', 'status', 'leased_by', 'lease_expires_at', 'attempts', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('task__title', 'leased_by__username')
+
 @admin.register(TaskSubmission)
 class TaskSubmissionAdmin(admin.ModelAdmin):
     list_display = ('task', 'user', 'status', 'submitted_at')
     list_filter = ('status', 'submitted_at')
-    list_editable = ('status',)
     search_fields = ('task__title', 'user__username')
     actions = ['approve_submissions', 'reject_submissions']
 
+    def save_model(self, request, obj, form, change):
+        # Approving pays the reward, so that transition goes through the approval engine
+        approve = obj.status == 'approved' and 'status' in form.changed_data
+        if approve:
+            obj.status = form.initial.get('status') or 'pending'
+        super().save_model(request, obj, form, change)
+        if approve:
+            approve_submissions(TaskSubmission.objects.filter(pk=obj.pk))
+            obj.status = 'approved'
+
     def approve_submissions(self, request, queryset):
-        queryset.update(status='approved')
-        self.message_user(request, f"{queryset.count()} submissions approved.")
+        approved = approve_submissions(queryset)
+        self.message_user(request, f"{len(approved)} submissions approved.")
     approve_submissions.short_description = "Approve selected submissions"
 
     def reject_submissions(self, request, queryset):
@@ -31,9 +47,37 @@ class TaskSubmissionAdmin(admin.ModelAdmin):
 class WalletAdmin(admin.ModelAdmin):
     list_display = ('user', 'balance')
     search_fields = ('user__username',)
+    # Balances only move with a ledger entry, posted through earn/ledger.py
+    readonly_fields = ('balance',)
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
     list_display = ('wallet', 'amount', 'type', 'timestamp', 'description')
     list_filter = ('type', 'timestamp')
     search_fields = ('wallet__user__username', 'description')
+
+    # The ledger is append-only; entries are created through earn/ledger.py
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(Payout)
+class PayoutAdmin(admin.ModelAdmin):
+    list_display = ('wallet', 'amount', 'status', 'attempts', 'reference', 'created_at', 'settled_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('wallet__user__username', 'reference', 'batch_id')
+
+    # Payouts move only through earn/payouts.py, which keeps the wallet hold in step
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,61 @@
+from django.db import transaction
+
+from core.ids import parse_uuid
+from . import ledger
+from .models import TaskSubmission
+
+MAX_BULK_APPROVALS = 10000
+
+
+@transaction.atomic
+def approve_submissions(queryset):
+    """
+    Approve every not-yet-approved submission in the queryset and pay out the
+    task rewards with one wallet update per user. Returns the approved ids.
+    """
+    submissions = list(
+        queryset.exclude(status='approved')
+        .select_for_update(of=('self',))
+        .select_related('task')
+        .only('id', 'user_id', 'task__title', 'task__reward')
+        .order_by('submitted_at', 'id')
+    )
+    if not submissions:
+        return set()
+    ids = [submission.pk for submission in submissions]
+    TaskSubmission.objects.filter(pk__in=ids).update(status='approved')
+    ledger.credit_many(
+        (submission.user_id, submission.task.reward, f'Earnings from task: {submission.task.title}')
+        for submission in submissions
+    )
+    return set(ids)
+
+
+def bulk_approve(user, submission_ids):
+    """
+    Approve the given submissions on behalf of user in one transaction.
+
+    Returns one result per input id: 'approved', 'already_approved',
+    'invalid_id' or 'not_found' (missing, or a task created by someone else).
+    """
+    parsed = [(value, parse_uuid(value)) for value in submission_ids]
+    targets = TaskSubmission.objects.filter(pk__in=[pk for value, pk in parsed if pk is not None])
+    if not user.is_staff:
+        targets = targets.filter(task__created_by=user)
+
+    with transaction.atomic():
+        found = set(targets.values_list('pk', flat=True))
+        approved = approve_submissions(targets)
+
+    results = []
+    for value, pk in parsed:
+        if pk is None:
+            result = 'invalid_id'
+        elif pk in approved:
+            result = 'approved'
+        elif pk in found:
+            result = 'already_approved'
+        else:
+            result = 'not_found'
+        results.append({'id': str(pk) if pk else value, 'result': result})
+    return results
@@ -0,0 +1,70 @@
+"""
+Task board queries and the cached "highest paying tasks" feed.
+
+The board walks the (is_active, reward, created_at) index with keyset
+pagination, so a page costs the same however many tasks exist. The top-K feed
+is cached under the tasks catalog version, which every task write bumps (again
+after commit), so a changed or deactivated task is never served from a stale
+feed; the next read refills it with one indexed query of TOP_TASKS rows.
+"""
+import hashlib
+from decimal import Decimal, InvalidOperation
+
+from django.core.cache import cache
+from django.db import models
+
+from core.cache import catalog_version
+from .models import MicroTask
+from .serializers import MicroTaskSerializer
+
+BOARD_ORDERING = ['-reward', '-created_at', '-id']
+
+TOP_TASKS = 20
+
+TOP_TASKS_TIMEOUT = 60 * 60
+
+
+def parse_reward(value):
+    """Exact Decimal for a reward bound. Raises ValueError."""
+    try:
+        reward = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(value)
+    if not reward.is_finite():
+        raise ValueError(value)
+    return reward
+
+
+def filter_rewards(queryset, params):
+    """Apply min_reward/max_reward. Raises ValueError for malformed bounds."""
+    if params.get('min_reward'):
+        queryset = queryset.filter(reward__gte=parse_reward(params['min_reward']))
+    if params.get('max_reward'):
+        queryset = queryset.filter(reward__lte=parse_reward(params['max_reward']))
+    return queryset
+
+
+def task_type_facets(queryset, params):
+    """{task_type: count} over the reward-filtered board, cached until the next task write."""
+    bounds = f"{params.get('min_reward', '')}:{params.get('max_reward', '')}"
+    key = f"catalog:tasks:v{catalog_version('tasks')}:facets:{hashlib.md5(bounds.encode()).hexdigest()}"
+    facets = cache.get(key)
+    if facets is None:
+        facets = dict(queryset.order_by().values_list('task_type').annotate(count=models.Count('pk')))
+        cache.set(key, facets, TOP_TASKS_TIMEOUT)
+    return facets
+
+
+def _load_top_tasks():
+    tasks = MicroTask.objects.filter(is_active=True).order_by(*BOARD_ORDERING)[:TOP_TASKS]
+    return MicroTaskSerializer(tasks, many=True).data
+
+
+def top_tasks():
+    """The highest paying active tasks, best first."""
+    key = f"catalog:tasks:v{catalog_version('tasks')}:top"
+    entries = cache.get(key)
+    if entries is None:
+        entries = [dict(entry) for entry in _load_top_tasks()]
+        cache.set(key, entries, TOP_TASKS_TIMEOUT)
+    return entries
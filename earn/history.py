@@ -0,0 +1,75 @@
+"""
+Transaction history queries: time-range and type filters, keyset ordering and
+per-period totals, all served by the (wallet, timestamp, id) index.
+"""
+import datetime
+
+from django.db import models
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Transaction
+
+HISTORY_ORDERINGS = {
+    'desc': ['-timestamp', '-id'],
+    'asc': ['timestamp', 'id'],
+}
+
+SUMMARY_PERIODS = ('day', 'week', 'month', 'year')
+
+TRANSACTION_TYPES = [choice[0] for choice in Transaction._meta.get_field('type').choices]
+
+
+def parse_bound(value, end=False):
+    """
+    A 'from'/'to' bound as an aware datetime. Plain dates cover the whole day,
+    so to=2025-01-31 includes everything on the 31st. Raises ValueError.
+    """
+    day = parse_date(value)
+    if day is not None:
+        moment = datetime.datetime.combine(day + datetime.timedelta(days=1) if end else day, datetime.time())
+    else:
+        moment = parse_datetime(value)
+        if moment is None:
+            raise ValueError(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_transactions(queryset, params):
+    """Apply from/to/type query parameters. Raises ValueError with a client-facing message."""
+    try:
+        if params.get('from'):
+            queryset = queryset.filter(timestamp__gte=parse_bound(params['from']))
+        if params.get('to'):
+            if parse_date(params['to']) is not None:
+                # A plain date runs up to, not including, the next midnight
+                queryset = queryset.filter(timestamp__lt=parse_bound(params['to'], end=True))
+            else:
+                queryset = queryset.filter(timestamp__lte=parse_bound(params['to']))
+    except ValueError:
+        raise ValueError("from and to must be dates (YYYY-MM-DD) or ISO 8601 datetimes")
+
+    transaction_type = params.get('type', '')
+    if transaction_type:
+        if transaction_type not in TRANSACTION_TYPES:
+            raise ValueError(f"type must be one of: {', '.join(TRANSACTION_TYPES)}")
+        queryset = queryset.filter(type=transaction_type)
+    return queryset
+
+
+def period_summaries(queryset, period):
+    """Credit/debit totals and entry counts per period, newest period first, computed in SQL."""
+    return list(
+        queryset.order_by()
+        .annotate(period=Trunc('timestamp', period))
+        .values('period')
+        .annotate(
+            credits=models.Sum('amount', filter=models.Q(type='credit'), default=0),
+            debits=models.Sum('amount', filter=models.Q(type='debit'), default=0),
+            count=models.Count('pk'),
+        )
+        .order_by('-period')
+    )
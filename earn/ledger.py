@@ -0,0 +1,116 @@
+"""
+Wallet ledger.
+
+Every balance change is an append-only Transaction row written in the same
+database transaction as a single F-expression UPDATE of Wallet.balance, so
+concurrent credits never lose updates and debits can never overdraw. The
+UPDATE holds the wallet's row lock until commit, which makes the balance read
+back for Transaction.balance_after an exact snapshot. Wallet.balance stays the
+O(1) read path.
+
+credit_many() posts a batch of credits with one UPDATE per wallet and a single
+bulk insert of the entries.
+"""
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.db import models, transaction
+
+from .models import Transaction, Wallet
+
+CREDIT = 'credit'
+DEBIT = 'debit'
+
+CENT = Decimal('0.01')
+
+# Largest amount Transaction.amount can store (max_digits=10, decimal_places=2)
+MAX_AMOUNT = Decimal('99999999.99')
+
+
+class InsufficientFunds(Exception):
+    pass
+
+
+def parse_amount(value):
+    """A positive Decimal rounded to cents, at most MAX_AMOUNT, or None if value is not one."""
+    try:
+        amount = Decimal(str(value)).quantize(CENT)
+    except (InvalidOperation, ValueError):
+        return None
+    return amount if amount.is_finite() and 0 < amount <= MAX_AMOUNT else None
+
+
+def wallet_for(user):
+    wallet, created = Wallet.objects.get_or_create(user=user)
+    return wallet
+
+
+@transaction.atomic
+def post(wallet, amount, type, description=''):
+    """
+    Apply one ledger entry to the wallet and return the Transaction.
+
+    Raises InsufficientFunds if a debit would take the balance below zero.
+    wallet.balance is refreshed to the new balance.
+    """
+    amount = Decimal(amount).quantize(CENT)
+    if amount <= 0:
+        raise ValueError("Ledger amounts must be positive.")
+    rows = Wallet.objects.filter(pk=wallet.pk)
+    if type == DEBIT:
+        rows = rows.filter(balance__gte=amount)
+        change = -amount
+    else:
+        change = amount
+    if not rows.update(balance=models.F('balance') + change):
+        raise InsufficientFunds(f"Wallet {wallet.pk} cannot cover {amount}.")
+
+    wallet.balance = Wallet.objects.filter(pk=wallet.pk).values_list('balance', flat=True).get()
+    return Transaction.objects.create(
+        wallet=wallet, amount=amount, type=type, description=description, balance_after=wallet.balance
+    )
+
+
+def credit(wallet, amount, description=''):
+    return post(wallet, amount, CREDIT, description)
+
+
+def debit(wallet, amount, description=''):
+    return post(wallet, amount, DEBIT, description)
+
+
+@transaction.atomic
+def credit_many(credits):
+    """
+    Credit [(user_id, amount, description)] and return the created Transactions.
+
+    Missing wallets are created, each wallet's balance moves once by its total,
+    and the entries get running balance_after snapshots in input order.
+    """
+    credits = [(user_id, Decimal(amount).quantize(CENT), description) for user_id, amount, description in credits]
+    credits = [credit for credit in credits if credit[1] > 0]
+    if not credits:
+        return []
+
+    user_ids = {user_id for user_id, amount, description in credits}
+    Wallet.objects.bulk_create([Wallet(user_id=user_id) for user_id in user_ids], ignore_conflicts=True)
+    wallets = dict(Wallet.objects.filter(user_id__in=user_ids).values_list('user_id', 'pk'))
+
+    totals = defaultdict(Decimal)
+    for user_id, amount, description in credits:
+        totals[wallets[user_id]] += amount
+    # Fixed lock order, so concurrent batches cannot deadlock on each other's wallets
+    for wallet_id in sorted(totals):
+        Wallet.objects.filter(pk=wallet_id).update(balance=models.F('balance') + totals[wallet_id])
+
+    balances = dict(Wallet.objects.filter(pk__in=totals).values_list('pk', 'balance'))
+    running = {wallet_id: balances[wallet_id] - total for wallet_id, total in totals.items()}
+    entries = []
+    for user_id, amount, description in credits:
+        wallet_id = wallets[user_id]
+        running[wallet_id] += amount
+        entries.append(Transaction(
+            wallet_id=wallet_id, amount=amount, type=CREDIT,
+            description=description, balance_after=running[wallet_id]
+        ))
+    return Transaction.objects.bulk_create(entries, batch_size=1000)
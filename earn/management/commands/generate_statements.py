@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from earn.statements import STATEMENT_FORMATS, generate_month, month_bounds
+
+
+class Command(BaseCommand):
+    help = "Write every wallet's statement for a month to a directory"
+
+    def add_arguments(self, parser):
+        parser.add_argument('month', help="YYYY-MM")
+        parser.add_argument('--output-dir', default='statements')
+        parser.add_argument('--type', dest='types', action='append', choices=STATEMENT_FORMATS,
+                            help="Statement format; repeat for several (default: csv and pdf)")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Worker processes (default: CPU count; 0 runs in-process)")
+        parser.add_argument('--include-empty', action='store_true',
+                            help="Also write statements for wallets with no entries up to the month's end")
+
+    def handle(self, *args, **options):
+        try:
+            month_bounds(options['month'])
+        except ValueError:
+            raise CommandError("month must be YYYY-MM")
+
+        written = generate_month(
+            options['month'],
+            options['output_dir'],
+            formats=options['types'] or STATEMENT_FORMATS,
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            include_empty=options['include_empty'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote statements for {written} wallets to {options['output_dir']}."
+        ))
@@ -0,0 +1,43 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from earn.reconcile import reconcile
+
+
+class Command(BaseCommand):
+    help = "Check every wallet balance against its transaction ledger, optionally repairing mismatches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Worker processes (default: CPU count; 0 runs in-process)")
+        parser.add_argument('--repair', action='store_true',
+                            help="Reset mismatched balances to their ledger totals")
+        parser.add_argument('--checkpoint', default='wallet_reconcile.checkpoint.json',
+                            help="Progress file; an interrupted run resumes from it")
+        parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint")
+
+    def handle(self, *args, **options):
+        if options['restart']:
+            if os.path.exists(options['checkpoint']):
+                os.remove(options['checkpoint'])
+
+        verb = 'repaired' if options['repair'] else 'found'
+
+        def report(mismatch):
+            self.stdout.write(
+                f"Wallet {mismatch['wallet']}: balance {mismatch['balance']}, ledger {mismatch['ledger']} ({verb})"
+            )
+
+        state = reconcile(
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            repair=options['repair'],
+            checkpoint=options['checkpoint'],
+            on_mismatch=report,
+        )
+        style = self.style.SUCCESS if not state['mismatches'] else self.style.WARNING
+        self.stdout.write(style(
+            f"Checked {state['wallets']} wallets, {state['mismatches']} mismatches {verb}."
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from earn.payouts import settle
+
+
+class Command(BaseCommand):
+    help = "Submit pending withdrawal payouts to the payment backend in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help="Payouts per gateway call (default: PAYOUT_BATCH_SIZE)")
+        parser.add_argument('--max-batches', type=int, default=None)
+
+    def handle(self, *args, **options):
+        counts = settle(batch_size=options['batch_size'], max_batches=options['max_batches'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['batches']} batches: {counts['paid']} paid, {counts['failed']} failed, "
+            f"{counts['retried']} retried, {counts['unresolved']} awaiting reconciliation."
+        ))
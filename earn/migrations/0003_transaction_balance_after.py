@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:30
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_balance_after(apps, schema_editor):
+    # Running balance of each wallet's existing entries, oldest first
+    Transaction = apps.get_model('earn', 'Transaction')
+    balances = {}
+    batch = []
+    for entry in Transaction.objects.order_by('wallet_id', 'timestamp', 'id').iterator(chunk_size=2000):
+        change = entry.amount if entry.type == 'credit' else -entry.amount
+        balances[entry.wallet_id] = balances.get(entry.wallet_id, Decimal('0.00')) + change
+        entry.balance_after = balances[entry.wallet_id]
+        batch.append(entry)
+        if len(batch) >= 2000:
+            Transaction.objects.bulk_update(batch, ['balance_after'])
+            batch = []
+    Transaction.objects.bulk_update(batch, ['balance_after'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('earn', '0002_alter_microtask_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='balance_after',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.RunPython(backfill_balance_after, migrations.RunPython.noop),
+    ]
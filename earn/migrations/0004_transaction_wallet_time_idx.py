@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('earn', '0003_transaction_balance_after'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['wallet', 'timestamp', 'id'], name='transaction_wallet_time_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:39
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_missing_created_at(apps, schema_editor):
+    # Board cursors need a created_at on every task
+    MicroTask = apps.get_model('earn', 'MicroTask')
+    MicroTask.objects.filter(created_at__isnull=True).update(created_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('earn', '0005_workitem'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_missing_created_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='microtask',
+            index=models.Index(fields=['is_active', 'reward', 'created_at'], name='microtask_board_idx'),
+        ),
+    ]
@@ -2,6 +2,7 @@ import uuid
 from decimal import Decimal
 
 from django.db import models
+from django.utils import timezone
 
 from core.models import User
 
@@ -17,13 +18,46 @@ class MicroTask(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Task board: active tasks by reward, newest first within a reward
+            models.Index(fields=['is_active', 'reward', 'created_at'], name='microtask_board_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class WorkItem(models.Model):
+    # One unit of work under a MicroTask, handed out to workers under a
+    # time-limited lease by earn/workqueue.py. Expired leases are claimable again.
+    STATUS_CHOICES = [('open', 'Open'), ('leased', 'Leased'), ('done', 'Done')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.ForeignKey(MicroTask, on_delete=models.CASCADE, related_name='work_items')
+    payload = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    leased_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='leased_work_items')
+    lease_token = models.UUIDField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Claim scans: open items, and leased items whose lease has run out
+            models.Index(fields=['task', 'status', 'lease_expires_at'], name='workitem_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"Work item {self.id} of {self.task_id}"
+
+
 class TaskSubmission(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     task = models.ForeignKey(MicroTask, on_delete=models.PROTECT, related_name='submissions')
+    # Set when the work was done under a lease from the work-item queue
+    work_item = models.ForeignKey(WorkItem, on_delete=models.SET_NULL, null=True, blank=True, related_name='submissions')
     user = models.ForeignKey(User, on_delete=models.PROTECT, related_name='task_submissions')
     submission = models.TextField(blank=True)  # or FileField if file uploads
     status = models.CharField(max_length=20, choices=[('pending','Pending'),('approved','Approved'),('rejected','Rejected')], default='pending')
@@ -36,9 +70,59 @@ class Wallet(models.Model):
 
 
 class Transaction(models.Model):
+    # Append-only ledger entry; post them through earn/ledger.py, which moves
+    # Wallet.balance in the same database transaction.
     wallet = models.ForeignKey(Wallet, on_delete=models.PROTECT, related_name='transactions')
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     type = models.CharField(max_length=10, choices=[('credit','Credit'),('debit','Debit')])
     timestamp = models.DateTimeField(auto_now_add=True)
     description = models.CharField(max_length=255, blank=True)
+    # Wallet balance right after this entry was applied
+    balance_after = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # History pages and period summaries: one range scan per wallet
+            models.Index(fields=['wallet', 'timestamp', 'id'], name='transaction_wallet_time_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Ledger transactions are append-only and cannot be changed.")
+        super().save(*args, **kwargs)
 
+    def delete(self, *args, **kwargs):
+        raise ValueError("Ledger transactions are append-only and cannot be deleted.")
+
+
+
+class Payout(models.Model):
+    # A withdrawal waiting on the payment gateway. The funds are held by the
+    # debit posted when it was requested and credited back if it fails;
+    # earn/payouts.py submits pending payouts in batches.
+    STATUS_CHOICES = [('pending', 'Pending'), ('submitted', 'Submitted'), ('paid', 'Paid'), ('failed', 'Failed')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    wallet = models.ForeignKey(Wallet, on_delete=models.PROTECT, related_name='payouts')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    destination = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    hold = models.OneToOneField(Transaction, on_delete=models.PROTECT, related_name='payout')
+    batch_id = models.UUIDField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    reference = models.CharField(max_length=255, blank=True)
+    failure_reason = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    settled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Settlement scans: due pending payouts, and submitted batches to reconcile
+            models.Index(fields=['status', 'next_attempt_at'], name='payout_settle_idx'),
+            models.Index(fields=['batch_id'], name='payout_batch_idx'),
+        ]
+
+    def __str__(self):
+        return f"Payout {self.id} of {self.amount} ({self.status})"
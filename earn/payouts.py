@@ -0,0 +1,212 @@
+"""
+Batched payout settlement for withdrawals.
+
+A withdrawal debits the wallet at once (the hold) and queues a Payout, so the
+request never waits on the payment gateway. settle() claims due payouts in
+batches, submits each batch to the configured backend in a single call and
+applies the per-payout results: paid, failed (the hold is credited back) or
+retried later with exponential backoff.
+
+The payout id is the backend's idempotency key: submitting a payout it has
+already settled returns the original result instead of paying again. A batch
+whose call errored, or whose worker died mid-call, stays 'submitted' (its
+outcome is unknown, never guessed) and is resubmitted under the same batch id
+once SUBMIT_TIMEOUT has passed, so an overlapping or repeated run cannot pay
+twice. Only an explicit 'retry' or 'failed' from the backend requeues a payout
+or releases its hold.
+"""
+import functools
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import ledger
+from .models import Payout
+
+MAX_ATTEMPTS = 5
+
+RETRY_DELAY = timedelta(minutes=1)
+
+# Submitted batches older than this are resent under their original batch id.
+SUBMIT_TIMEOUT = timedelta(minutes=10)
+
+
+class GatewayError(Exception):
+    """The backend could not be reached; the outcome of the call is unknown."""
+
+
+class LocalGateway:
+    """
+    Stand-in backend that pays every payout in memory.
+
+    A backend implements submit_batch(batch_id, payouts) and
+    batch_status(batch_id), both returning {payout_id: result} where result is
+    {'status': 'paid' | 'failed' | 'retry', 'reference': ..., 'reason': ...}.
+    Payout ids are idempotency keys: a payout already paid or failed keeps its
+    first result whichever batch it is submitted in. batch_status returns None
+    for a batch the backend has no record of (yet).
+    """
+
+    def __init__(self):
+        self.batches = {}
+        self.settled = {}
+
+    def outcome(self, payout):
+        return {'status': 'paid', 'reference': f"local-{payout['id']}"}
+
+    def submit_batch(self, batch_id, payouts):
+        results = {}
+        for payout in payouts:
+            result = self.settled.get(payout['id']) or self.outcome(payout)
+            if result['status'] != 'retry':
+                self.settled[payout['id']] = result
+            results[payout['id']] = result
+        self.batches.setdefault(batch_id, {}).update(results)
+        return results
+
+    def batch_status(self, batch_id):
+        return self.batches.get(batch_id)
+
+
+@functools.cache
+def get_backend():
+    return import_string(settings.PAYOUT_BACKEND)()
+
+
+@transaction.atomic
+def request_payout(wallet, amount, destination=''):
+    """
+    Hold amount from the wallet and queue its payout.
+
+    Raises ledger.InsufficientFunds if the balance cannot cover it.
+    """
+    hold = ledger.debit(wallet, amount, description='Withdrawal to bank account')
+    return Payout.objects.create(wallet=wallet, amount=hold.amount, destination=destination, hold=hold)
+
+
+def claim_batch(batch_size, now):
+    """Mark up to batch_size due payouts as submitted under a new batch id."""
+    batch_id = uuid.uuid4()
+    due = Payout.objects.filter(status='pending', next_attempt_at__lte=now).order_by('next_attempt_at')
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('pk', flat=True)[:batch_size])
+        # Re-checked by the UPDATE, so concurrent settlers never share a payout
+        Payout.objects.filter(pk__in=ids, status='pending').update(
+            status='submitted', batch_id=batch_id, submitted_at=now, attempts=models.F('attempts') + 1
+        )
+    return batch_id, list(Payout.objects.filter(batch_id=batch_id))
+
+
+def _in_flight(payout):
+    return Payout.objects.filter(pk=payout.pk, status='submitted', batch_id=payout.batch_id)
+
+
+@transaction.atomic
+def fail(payout, reason, now):
+    """Give up on a submitted payout and release its hold back to the wallet."""
+    if _in_flight(payout).update(status='failed', failure_reason=reason[:255], settled_at=now):
+        ledger.credit(payout.wallet, payout.amount, description=f"Withdrawal reversed: {reason}"[:255])
+
+
+def retry(payout, reason, now):
+    """Requeue a payout the backend explicitly declined to process this time."""
+    if payout.attempts >= MAX_ATTEMPTS:
+        return fail(payout, reason, now)
+    _in_flight(payout).update(
+        status='pending', batch_id=None, failure_reason=reason[:255],
+        next_attempt_at=now + RETRY_DELAY * 2 ** (payout.attempts - 1),
+    )
+
+
+def apply_results(batch_id, results, now):
+    """
+    Settle a batch's submitted payouts from the backend's results. Payouts
+    missing from the results stay submitted. Returns a Counter by outcome.
+    """
+    counts = Counter()
+    for payout in Payout.objects.filter(batch_id=batch_id, status='submitted').select_related('wallet'):
+        result = results.get(str(payout.pk))
+        if result is None:
+            counts['unresolved'] += 1
+        elif result['status'] == 'paid':
+            _in_flight(payout).update(status='paid', reference=result.get('reference', ''), settled_at=now)
+            counts['paid'] += 1
+        elif result['status'] == 'failed':
+            fail(payout, result.get('reason', 'Rejected by gateway'), now)
+            counts['failed'] += 1
+        else:
+            retry(payout, result.get('reason', 'Gateway asked to retry'), now)
+            counts['retried'] += 1
+    return counts
+
+
+def _items(payouts):
+    return [
+        {'id': str(payout.pk), 'amount': payout.amount, 'destination': payout.destination}
+        for payout in payouts
+    ]
+
+
+def submit(batch_id, payouts, backend, now):
+    """
+    Send a batch and apply the results. On a backend error the batch stays
+    submitted; its outcome is looked up once, and anything still unknown is
+    left for the stale sweep. Returns (counts, reached backend).
+    """
+    try:
+        results = backend.submit_batch(str(batch_id), _items(payouts))
+    except GatewayError:
+        try:
+            results = backend.batch_status(str(batch_id)) or {}
+        except GatewayError:
+            results = {}
+        return apply_results(batch_id, results, now), False
+    return apply_results(batch_id, results, now), True
+
+
+def resubmit_stale(backend, now):
+    """Resend batches left submitted for SUBMIT_TIMEOUT under their original batch id."""
+    counts = Counter()
+    stale = (
+        Payout.objects.filter(status='submitted', submitted_at__lte=now - SUBMIT_TIMEOUT)
+        .order_by().values_list('batch_id', flat=True).distinct()
+    )
+    for batch_id in list(stale):
+        payouts = list(Payout.objects.filter(batch_id=batch_id, status='submitted'))
+        # Restart the clock so an overlapping run does not pick the batch up again at once
+        Payout.objects.filter(batch_id=batch_id, status='submitted').update(submitted_at=now)
+        resolved, reached = submit(batch_id, payouts, backend, now)
+        counts.update(resolved)
+        if not reached:
+            break
+    return counts
+
+
+def settle(batch_size=None, max_batches=None, backend=None):
+    """
+    Resend stale submitted batches, then submit due payouts batch by batch
+    until none are left, max_batches is reached or the backend errors.
+    Returns a Counter of batches and payout outcomes.
+    """
+    backend = backend or get_backend()
+    batch_size = batch_size or settings.PAYOUT_BATCH_SIZE
+    now = timezone.now()
+    counts = resubmit_stale(backend, now)
+
+    while max_batches is None or counts['batches'] < max_batches:
+        batch_id, payouts = claim_batch(batch_size, now)
+        if not payouts:
+            break
+        counts['batches'] += 1
+        resolved, reached = submit(batch_id, payouts, backend, now)
+        counts.update(resolved)
+        if not reached:
+            break
+    return counts
@@ -0,0 +1,155 @@
+"""
+Wallet reconciliation: Wallet.balance must equal the wallet's credits minus
+debits in the Transaction ledger.
+
+Wallets are split into primary-key ranges of chunk_size. Each range is checked
+with one query (balances next to their ledger sums) in a forked worker process
+and only per-range results travel back, so memory stays bounded however many
+wallets exist. Progress is checkpointed to a JSON file after every contiguous
+run of finished ranges; a rerun resumes after the last checkpoint.
+"""
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal
+
+from django.db import connections, models, transaction
+from django.db.models.functions import Coalesce
+
+from .models import Transaction, Wallet
+
+
+def chunk_bounds(chunk_size, after=0):
+    """Yield (low, high) wallet pk ranges holding up to chunk_size wallets each."""
+    while True:
+        wallets = Wallet.objects.filter(pk__gt=after).order_by('pk').values_list('pk', flat=True)
+        high = wallets[chunk_size - 1:chunk_size].first()
+        if high is None:
+            high = wallets.aggregate(high=models.Max('pk'))['high']
+            if high is None:
+                return
+        yield after + 1, high
+        after = high
+
+
+def ledger_sums(wallets):
+    """{wallet_id: credits - debits} for the wallets in the queryset."""
+    rows = (
+        Transaction.objects.filter(wallet__in=wallets)
+        .order_by()
+        .values('wallet_id')
+        .annotate(
+            credits=models.Sum('amount', filter=models.Q(type='credit'), default=Decimal('0')),
+            debits=models.Sum('amount', filter=models.Q(type='debit'), default=Decimal('0')),
+        )
+    )
+    return {row['wallet_id']: row['credits'] - row['debits'] for row in rows}
+
+
+@transaction.atomic
+def repair_wallet(wallet_id):
+    """Reset one wallet's balance to its ledger total under the wallet's row lock."""
+    wallet = Wallet.objects.select_for_update().get(pk=wallet_id)
+    expected = ledger_sums(Wallet.objects.filter(pk=wallet_id)).get(wallet_id, Decimal('0.00'))
+    if wallet.balance != expected:
+        Wallet.objects.filter(pk=wallet_id).update(balance=expected)
+    return expected
+
+
+def with_ledger_totals(wallets):
+    """(pk, balance, credits - debits) per wallet, read in a single statement."""
+    entries = Transaction.objects.filter(wallet=models.OuterRef('pk')).order_by().values('wallet')
+    money = models.DecimalField(max_digits=12, decimal_places=2)
+    credits = entries.annotate(total=models.Sum('amount', filter=models.Q(type='credit'))).values('total')
+    debits = entries.annotate(total=models.Sum('amount', filter=models.Q(type='debit'))).values('total')
+    zero = models.Value(Decimal('0'), output_field=money)
+    return wallets.annotate(
+        credits=Coalesce(models.Subquery(credits, output_field=money), zero),
+        debits=Coalesce(models.Subquery(debits, output_field=money), zero),
+    ).values_list('pk', 'balance', 'credits', 'debits')
+
+
+def reconcile_range(low, high, repair=False):
+    """Check (and optionally repair) wallets with low <= pk <= high."""
+    wallets = Wallet.objects.filter(pk__gte=low, pk__lte=high)
+    # Balances and ledger totals from one statement, so both see the same snapshot
+    # and an entry committed mid-check cannot show up as a mismatch
+    rows = list(with_ledger_totals(wallets))
+    mismatches = []
+    for wallet_id, balance, credits, debits in rows:
+        expected = credits - debits
+        if balance != expected:
+            if repair:
+                # Re-checked under lock, so entries posted meanwhile are accounted for
+                expected = repair_wallet(wallet_id)
+            mismatches.append({'wallet': wallet_id, 'balance': balance, 'ledger': expected})
+    return {'low': low, 'high': high, 'wallets': len(rows), 'mismatches': mismatches}
+
+
+def _run_in_worker(low, high, repair):
+    try:
+        return reconcile_range(low, high, repair)
+    finally:
+        connections.close_all()
+
+
+def load_checkpoint(path):
+    if path and os.path.exists(path):
+        with open(path) as handle:
+            return json.load(handle)
+    return {'after': 0, 'wallets': 0, 'mismatches': 0}
+
+
+def save_checkpoint(path, state):
+    if not path:
+        return
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as handle:
+        json.dump(state, handle)
+    os.replace(temporary, path)
+
+
+def reconcile(chunk_size=5000, workers=None, repair=False, checkpoint=None, on_mismatch=None):
+    """
+    Reconcile every wallet after the checkpoint. workers=0 runs in-process.
+
+    on_mismatch(mismatch) is called for each wallet found out of balance.
+    Returns the final state: wallets checked and mismatches found (including
+    those from before a resume). The checkpoint file is removed on completion.
+    """
+    state = load_checkpoint(checkpoint)
+    # A few hundred (low, high) pairs even for millions of wallets
+    ranges = list(chunk_bounds(chunk_size, after=state['after']))
+
+    def record(low, high, result):
+        state['wallets'] += result['wallets']
+        state['mismatches'] += len(result['mismatches'])
+        if on_mismatch:
+            for mismatch in result['mismatches']:
+                on_mismatch(mismatch)
+        state['after'] = high
+        save_checkpoint(checkpoint, state)
+
+    if workers == 0:
+        for low, high in ranges:
+            record(low, high, reconcile_range(low, high, repair))
+    else:
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context) as pool:
+            futures = {pool.submit(_run_in_worker, low, high, repair): low for low, high in ranges}
+            next_index = 0
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                # Checkpoint only the contiguous prefix of finished ranges
+                while next_index < len(ranges) and ranges[next_index][0] in results:
+                    low, high = ranges[next_index]
+                    record(low, high, results.pop(low))
+                    next_index += 1
+
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return state
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from decimal import Decimal
-from .models import MicroTask, TaskSubmission, Wallet, Transaction
+from .models import MicroTask, TaskSubmission, Wallet, Transaction, WorkItem, Payout
 
 
 class MicroTaskSerializer(serializers.ModelSerializer):
@@ -17,6 +17,13 @@ class TaskSubmissionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'submitted_at']
 
 
+class WorkItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WorkItem
+        fields = ['id', 'task', 'payload', 'status', 'lease_expires_at', 'attempts']
+        read_only_fields = fields
+
+
 class WalletSerializer(serializers.ModelSerializer):
     class Meta:
         model = Wallet
@@ -26,5 +33,12 @@ class WalletSerializer(serializers.ModelSerializer):
 class TransactionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transaction
-        fields = ['wallet', 'amount', 'type', 'timestamp', 'description']
-        read_only_fields = ['timestamp']
\ No newline at end of file
+        fields = ['id', 'wallet', 'amount', 'type', 'timestamp', 'description', 'balance_after']
+        read_only_fields = ['id', 'timestamp', 'balance_after']
+
+
+class PayoutSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Payout
+        fields = ['id', 'amount', 'destination', 'status', 'reference', 'failure_reason', 'created_at', 'settled_at']
+        read_only_fields = fields
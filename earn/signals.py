@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import invalidate_catalog
+from .models import MicroTask
+
+
+# Also retires the cached top-tasks feed (see earn/board.py)
+@receiver(post_save, sender=MicroTask)
+@receiver(post_delete, sender=MicroTask)
+def invalidate_task_catalog(sender, **kwargs):
+    invalidate_catalog('tasks')
@@ -0,0 +1,222 @@
+"""
+Monthly wallet statements as streamed CSV or a paginated PDF.
+
+Opening balances and period totals come from one grouped aggregate over the
+ledger, and entries are streamed in (timestamp, id) order with a running
+balance, so no statement is ever held in memory as a whole (a PDF keeps only
+the page being drawn). generate_month() writes every wallet's statement for a
+month to a directory, spreading wallet ranges over a forked process pool.
+"""
+import calendar
+import datetime
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal
+from itertools import chain
+
+from django.db import connections, models
+from django.utils import timezone
+from PIL import Image, ImageDraw, ImageFont
+
+from core.streaming import csv_lines
+from .models import Transaction, Wallet
+from .reconcile import chunk_bounds
+
+STATEMENT_HEADER = ['date', 'type', 'description', 'amount', 'balance']
+
+STATEMENT_FORMATS = ('csv', 'pdf')
+
+ZERO = Decimal('0.00')
+
+# PDF layout, in points on an A4 page
+PAGE_SIZE = (595, 842)
+MARGIN = 40
+LINE_HEIGHT = 16
+ROWS_PER_PAGE = 44
+COLUMNS = [('Date', 40), ('Type', 150), ('Description', 200), ('Amount', 430), ('Balance', 500)]
+
+
+def month_bounds(month):
+    """[start, end) of a 'YYYY-MM' month as aware datetimes. Raises ValueError."""
+    if not re.fullmatch(r'\d{4}-\d{2}', month):
+        raise ValueError(month)
+    year, number = (int(part) for part in month.split('-'))
+    start = datetime.datetime(year, number, 1)
+    end = start + datetime.timedelta(days=calendar.monthrange(year, number)[1])
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+def _signed_amount():
+    return models.Case(
+        models.When(type='credit', then=models.F('amount')),
+        default=-models.F('amount'),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def period_totals(wallets, start, end):
+    """{wallet_id: {'opening', 'credits', 'debits', 'closing'}} from one grouped query."""
+    rows = (
+        Transaction.objects.filter(wallet__in=wallets, timestamp__lt=end)
+        .order_by()
+        .values('wallet_id')
+        .annotate(
+            opening=models.Sum(_signed_amount(), filter=models.Q(timestamp__lt=start), default=ZERO),
+            credits=models.Sum('amount', filter=models.Q(type='credit', timestamp__gte=start), default=ZERO),
+            debits=models.Sum('amount', filter=models.Q(type='debit', timestamp__gte=start), default=ZERO),
+        )
+    )
+    totals = {}
+    for row in rows:
+        wallet_id = row.pop('wallet_id')
+        # SQLite sums come back with their scale dropped
+        row = {key: Decimal(value).quantize(ZERO) for key, value in row.items()}
+        row['closing'] = row['opening'] + row['credits'] - row['debits']
+        totals[wallet_id] = row
+    return totals
+
+
+def empty_totals():
+    return {'opening': ZERO, 'credits': ZERO, 'debits': ZERO, 'closing': ZERO}
+
+
+def entries(wallet_id, start, end, opening):
+    """Yield statement rows for the period with a running balance, streamed from the database."""
+    balance = opening
+    rows = (
+        Transaction.objects.filter(wallet_id=wallet_id, timestamp__gte=start, timestamp__lt=end)
+        .order_by('timestamp', 'id')
+        .values_list('timestamp', 'type', 'description', 'amount')
+        .iterator(chunk_size=2000)
+    )
+    for timestamp, entry_type, description, amount in rows:
+        balance += amount if entry_type == 'credit' else -amount
+        yield [timestamp.isoformat(), entry_type, description, amount, balance]
+
+
+def statement_rows(wallet_id, start, end, totals):
+    return chain(
+        [[start.isoformat(), '', 'Opening balance', '', totals['opening']]],
+        entries(wallet_id, start, end, totals['opening']),
+        [[end.isoformat(), '', 'Closing balance', '', totals['closing']]],
+    )
+
+
+def csv_statement(wallet_id, start, end, totals):
+    """Yield the statement as CSV lines."""
+    return csv_lines(STATEMENT_HEADER, statement_rows(wallet_id, start, end, totals))
+
+
+def _new_page(title, number, font):
+    page = Image.new('L', PAGE_SIZE, 255)
+    draw = ImageDraw.Draw(page)
+    draw.text((MARGIN, MARGIN), f"{title}  -  page {number}", fill=0, font=font)
+    y = MARGIN + 2 * LINE_HEIGHT
+    for label, x in COLUMNS:
+        draw.text((x, y), label, fill=0, font=font)
+    draw.line((MARGIN, y + LINE_HEIGHT - 2, PAGE_SIZE[0] - MARGIN, y + LINE_HEIGHT - 2), fill=0)
+    return page, draw, y + LINE_HEIGHT
+
+
+def write_pdf(fp, title, wallet_id, start, end, totals):
+    """
+    Render the statement to fp as a PDF, ROWS_PER_PAGE entries per page.
+
+    Each page is appended to the file as soon as it is full, so only one page
+    image is held at a time. fp must be a real file opened for reading and
+    writing ('w+b'); Pillow re-reads it to append.
+    """
+    font = ImageFont.load_default()
+    rows = statement_rows(wallet_id, start, end, totals)
+    summary = (
+        f"Opening {totals['opening']}   Credits {totals['credits']}   "
+        f"Debits {totals['debits']}   Closing {totals['closing']}"
+    )
+    page, pages = None, 0
+
+    def flush(page):
+        page.save(fp, format='PDF', resolution=72, append=pages > 1)
+
+    for index, row in enumerate(rows):
+        if index % ROWS_PER_PAGE == 0:
+            if page is not None:
+                flush(page)
+            pages += 1
+            page, draw, y = _new_page(title, pages, font)
+            if pages == 1:
+                draw.text((MARGIN, MARGIN + LINE_HEIGHT), summary, fill=0, font=font)
+        date, entry_type, description, amount, balance = row
+        cells = [date[:10], entry_type, str(description)[:36], str(amount), str(balance)]
+        for (label, x), cell in zip(COLUMNS, cells):
+            draw.text((x, y), cell, fill=0, font=font)
+        y += LINE_HEIGHT
+    flush(page)
+
+
+def pdf_statement(title, wallet_id, start, end, totals):
+    """The statement as a PDF in a temporary file, rewound for reading."""
+    handle = tempfile.TemporaryFile()
+    write_pdf(handle, title, wallet_id, start, end, totals)
+    handle.seek(0)
+    return handle
+
+
+def statement_title(username, start):
+    return f"Wallet statement for {username}, {start:%B %Y}"
+
+
+def write_range(low, high, month, output_dir, formats, include_empty=False):
+    """Write statements for wallets with low <= pk <= high. Returns the number of wallets written."""
+    start, end = month_bounds(month)
+    wallets = Wallet.objects.filter(pk__gte=low, pk__lte=high)
+    totals = period_totals(wallets, start, end)
+    written = 0
+    for wallet_id, username in wallets.order_by('pk').values_list('pk', 'user__username').iterator(chunk_size=1000):
+        wallet_totals = totals.get(wallet_id)
+        if wallet_totals is None:
+            if not include_empty:
+                continue
+            wallet_totals = empty_totals()
+        base = os.path.join(output_dir, f'wallet-{wallet_id}-{start:%Y-%m}')
+        if 'csv' in formats:
+            with open(f'{base}.csv', 'w', newline='') as handle:
+                handle.writelines(csv_statement(wallet_id, start, end, wallet_totals))
+        if 'pdf' in formats:
+            with open(f'{base}.pdf', 'w+b') as handle:
+                write_pdf(handle, statement_title(username, start), wallet_id, start, end, wallet_totals)
+        written += 1
+    return written
+
+
+def _write_range_in_worker(*args):
+    try:
+        return write_range(*args)
+    finally:
+        connections.close_all()
+
+
+def generate_month(month, output_dir, formats=STATEMENT_FORMATS, workers=None, chunk_size=1000,
+                   include_empty=False):
+    """
+    Write every wallet's statement for the month into output_dir. Wallets with
+    no ledger entries up to the month's end are skipped unless include_empty.
+    workers=0 runs in-process. Returns the number of wallets written.
+    """
+    month_bounds(month)  # validate before forking
+    os.makedirs(output_dir, exist_ok=True)
+    ranges = list(chunk_bounds(chunk_size))
+    if workers == 0:
+        return sum(write_range(low, high, month, output_dir, formats, include_empty) for low, high in ranges)
+
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context) as pool:
+        futures = [
+            pool.submit(_write_range_in_worker, low, high, month, output_dir, formats, include_empty)
+            for low, high in ranges
+        ]
+        return sum(future.result() for future in as_completed(futures))
@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from . import payouts, workqueue
+
+
+@shared_task
+def reclaim_expired_leases():
+    return workqueue.reclaim_expired()
+
+
+@shared_task
+def settle_payouts():
+    return dict(payouts.settle())
@@ -1,7 +1,26 @@
-from django.test import TestCase
+import csv
+import datetime
+import io
+import os
+import re
+import tempfile
+import threading
+import uuid
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
 from decimal import Decimal
-from .models import MicroTask, TaskSubmission, Wallet, Transaction
+from . import approvals, board, ledger, payouts, reconcile, statements, workqueue
+from .models import MicroTask, TaskSubmission, Wallet, Transaction, Payout
 
 User = get_user_model()
 
@@ -49,3 +68,657 @@ class WalletTest(TestCase):
         self.assertEqual(transaction.wallet, wallet)
         self.assertEqual(transaction.amount, Decimal('50.00'))
         self.assertEqual(transaction.type, 'credit')
+
+class WalletConditionalGetTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.wallet = Wallet.objects.create(user=self.user, balance=Decimal('20.00'))
+        self.client.force_authenticate(user=self.user)
+
+    def test_wallet_not_modified_until_balance_changes(self):
+        url = reverse('get-wallet')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Wallet.objects.filter(pk=self.wallet.pk).update(balance=Decimal('25.00'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+class WalletLedgerTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_deposit_and_withdraw_post_ledger_entries(self):
+        response = self.client.post(reverse('deposit-to-wallet'), {'amount': '20.50'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('withdraw-from-wallet'), {'amount': '8'}, format='json')
+        self.assertEqual(response.data['new_balance'], Decimal('12.50'))
+
+        entries = Transaction.objects.filter(wallet__user=self.user).order_by('id')
+        self.assertEqual([entry.balance_after for entry in entries], [Decimal('20.50'), Decimal('12.50')])
+
+    def test_overdraft_rejected(self):
+        wallet = ledger.wallet_for(self.user)
+        ledger.credit(wallet, Decimal('6.00'))
+        response = self.client.post(reverse('withdraw-from-wallet'), {'amount': '7'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        wallet.refresh_from_db()
+        self.assertEqual(wallet.balance, Decimal('6.00'))
+        self.assertEqual(wallet.transactions.count(), 1)
+
+    def test_malformed_and_oversized_amounts_rejected(self):
+        for amount in ['abc', 'NaN', '-5', '0.001', '1e30', '99999999999999', 1e30]:
+            for name in ('deposit-to-wallet', 'withdraw-from-wallet'):
+                response = self.client.post(reverse(name), {'amount': amount}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, (name, amount))
+        self.assertFalse(Transaction.objects.exists())
+        self.assertEqual(ledger.parse_amount('99999999.99'), ledger.MAX_AMOUNT)
+
+    def test_admin_cannot_edit_balance(self):
+        wallet = ledger.wallet_for(self.user)
+        ledger.credit(wallet, Decimal('5.00'))
+        admin_user = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass')
+        self.client.force_login(admin_user)
+        self.client.post(reverse('admin:earn_wallet_change', args=[wallet.pk]), {
+            'user': self.user.pk, 'balance': '999.00',
+        })
+        wallet.refresh_from_db()
+        self.assertEqual(wallet.balance, Decimal('5.00'))
+
+    def test_entries_are_append_only(self):
+        entry = ledger.credit(ledger.wallet_for(self.user), Decimal('5.00'))
+        entry.amount = Decimal('500.00')
+        with self.assertRaises(ValueError):
+            entry.save()
+        with self.assertRaises(ValueError):
+            entry.delete()
+
+
+class WalletConcurrencyTest(TransactionTestCase):
+    THREADS = 8
+    CREDITS_PER_THREAD = 25
+
+    def setUp(self):
+        self.user = User.objects.create(username='busy', email='busy@example.com')
+        self.wallet = ledger.wallet_for(self.user)
+
+    def test_concurrent_credits_and_debits_do_not_drift(self):
+        errors = []
+
+        def worker(index):
+            try:
+                wallet = Wallet.objects.get(pk=self.wallet.pk)
+                for _ in range(self.CREDITS_PER_THREAD):
+                    ledger.credit(wallet, Decimal('1.25'))
+                    if index % 2:
+                        ledger.debit(wallet, Decimal('0.25'))
+            except Exception as exc:  # surfaced in the main thread
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.wallet.refresh_from_db()
+        credits = self.THREADS * self.CREDITS_PER_THREAD
+        debits = self.THREADS // 2 * self.CREDITS_PER_THREAD
+        self.assertEqual(self.wallet.balance, Decimal('1.25') * credits - Decimal('0.25') * debits)
+        entries = self.wallet.transactions.order_by('id')
+        self.assertEqual(entries.count(), credits + debits)
+        # Snapshots are a gapless running balance
+        self.assertEqual(entries.last().balance_after, self.wallet.balance)
+        self.assertEqual(len({entry.balance_after for entry in entries}), credits + debits)
+
+
+class BulkApprovalTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        self.labeling = MicroTask.objects.create(
+            created_by=self.employer, title='Label images', reward=Decimal('0.50')
+        )
+        self.survey = MicroTask.objects.create(
+            created_by=self.employer, title='Survey', reward=Decimal('2.00')
+        )
+        self.workers = [
+            User.objects.create(username=f'worker{index}', email=f'worker{index}@example.com')
+            for index in range(3)
+        ]
+        self.submissions = [
+            TaskSubmission.objects.create(task=task, user=worker)
+            for worker in self.workers
+            for task in (self.labeling, self.labeling, self.survey)
+        ]
+
+    def test_rewards_grouped_per_user(self):
+        self.client.force_authenticate(user=self.employer)
+        ids = [str(submission.pk) for submission in self.submissions]
+        response = self.client.post(
+            reverse('bulk-approve-submissions'), {'submissions': ids + ['bogus']}, format='json'
+        )
+        self.assertEqual(response.data['approved'], 9)
+        self.assertEqual(response.data['results'][-1]['result'], 'invalid_id')
+
+        for worker in self.workers:
+            wallet = Wallet.objects.get(user=worker)
+            self.assertEqual(wallet.balance, Decimal('3.00'))
+            entries = wallet.transactions.order_by('id')
+            self.assertEqual(
+                [entry.balance_after for entry in entries], [Decimal('0.50'), Decimal('1.00'), Decimal('3.00')]
+            )
+
+        # A second pass pays nothing
+        response = self.client.post(reverse('bulk-approve-submissions'), {'submissions': ids}, format='json')
+        self.assertEqual(response.data['approved'], 0)
+        self.assertEqual(Transaction.objects.count(), 9)
+
+    def test_other_employers_submissions_not_found(self):
+        other = User.objects.create(username='other', email='other@example.com', is_employer=True)
+        self.client.force_authenticate(user=other)
+        response = self.client.post(
+            reverse('bulk-approve-submissions'), {'submissions': [str(self.submissions[0].pk)]}, format='json'
+        )
+        self.assertEqual(response.data['results'][0]['result'], 'not_found')
+        self.assertFalse(Wallet.objects.filter(user=self.workers[0]).exists())
+
+    def test_admin_action_credits_wallets(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='testpass123')
+        self.client.force_login(admin)
+        self.client.post(reverse('admin:earn_tasksubmission_changelist'), {
+            'action': 'approve_submissions',
+            '_selected_action': [str(submission.pk) for submission in self.submissions[:3]],
+        })
+        self.assertEqual(Wallet.objects.get(user=self.workers[0]).balance, Decimal('3.00'))
+
+    def test_review_api_approves_through_engine(self):
+        self.client.force_authenticate(user=self.employer)
+        submission = self.submissions[2]
+        url = reverse('review-submission', args=[submission.pk])
+        with mock.patch.object(approvals, 'approve_submissions', wraps=approvals.approve_submissions) as engine:
+            response = self.client.put(url, {'status': 'approved', 'submission': 'done'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'approved')
+        engine.assert_called_once()
+        submission.refresh_from_db()
+        self.assertEqual((submission.status, submission.submission), ('approved', 'done'))
+        self.assertEqual(Wallet.objects.get(user=self.workers[0]).balance, Decimal('2.00'))
+
+        # Approving again pays nothing; other transitions still go through the serializer
+        self.client.put(url, {'status': 'approved'}, format='json')
+        self.assertEqual(Transaction.objects.count(), 1)
+        response = self.client.put(url, {'status': 'rejected'}, format='json')
+        self.assertEqual(response.data['status'], 'rejected')
+
+    def test_admin_change_form_approval_credits_wallet(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='testpass123')
+        self.client.force_login(admin)
+        submission = self.submissions[2]
+        response = self.client.post(reverse('admin:earn_tasksubmission_change', args=[submission.pk]), {
+            'task': submission.task_id, 'user': submission.user_id, 'submission': 'done', 'status': 'approved',
+        })
+        self.assertEqual(response.status_code, 302)
+        submission.refresh_from_db()
+        self.assertEqual((submission.status, submission.submission), ('approved', 'done'))
+        self.assertEqual(Wallet.objects.get(user=self.workers[0]).balance, Decimal('2.00'))
+
+
+class TransactionHistoryTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        wallet = ledger.wallet_for(self.user)
+        # Two entries a day from 1 to 10 March, then one withdrawal
+        for day in range(1, 11):
+            for hour in (9, 15):
+                entry = ledger.credit(wallet, Decimal('2.00'), description=f'Task {day}')
+                Transaction.objects.filter(pk=entry.pk).update(
+                    timestamp=timezone.make_aware(datetime.datetime(2025, 3, day, hour))
+                )
+        entry = ledger.debit(wallet, Decimal('5.00'))
+        Transaction.objects.filter(pk=entry.pk).update(timestamp=timezone.make_aware(datetime.datetime(2025, 4, 2)))
+        self.client.force_authenticate(user=self.user)
+
+    def test_keyset_pages_newest_first(self):
+        url = reverse('transaction-history')
+        seen = []
+        cursor = ''
+        while True:
+            page = self.client.get(url, {'page_size': 6, 'cursor': cursor}).data
+            seen += page['results']
+            cursor = page['next']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 21)
+        self.assertEqual(seen[0]['type'], 'debit')
+        timestamps = [row['timestamp'] for row in seen]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+
+    def test_range_and_type_filters(self):
+        response = self.client.get(reverse('transaction-history'), {'from': '2025-03-04', 'to': '2025-03-05'})
+        self.assertEqual(len(response.data['results']), 4)
+        response = self.client.get(reverse('transaction-history'), {'type': 'debit'})
+        self.assertEqual(len(response.data['results']), 1)
+        response = self.client.get(reverse('transaction-history'), {'from': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_monthly_summary(self):
+        response = self.client.get(reverse('transaction-summary'), {'period': 'month'})
+        april, march = response.data['periods']
+        self.assertEqual((march['credits'], march['debits'], march['count']), (Decimal('40.00'), 0, 20))
+        self.assertEqual(april['net'], Decimal('-5.00'))
+        self.assertEqual(response.data['balance'], Decimal('35.00'))
+
+
+class WorkItemQueueTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        self.task = MicroTask.objects.create(created_by=self.employer, title='Label images', reward=Decimal('0.10'))
+        self.worker = User.objects.create(username='worker', email='worker@example.com')
+        self.other = User.objects.create(username='other', email='other@example.com')
+
+    def test_load_claim_and_submit(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.post(
+            reverse('load-work-items', args=[self.task.pk]), {'items': [f'image-{n}.png' for n in range(5)]},
+            format='json'
+        )
+        self.assertEqual(response.data['created'], 5)
+
+        self.client.force_authenticate(user=self.worker)
+        items = self.client.post(reverse('claim-work-items', args=[self.task.pk]), {'count': 3}, format='json').data['items']
+        self.assertEqual(len(items), 3)
+        self.client.force_authenticate(user=self.other)
+        others = self.client.post(reverse('claim-work-items', args=[self.task.pk]), {'count': 3}, format='json').data['items']
+        self.assertEqual(len(others), 2)
+        self.assertFalse({item['id'] for item in items} & {item['id'] for item in others})
+
+        # Only the lease holder can submit
+        url = reverse('submit-work-item', args=[items[0]['id']])
+        self.assertEqual(self.client.post(url, {'submission': 'cat'}).status_code, status.HTTP_409_CONFLICT)
+        self.client.force_authenticate(user=self.worker)
+        response = self.client.post(url, {'submission': 'cat'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(TaskSubmission.objects.get(pk=response.data['id']).work_item_id, uuid.UUID(items[0]['id']))
+        self.assertEqual(self.client.post(url, {'submission': 'dog'}).status_code, status.HTTP_409_CONFLICT)
+
+        # Direct submissions are refused once the task has a queue
+        response = self.client.post(reverse('submit-task', args=[self.task.pk]), {
+            'task': self.task.pk, 'user': self.worker.pk, 'submission': 'cat'
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_leases_are_reclaimed(self):
+        workqueue.load_items(self.task, ['a', 'b'])
+        stale = workqueue.claim(self.task, self.worker, 2, lease_timeout=datetime.timedelta(seconds=-1))
+        self.assertEqual(len(stale), 2)
+
+        fresh = workqueue.claim(self.task, self.other, 2)
+        self.assertEqual({item.pk for item in fresh}, {item.pk for item in stale})
+        self.assertEqual({item.attempts for item in fresh}, {2})
+        with self.assertRaises(workqueue.LeaseExpired):
+            workqueue.submit(stale[0].pk, self.worker, 'late')
+
+
+class WorkItemConcurrencyTest(TransactionTestCase):
+    def test_concurrent_claims_never_overlap(self):
+        employer = User.objects.create(username='employer', email='employer@example.com', is_employer=True)
+        task = MicroTask.objects.create(created_by=employer, title='Label images')
+        workqueue.load_items(task, range(120))
+        workers = [User.objects.create(username=f'worker{n}', email=f'worker{n}@example.com') for n in range(8)]
+        claimed, errors = [], []
+
+        def worker(user):
+            try:
+                while True:
+                    items = workqueue.claim(task, user, 5)
+                    if not items:
+                        break
+                    claimed.extend(item.pk for item in items)
+            except Exception as exc:  # surfaced in the main thread
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(user,)) for user in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(claimed), 120)
+        self.assertEqual(len(set(claimed)), 120)
+
+
+class TaskBoardTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        self.tasks = [
+            MicroTask.objects.create(
+                created_by=self.employer, title=f'Task {n}', reward=Decimal('0.10') * n,
+                task_type='labeling' if n % 2 else 'survey'
+            )
+            for n in range(1, 31)
+        ]
+        self.client.force_authenticate(user=self.employer)
+
+    def test_keyset_pages_with_exact_reward_range(self):
+        params = {'min_reward': '0.3', 'max_reward': '2.00', 'page_size': 5, 'facets': 'true'}
+        first = self.client.get(reverse('task-board'), params).data
+        self.assertEqual(first['results'][0]['reward'], '2.00')
+        self.assertEqual(first['task_types'], {'labeling': 9, 'survey': 9})
+
+        rewards = []
+        cursor = ''
+        while True:
+            page = self.client.get(reverse('task-board'), {**params, 'cursor': cursor}).data
+            rewards += [Decimal(task['reward']) for task in page['results']]
+            cursor = page['next']
+            if not cursor:
+                break
+        # 0.30 is included exactly, which a float bound can miss
+        self.assertEqual(rewards, [Decimal('0.10') * n for n in range(20, 2, -1)])
+
+        response = self.client.get(reverse('task-board'), {'min_reward': 'lots'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_top_feed_follows_task_changes(self):
+        def top_titles():
+            return [task['title'] for task in self.client.get(reverse('top-tasks')).data]
+
+        self.assertEqual(top_titles()[:2], ['Task 30', 'Task 29'])
+        with self.captureOnCommitCallbacks(execute=True):
+            MicroTask.objects.create(created_by=self.employer, title='Bonus', reward=Decimal('9.00'))
+        self.assertEqual(top_titles()[:2], ['Bonus', 'Task 30'])
+        self.assertEqual(len(top_titles()), board.TOP_TASKS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tasks[-1].is_active = False
+            self.tasks[-1].save()
+        titles = top_titles()
+        self.assertNotIn('Task 30', titles)
+        self.assertEqual(len(titles), board.TOP_TASKS)
+        self.assertEqual(titles[-1], 'Task 11')
+
+        # Back-to-back writes to listed tasks are all reflected; none is lost to a concurrent patch
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tasks[-2].delete()
+            self.tasks[0].reward = Decimal('8.00')
+            self.tasks[0].save()
+        self.assertEqual(top_titles()[:3], ['Bonus', 'Task 1', 'Task 28'])
+
+
+class WalletReconciliationTest(TransactionTestCase):
+    def setUp(self):
+        self.wallets = []
+        for n in range(12):
+            wallet = ledger.wallet_for(User.objects.create(username=f'earner{n}', email=f'earner{n}@example.com'))
+            ledger.credit(wallet, Decimal('10.00'))
+            ledger.debit(wallet, Decimal('2.50'))
+            self.wallets.append(wallet)
+        # Drift left behind by the old read-modify-write code
+        Wallet.objects.filter(pk__in=[self.wallets[3].pk, self.wallets[9].pk]).update(balance=Decimal('99.00'))
+        self.checkpoint = os.path.join(tempfile.mkdtemp(), 'reconcile.json')
+
+    def test_parallel_report_then_repair(self):
+        found = []
+        state = reconcile.reconcile(chunk_size=5, workers=2, on_mismatch=found.append)
+        self.assertEqual(state['wallets'], 12)
+        self.assertEqual(sorted(mismatch['wallet'] for mismatch in found), [self.wallets[3].pk, self.wallets[9].pk])
+        self.assertEqual(Wallet.objects.get(pk=self.wallets[3].pk).balance, Decimal('99.00'))
+
+        call_command('reconcile_wallets', '--workers=2', '--repair', f'--checkpoint={self.checkpoint}', stdout=io.StringIO())
+        self.assertEqual(Wallet.objects.get(pk=self.wallets[3].pk).balance, Decimal('7.50'))
+        self.assertEqual(reconcile.reconcile(workers=0)['mismatches'], 0)
+
+    def test_range_is_checked_in_one_statement(self):
+        # Balances and ledger totals share a snapshot, so concurrent postings cannot look like drift
+        with CaptureQueriesContext(connection) as queries:
+            result = reconcile.reconcile_range(self.wallets[0].pk, self.wallets[2].pk)
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual((result['wallets'], result['mismatches']), (3, []))
+
+    def test_resumes_from_checkpoint(self):
+        # A run interrupted after the first 8 wallets
+        reconcile.save_checkpoint(self.checkpoint, {'after': self.wallets[7].pk, 'wallets': 8, 'mismatches': 1})
+        found = []
+        state = reconcile.reconcile(chunk_size=3, workers=0, checkpoint=self.checkpoint, on_mismatch=found.append)
+        self.assertEqual((state['wallets'], state['mismatches']), (12, 2))
+        self.assertEqual([mismatch['wallet'] for mismatch in found], [self.wallets[9].pk])
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+
+class WalletStatementTest(TransactionTestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        self.user = User.objects.create(username='earner', email='earner@example.com')
+        self.wallet = ledger.wallet_for(self.user)
+
+        def post(entry, day):
+            Transaction.objects.filter(pk=entry.pk).update(
+                timestamp=timezone.make_aware(datetime.datetime(2025, 3 if day > 0 else 2, abs(day), 12))
+            )
+
+        # 10.00 carried in from February, then 60 March entries and a withdrawal
+        post(ledger.credit(self.wallet, Decimal('10.00'), description='February'), -20)
+        for n in range(60):
+            post(ledger.credit(self.wallet, Decimal('1.50'), description=f'Task {n}'), n % 28 + 1)
+        post(ledger.debit(self.wallet, Decimal('20.00'), description='Withdrawal'), 30)
+        # Another wallet with nothing yet
+        ledger.wallet_for(User.objects.create(username='idle', email='idle@example.com'))
+
+    def test_csv_balances_and_running_total(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('wallet-statement'), {'month': '2025-03'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], statements.STATEMENT_HEADER)
+        self.assertEqual(rows[1][2:], ['Opening balance', '', '10.00'])
+        self.assertEqual(rows[-1][2:], ['Closing balance', '', '80.00'])
+        self.assertEqual(rows[-2][1:], ['debit', 'Withdrawal', '20.00', '80.00'])
+        self.assertEqual(len(rows), 1 + 62 + 1)
+
+        response = self.client.get(reverse('wallet-statement'), {'month': 'March'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_pdf_is_paginated(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('wallet-statement'), {'month': '2025-03', 'type': 'pdf'})
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="statement-2025-03.pdf"')
+        content = b''.join(response.streaming_content)
+        self.assertTrue(content.startswith(b'%PDF'))
+        # 63 rows at 44 a page, appended to the file one page at a time
+        self.assertEqual(re.findall(rb'/Count (\d+)', content)[-1], b'2')
+
+        response = self.client.get(reverse('wallet-statement'), {'month': '2025-03\r\n', 'type': 'pdf'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_writes_month_across_workers(self):
+        output_dir = tempfile.mkdtemp()
+        call_command('generate_statements', '2025-03', f'--output-dir={output_dir}', '--workers=2',
+                     '--chunk-size=1', stdout=io.StringIO())
+        self.assertEqual(
+            sorted(os.listdir(output_dir)),
+            [f'wallet-{self.wallet.pk}-2025-03.csv', f'wallet-{self.wallet.pk}-2025-03.pdf'],
+        )
+        self.assertEqual(statements.generate_month('2025-02', output_dir, ('csv',), workers=0, include_empty=True), 2)
+        with open(os.path.join(output_dir, f'wallet-{self.wallet.pk}-2025-02.csv')) as handle:
+            self.assertEqual(list(csv.reader(handle))[-1][2:], ['Closing balance', '', '10.00'])
+
+
+class FlakyGateway(payouts.LocalGateway):
+    """
+    Rejects payouts to 'closed' accounts, defers 'busy' ones, and drops the
+    connection when asked. A lagging gateway records a batch only after it has
+    been asked for its status.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.payments = []
+        self.down = False
+        self.lose_reply = False
+        self.lagging = False
+        self.in_transit = []
+
+    def outcome(self, payout):
+        if payout['destination'] == 'closed':
+            return {'status': 'failed', 'reason': 'Account closed'}
+        if payout['destination'] == 'busy':
+            return {'status': 'retry', 'reason': 'Bank busy'}
+        self.payments.append(payout['id'])
+        return super().outcome(payout)
+
+    def submit_batch(self, batch_id, items):
+        self.calls += 1
+        if self.down:
+            raise payouts.GatewayError('connection refused')
+        if self.lagging:
+            self.in_transit.append((batch_id, items))
+            raise payouts.GatewayError('read timed out')
+        results = super().submit_batch(batch_id, items)
+        if self.lose_reply:
+            raise payouts.GatewayError('read timed out')
+        return results
+
+    def batch_status(self, batch_id):
+        if self.down:
+            raise payouts.GatewayError('connection refused')
+        status = super().batch_status(batch_id)
+        while self.in_transit:
+            super().submit_batch(*self.in_transit.pop())
+        return status
+
+
+class PayoutSettlementTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='earner', email='earner@example.com', password='testpass123')
+        self.wallet = ledger.wallet_for(self.user)
+        ledger.credit(self.wallet, Decimal('100.00'))
+        self.client.force_authenticate(user=self.user)
+        self.gateway = FlakyGateway()
+
+    def withdraw(self, amount, destination='acct-1'):
+        response = self.client.post(reverse('withdraw-from-wallet'), {'amount': amount, 'destination': destination},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_withdrawals_settle_in_batches(self):
+        for n in range(5):
+            data = self.withdraw('10')
+        self.assertEqual(data['payout']['status'], 'pending')
+        self.assertEqual(data['new_balance'], Decimal('50.00'))
+        self.assertEqual(self.gateway.calls, 0)
+
+        counts = payouts.settle(batch_size=2, backend=self.gateway)
+        self.assertEqual((counts['batches'], counts['paid']), (3, 5))
+        self.assertEqual(self.gateway.calls, 3)
+        statuses = [payout['status'] for payout in self.client.get(reverse('list-payouts')).data]
+        self.assertEqual(statuses, ['paid'] * 5)
+        self.assertEqual(payouts.settle(backend=self.gateway)['batches'], 0)
+
+    def test_rejected_payout_releases_hold(self):
+        self.withdraw('30', destination='closed')
+        self.withdraw('20')
+        counts = payouts.settle(backend=self.gateway)
+        self.assertEqual((counts['paid'], counts['failed']), (1, 1))
+
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('80.00'))
+        failed = Payout.objects.get(status='failed')
+        self.assertEqual(failed.failure_reason, 'Account closed')
+        self.assertEqual(reconcile.reconcile(workers=0)['mismatches'], 0)
+
+    def test_lost_reply_is_reconciled_not_resent(self):
+        self.withdraw('10')
+        self.gateway.lose_reply = True
+        counts = payouts.settle(backend=self.gateway)
+        self.assertEqual(counts['paid'], 1)
+        self.assertEqual(self.gateway.calls, 1)
+        self.assertEqual(len(self.gateway.batches), 1)
+
+    def test_batch_recorded_late_is_not_paid_twice(self):
+        self.withdraw('10')
+        self.gateway.lagging = True
+        counts = payouts.settle(backend=self.gateway)
+        # The status lookup came before the gateway recorded the batch, so the outcome is unknown
+        self.assertEqual(counts['unresolved'], 1)
+        payout = Payout.objects.get()
+        self.assertEqual(payout.status, 'submitted')
+        self.assertEqual(len(self.gateway.payments), 1)
+
+        self.gateway.lagging = False
+        self.assertEqual(payouts.settle(backend=self.gateway)['paid'], 0)
+        Payout.objects.update(submitted_at=timezone.now() - payouts.SUBMIT_TIMEOUT)
+        self.assertEqual(payouts.settle(backend=self.gateway)['paid'], 1)
+        self.assertEqual(self.gateway.payments, [str(payout.pk)])
+        self.assertEqual(Payout.objects.get().batch_id, payout.batch_id)
+
+    def test_outage_leaves_payout_submitted_until_resent(self):
+        self.withdraw('10')
+        self.gateway.down = True
+        for run in range(payouts.MAX_ATTEMPTS + 1):
+            Payout.objects.update(submitted_at=timezone.now() - payouts.SUBMIT_TIMEOUT)
+            self.assertEqual(payouts.settle(backend=self.gateway)['unresolved'], 1)
+        # An unknown outcome is never retried under a new batch or refunded
+        payout = Payout.objects.get()
+        self.assertEqual((payout.status, payout.attempts), ('submitted', 1))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('90.00'))
+
+        self.gateway.down = False
+        Payout.objects.update(submitted_at=timezone.now() - payouts.SUBMIT_TIMEOUT)
+        self.assertEqual(payouts.settle(backend=self.gateway)['paid'], 1)
+
+    def test_declined_payout_backs_off_then_refunds(self):
+        self.withdraw('10', destination='busy')
+        self.assertEqual(payouts.settle(backend=self.gateway)['retried'], 1)
+        payout = Payout.objects.get()
+        self.assertEqual(payout.status, 'pending')
+        self.assertGreater(payout.next_attempt_at, timezone.now())
+
+        for attempt in range(2, payouts.MAX_ATTEMPTS + 1):
+            Payout.objects.update(next_attempt_at=timezone.now())
+            payouts.settle(backend=self.gateway)
+        payout.refresh_from_db()
+        self.assertEqual((payout.status, payout.failure_reason), ('failed', 'Bank busy'))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('100.00'))
+        self.assertEqual(self.gateway.payments, [])
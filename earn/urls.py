@@ -1,15 +1,20 @@
 from django.urls import path
 from .views import (
-    list_tasks, create_task, get_task, update_task, delete_task,
-    submit_task, review_submission,
-    get_wallet, deposit_to_wallet, withdraw_from_wallet,
-    list_transactions, my_submissions
+    list_tasks, task_board, top_tasks, create_task, get_task, update_task, delete_task,
+    submit_task, review_submission, bulk_approve_submissions,
+    load_work_items, claim_work_items, submit_work_item, release_work_item,
+    get_wallet, deposit_to_wallet, withdraw_from_wallet, list_payouts,
+    list_transactions, transaction_history, transaction_summary, wallet_statement, my_submissions
 )
 
 urlpatterns = [
     # Task endpoints
     path('tasks/', list_tasks, name='list-tasks'),
 
+    path('tasks/board/', task_board, name='task-board'),
+
+    path('tasks/top/', top_tasks, name='top-tasks'),
+
     path('tasks/create/', create_task, name='create-task'),
 
     path('tasks/<uuid:task_id>/', get_task, name='get-task'),
@@ -18,18 +23,29 @@ urlpatterns = [
 
     path('tasks/<uuid:task_id>/delete/', delete_task, name='delete-task'),
     
+    # Work item queue endpoints
+    path('tasks/<uuid:task_id>/items/', load_work_items, name='load-work-items'),
+    path('tasks/<uuid:task_id>/claim/', claim_work_items, name='claim-work-items'),
+    path('work-items/<uuid:item_id>/submit/', submit_work_item, name='submit-work-item'),
+    path('work-items/<uuid:item_id>/release/', release_work_item, name='release-work-item'),
+    
     # Submission endpoints
     path('tasks/<uuid:task_id>/submit/', submit_task, name='submit-task'),
 
     path('submissions/<uuid:submission_id>/review/', review_submission, name='review-submission'),
+    path('submissions/bulk-approve/', bulk_approve_submissions, name='bulk-approve-submissions'),
     
     # Wallet endpoints
     path('wallet/', get_wallet, name='get-wallet'),
     path('wallet/deposit/', deposit_to_wallet, name='deposit-to-wallet'),
     path('wallet/withdraw/', withdraw_from_wallet, name='withdraw-from-wallet'),
+    path('wallet/payouts/', list_payouts, name='list-payouts'),
     
     # Transaction endpoints
     path('transactions/', list_transactions, name='list-transactions'),
+    path('transactions/history/', transaction_history, name='transaction-history'),
+    path('transactions/summary/', transaction_summary, name='transaction-summary'),
+    path('transactions/statement/', wallet_statement, name='wallet-statement'),
     
     # Submission endpoints
     path('submissions/', my_submissions, name='my-submissions'),
@@ -2,20 +2,35 @@ from django.shortcuts import render
 
 # Create your views here.
 
+import uuid
+
 from django.shortcuts import get_object_or_404
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.http import FileResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .models import MicroTask, TaskSubmission, Wallet, Transaction
+from . import approvals, board, history, ledger, payouts, statements, workqueue
+from .models import MicroTask, TaskSubmission, Wallet, Transaction, Payout
+from core.cache import cache_catalog_response
+from core.conditional import catalog_etag, etag_response, make_etag
 from core.models import User
-from .serializers import MicroTaskSerializer, TaskSubmissionSerializer, WalletSerializer, TransactionSerializer
+from core.pagination import InvalidCursor, keyset_paginate
+from .serializers import (
+    MicroTaskSerializer, TaskSubmissionSerializer, WalletSerializer, TransactionSerializer, WorkItemSerializer,
+    PayoutSerializer
+)
+
+AMOUNT_ERROR = f"Amount must be greater than 0 and at most {ledger.MAX_AMOUNT}"
 
 
 # MicroTask Views
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_catalog_response('tasks')
 def list_tasks(request):
     tasks = MicroTask.objects.filter(is_active=True)
     
@@ -32,19 +47,10 @@ def list_tasks(request):
     if task_type:
         tasks = tasks.filter(task_type=task_type)
     
-    # Filter by reward range
-    min_reward = request.GET.get('min_reward', '')
-    max_reward = request.GET.get('max_reward', '')
-    
-    if min_reward:
-        try:
-            tasks = tasks.filter(reward__gte=float(min_reward))
-        except ValueError:
-            pass
-    
-    if max_reward:
+    # Filter by reward range (exact Decimal comparison; malformed bounds are ignored)
+    for param, lookup in (('min_reward', 'reward__gte'), ('max_reward', 'reward__lte')):
         try:
-            tasks = tasks.filter(reward__lte=float(max_reward))
+            tasks = tasks.filter(**{lookup: board.parse_reward(request.GET.get(param, ''))})
         except ValueError:
             pass
     
@@ -55,6 +61,47 @@ def list_tasks(request):
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def task_board(request):
+    tasks = MicroTask.objects.filter(is_active=True)
+    try:
+        tasks = board.filter_rewards(tasks, request.GET)
+        page_size = min(max(int(request.GET.get('page_size', 20)), 1), 100)
+    except ValueError:
+        return Response({"message": "min_reward and max_reward must be decimals, page_size an integer"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    facets = board.task_type_facets(tasks, request.GET) if request.GET.get('facets') == 'true' else None
+    
+    task_type = request.GET.get('task_type', '')
+    if task_type:
+        tasks = tasks.filter(task_type=task_type)
+    
+    try:
+        page, next_cursor, previous_cursor = keyset_paginate(
+            tasks, board.BOARD_ORDERING, cursor=request.GET.get('cursor', ''), page_size=page_size
+        )
+    except InvalidCursor:
+        return Response({"message": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = {
+        'results': MicroTaskSerializer(page, many=True).data,
+        'next': next_cursor,
+        'previous': previous_cursor,
+        'page_size': page_size,
+    }
+    if facets is not None:
+        data['task_types'] = facets
+    return Response(data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def top_tasks(request):
+    return Response(board.top_tasks())
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_task(request):
@@ -81,6 +128,7 @@ def create_task(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@etag_response(catalog_etag('tasks'))
 def get_task(request, task_id):
     task = get_object_or_404(MicroTask, pk=task_id)
     serializer = MicroTaskSerializer(task)
@@ -126,6 +174,11 @@ def submit_task(request, task_id):
     
     user = request.user
     
+    # Tasks with a work-item queue only accept submissions under a lease
+    if task.work_items.exists():
+        return Response({"message": "Claim a work item of this task and submit it instead"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
     # Anyone can submit a task (assuming learners/users)
     TaskSubmission.objects.create(
         task=task,
@@ -137,34 +190,86 @@ def submit_task(request, task_id):
     return Response(data={"message": "task submitted"}, status=status.HTTP_201_CREATED)
 
 
+# Work Item Queue Views
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def load_work_items(request, task_id):
+    task = get_object_or_404(MicroTask, pk=task_id)
+    
+    # Only the employer who created the task or admin can load work items
+    if not ((request.user.is_employer and task.created_by == request.user) or request.user.is_staff):
+        return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
+    
+    items = request.data.get('items')
+    if not isinstance(items, list) or not items:
+        return Response({"message": "items must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > workqueue.MAX_LOAD:
+        return Response({"message": f"At most {workqueue.MAX_LOAD} items per request"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    created = workqueue.load_items(task, items)
+    return Response({"message": f"{created} work items added", "created": created}, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def claim_work_items(request, task_id):
+    task = get_object_or_404(MicroTask, pk=task_id)
+    if not task.is_active:
+        return Response({"message": "Task is not active"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        count = int(request.data.get('count', 1))
+    except (TypeError, ValueError):
+        return Response({"message": "count must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= count <= workqueue.MAX_CLAIM:
+        return Response({"message": f"count must be between 1 and {workqueue.MAX_CLAIM}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    items = workqueue.claim(task, request.user, count)
+    return Response({"items": WorkItemSerializer(items, many=True).data})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def submit_work_item(request, item_id):
+    try:
+        submission = workqueue.submit(item_id, request.user, request.data.get('submission', ''))
+    except workqueue.LeaseExpired:
+        return Response({"message": "You do not hold an active lease on this work item"},
+                        status=status.HTTP_409_CONFLICT)
+    return Response(TaskSubmissionSerializer(submission).data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def release_work_item(request, item_id):
+    if not workqueue.release(item_id, request.user):
+        return Response({"message": "You do not hold a lease on this work item"}, status=status.HTTP_409_CONFLICT)
+    return Response({"message": "Work item released"})
+
+
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
+@transaction.atomic
 def review_submission(request, submission_id):
-    submission = get_object_or_404(TaskSubmission, pk=submission_id)
+    # Lock the submission so concurrent approvals cannot both pay out
+    submission = get_object_or_404(
+        TaskSubmission.objects.select_for_update().select_related('task'), pk=submission_id
+    )
     serializer = TaskSubmissionSerializer(submission, data=request.data, partial=True)
     
     if serializer.is_valid():
         # Only the employer who created the task or admin can review submissions
         if (request.user.is_employer and submission.task.created_by == request.user) or request.user.is_staff:
-            old_status = submission.status
+            # Approving pays the reward, so that transition goes through the approval engine
+            approve = serializer.validated_data.get('status') == 'approved'
+            if approve:
+                del serializer.validated_data['status']
             serializer.save()
-            
-            # If the submission is approved, update the user's wallet
-            if old_status != 'approved' and submission.status == 'approved':
-                # Get or create wallet for the user
-                wallet, created = Wallet.objects.get_or_create(user=submission.user)
-                
-                # Add reward to wallet
-                wallet.balance += submission.task.reward
-                wallet.save()
-                
-                # Create transaction record
-                Transaction.objects.create(
-                    wallet=wallet,
-                    amount=submission.task.reward,
-                    type='credit',
-                    description=f'Earnings from task: {submission.task.title}'
-                )
+            if approve:
+                approvals.approve_submissions(TaskSubmission.objects.filter(pk=submission.pk))
+                submission.refresh_from_db(fields=['status'])
             
             return Response(serializer.data)
         return Response(data={"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
@@ -172,9 +277,35 @@ def review_submission(request, submission_id):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_approve_submissions(request):
+    if not (request.user.is_employer or request.user.is_staff):
+        return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
+    
+    items = request.data.get('submissions')
+    if not isinstance(items, list) or not items:
+        return Response({"message": "submissions must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > approvals.MAX_BULK_APPROVALS:
+        return Response({"message": f"At most {approvals.MAX_BULK_APPROVALS} submissions per request"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    results = approvals.bulk_approve(request.user, items)
+    return Response({
+        'approved': sum(1 for result in results if result['result'] == 'approved'),
+        'results': results
+    })
+
+
 # Wallet Views
+def wallet_etag(request):
+    balance = Wallet.objects.filter(user=request.user).values_list('balance', flat=True).first()
+    return make_etag(request.user.pk, balance)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@etag_response(wallet_etag)
 def get_wallet(request):
     wallet, created = Wallet.objects.get_or_create(user=request.user)
     serializer = WalletSerializer(wallet)
@@ -184,28 +315,14 @@ def get_wallet(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def deposit_to_wallet(request):
-    wallet, created = Wallet.objects.get_or_create(user=request.user)
-    serializer = WalletSerializer(wallet, data=request.data, partial=True)
+    wallet = ledger.wallet_for(request.user)
     
-    if serializer.is_valid():
-        amount = request.data.get('amount', 0)
-        if amount > 0:
-            wallet.balance += amount
-            wallet.save()
-            
-            # Create transaction record
-            Transaction.objects.create(
-                wallet=wallet,
-                amount=amount,
-                type='credit',
-                description='Deposit'
-            )
-            
-            return Response(data={"message": f"Successfully deposited {amount}", "balance": wallet.balance})
-        
-        return Response(data={"message": "Amount must be greater than 0"}, status=status.HTTP_400_BAD_REQUEST)
+    amount = ledger.parse_amount(request.data.get('amount', 0))
+    if amount is None:
+        return Response(data={"message": AMOUNT_ERROR}, status=status.HTTP_400_BAD_REQUEST)
     
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    ledger.credit(wallet, amount, description='Deposit')
+    return Response(data={"message": f"Successfully deposited {amount}", "balance": wallet.balance})
 
 
 # Transaction Views
@@ -213,11 +330,102 @@ def deposit_to_wallet(request):
 @permission_classes([IsAuthenticated])
 def list_transactions(request):
     wallet, created = Wallet.objects.get_or_create(user=request.user)
-    transactions = Transaction.objects.filter(wallet=wallet)
+    transactions = Transaction.objects.filter(wallet=wallet).order_by('-timestamp', '-id')
     serializer = TransactionSerializer(transactions, many=True)
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def transaction_history(request):
+    wallet = ledger.wallet_for(request.user)
+    
+    order = request.GET.get('order', 'desc')
+    if order not in history.HISTORY_ORDERINGS:
+        return Response({"message": "order must be asc or desc"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        transactions = history.filter_transactions(Transaction.objects.filter(wallet=wallet), request.GET)
+    except ValueError as exc:
+        return Response({"message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        page_size = min(max(int(request.GET.get('page_size', 50)), 1), 200)
+    except ValueError:
+        return Response({"message": "page_size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        page, next_cursor, previous_cursor = keyset_paginate(
+            transactions, history.HISTORY_ORDERINGS[order], cursor=request.GET.get('cursor', ''), page_size=page_size
+        )
+    except InvalidCursor:
+        return Response({"message": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'results': TransactionSerializer(page, many=True).data,
+        'next': next_cursor,
+        'previous': previous_cursor,
+        'page_size': page_size,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def transaction_summary(request):
+    wallet = ledger.wallet_for(request.user)
+    
+    period = request.GET.get('period', 'month')
+    if period not in history.SUMMARY_PERIODS:
+        return Response({"message": f"period must be one of: {', '.join(history.SUMMARY_PERIODS)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        transactions = history.filter_transactions(Transaction.objects.filter(wallet=wallet), request.GET)
+    except ValueError as exc:
+        return Response({"message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    periods = history.period_summaries(transactions, period)
+    for row in periods:
+        row['net'] = row['credits'] - row['debits']
+    return Response({'period': period, 'balance': wallet.balance, 'periods': periods})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def wallet_statement(request):
+    owner = request.user
+    # Staff can pull any learner's statement
+    if request.GET.get('user'):
+        if not request.user.is_staff:
+            return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            owner = get_object_or_404(User, pk=uuid.UUID(request.GET['user']))
+        except ValueError:
+            return Response({"message": "user must be a user id"}, status=status.HTTP_400_BAD_REQUEST)
+    wallet = ledger.wallet_for(owner)
+    
+    month = request.GET.get('month', '')
+    try:
+        start, end = statements.month_bounds(month)
+    except ValueError:
+        return Response({"message": "month must be YYYY-MM"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    statement_type = request.GET.get('type', 'csv')
+    if statement_type not in statements.STATEMENT_FORMATS:
+        return Response({"message": "Statement type must be csv or pdf"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    totals = statements.period_totals([wallet.pk], start, end).get(wallet.pk) or statements.empty_totals()
+    if statement_type == 'csv':
+        response = StreamingHttpResponse(
+            statements.csv_statement(wallet.pk, start, end, totals), content_type='text/csv'
+        )
+    else:
+        title = statements.statement_title(owner.username, start)
+        response = FileResponse(
+            statements.pdf_statement(title, wallet.pk, start, end, totals), content_type='application/pdf'
+        )
+    response['Content-Disposition'] = f'attachment; filename="statement-{start:%Y-%m}.{statement_type}"'
+    return response
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_submissions(request):
@@ -229,38 +437,32 @@ def my_submissions(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def withdraw_from_wallet(request):
-    wallet, created = Wallet.objects.get_or_create(user=request.user)
-    
-    amount = request.data.get('amount', 0)
-    try:
-        amount = float(amount)
-    except (ValueError, TypeError):
-        return Response({"message": "Invalid amount format"}, status=status.HTTP_400_BAD_REQUEST)
+    wallet = ledger.wallet_for(request.user)
     
-    if amount <= 0:
-        return Response({"message": "Amount must be greater than 0"}, status=status.HTTP_400_BAD_REQUEST)
-    
-    if wallet.balance < amount:
-        return Response({"message": "Insufficient balance"}, status=status.HTTP_400_BAD_REQUEST)
+    amount = ledger.parse_amount(request.data.get('amount', 0))
+    if amount is None:
+        return Response({"message": AMOUNT_ERROR}, status=status.HTTP_400_BAD_REQUEST)
     
     # Minimum withdrawal amount
-    if amount < 5.00:
+    if amount < Decimal('5.00'):
         return Response({"message": "Minimum withdrawal amount is $5.00"}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Process withdrawal
-    wallet.balance -= amount
-    wallet.save()
-    
-    # Create transaction record
-    Transaction.objects.create(
-        wallet=wallet,
-        amount=amount,
-        type='debit',
-        description=f'Withdrawal to bank account'
-    )
+    # The funds are held now; the payout itself is settled in batches by earn.tasks.settle_payouts
+    try:
+        payout = payouts.request_payout(wallet, amount, destination=str(request.data.get('destination', ''))[:255])
+    except ledger.InsufficientFunds:
+        return Response({"message": "Insufficient balance"}, status=status.HTTP_400_BAD_REQUEST)
     
     return Response({
-        "message": f"Successfully withdrew ${amount}",
+        "message": f"Withdrawal of ${payout.amount} is being processed",
         "new_balance": wallet.balance,
-        "withdrawal_amount": amount
-    }, status=status.HTTP_200_OK)
\ No newline at end of file
+        "withdrawal_amount": payout.amount,
+        "payout": PayoutSerializer(payout).data
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def list_payouts(request):
+    wallet_payouts = Payout.objects.filter(wallet__user=request.user).order_by('-created_at')
+    return Response(PayoutSerializer(wallet_payouts, many=True).data)
\ No newline at end of file
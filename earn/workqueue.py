@@ -0,0 +1,90 @@
+"""
+Lease-based work-item queue for micro-tasks.
+
+Workers claim the next N claimable items of a task: open items, plus leased
+items whose lease has expired (so abandoned work is reclaimed automatically).
+On PostgreSQL candidates are picked with SELECT ... FOR UPDATE SKIP LOCKED, so
+concurrent workers never wait on each other's rows. Everywhere else a
+conditional UPDATE re-checks claimability. On both paths the UPDATE stamps a
+fresh lease token, and reading it back tells exactly which items this claim
+won, so no item is ever handed to two workers at once.
+"""
+import uuid
+from datetime import timedelta
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from .models import TaskSubmission, WorkItem
+
+LEASE_TIMEOUT = timedelta(minutes=15)
+
+MAX_CLAIM = 50
+
+MAX_LOAD = 10000
+
+
+class LeaseExpired(Exception):
+    pass
+
+
+def claimable(now):
+    return models.Q(status='open') | models.Q(status='leased', lease_expires_at__lte=now)
+
+
+def load_items(task, payloads):
+    """Add work items to a task. Returns the number created."""
+    items = [WorkItem(task=task, payload=str(payload)) for payload in payloads]
+    return len(WorkItem.objects.bulk_create(items, batch_size=1000))
+
+
+def claim(task, user, count=1, lease_timeout=LEASE_TIMEOUT):
+    """Lease up to count items of the task to user and return them."""
+    now = timezone.now()
+    token = uuid.uuid4()
+    candidates = WorkItem.objects.filter(claimable(now), task=task)
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list('pk', flat=True)[:count])
+        # Claimability is re-checked by the UPDATE itself
+        WorkItem.objects.filter(claimable(now), pk__in=ids).update(
+            status='leased',
+            leased_by=user,
+            lease_token=token,
+            lease_expires_at=now + lease_timeout,
+            attempts=models.F('attempts') + 1,
+        )
+    return list(WorkItem.objects.filter(pk__in=ids, lease_token=token))
+
+
+@transaction.atomic
+def submit(item_id, user, text):
+    """
+    Record the submission for a leased item and close the item.
+
+    Raises LeaseExpired unless user holds an unexpired lease on the item.
+    """
+    now = timezone.now()
+    held = WorkItem.objects.filter(pk=item_id, status='leased', leased_by=user, lease_expires_at__gt=now)
+    if not held.update(status='done', lease_expires_at=None):
+        raise LeaseExpired(item_id)
+    item = WorkItem.objects.select_related('task').get(pk=item_id)
+    return TaskSubmission.objects.create(task=item.task, user=user, work_item=item, submission=text, status='pending')
+
+
+def release(item_id, user):
+    """Give a leased item back to the queue. Returns True if the user held it."""
+    return bool(
+        WorkItem.objects.filter(pk=item_id, status='leased', leased_by=user)
+        .update(status='open', leased_by=None, lease_token=None, lease_expires_at=None)
+    )
+
+
+def reclaim_expired(now=None):
+    """Reopen items whose lease ran out. Returns the number reopened."""
+    now = now or timezone.now()
+    return WorkItem.objects.filter(status='leased', lease_expires_at__lte=now).update(
+        status='open', leased_by=None, lease_token=None, lease_expires_at=None
+    )
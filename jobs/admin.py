@@ -1,24 +1,39 @@
 from django.contrib import admin
+
+from core.cache import invalidate_catalog
+from . import counters, matching, search
 from .models import Job, JobApplication
 
 # Register your models here.
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
-    list_display = ('title', 'company', 'is_approved', 'created_at', 'deadline')
-    list_filter = ('is_approved', 'created_at')
+    list_display = ('title', 'company', 'is_approved', 'is_closed', 'created_at', 'deadline')
+    list_filter = ('is_approved', 'is_closed', 'created_at')
     list_editable = ('is_approved',)
     search_fields = ('title', 'company__name')
     actions = ['approve_jobs', 'disapprove_jobs']
 
     def approve_jobs(self, request, queryset):
+        # Taken first: a changelist filtered on is_approved matches nothing after the update
+        ids = list(queryset.values_list('pk', flat=True))
         queryset.update(is_approved=True)
-        self.message_user(request, f"{queryset.count()} jobs approved.")
+        jobs = Job.objects.filter(pk__in=ids)
+        search.index_jobs(jobs)
+        matching.index_jobs(jobs)
+        invalidate_catalog('jobs')
+        self.message_user(request, f"{len(ids)} jobs approved.")
     approve_jobs.short_description = "Approve selected jobs"
 
     def disapprove_jobs(self, request, queryset):
+        # Taken first: a changelist filtered on is_approved matches nothing after the update
+        ids = list(queryset.values_list('pk', flat=True))
         queryset.update(is_approved=False)
-        self.message_user(request, f"{queryset.count()} jobs disapproved.")
+        jobs = Job.objects.filter(pk__in=ids)
+        search.index_jobs(jobs)
+        matching.index_jobs(jobs)
+        invalidate_catalog('jobs')
+        self.message_user(request, f"{len(ids)} jobs disapproved.")
     disapprove_jobs.short_description = "Disapprove selected jobs"
 
 @admin.register(JobApplication)
@@ -29,16 +44,16 @@ class JobApplicationAdmin(admin.ModelAdmin):
     actions = ['mark_reviewed', 'mark_shortlisted', 'mark_rejected']
 
     def mark_reviewed(self, request, queryset):
-        queryset.update(status='reviewed')
+        counters.set_status(queryset, 'reviewed')
         self.message_user(request, f"{queryset.count()} applications marked as reviewed.")
     mark_reviewed.short_description = "Mark as reviewed"
 
     def mark_shortlisted(self, request, queryset):
-        queryset.update(status='shortlisted')
+        counters.set_status(queryset, 'shortlisted')
         self.message_user(request, f"{queryset.count()} applications shortlisted.")
     mark_shortlisted.short_description = "Mark as shortlisted"
 
     def mark_rejected(self, request, queryset):
-        queryset.update(status='rejected')
+        counters.set_status(queryset, 'rejected')
         self.message_user(request, f"{queryset.count()} applications rejected.")
     mark_rejected.short_description = "Mark as rejected"
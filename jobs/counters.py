@@ -0,0 +1,86 @@
+"""
+Per-job application counters (JobApplicationStats).
+
+Every path that creates, deletes or re-statuses applications reports the change
+here as a delta, and the counters are moved with F-expression UPDATEs so
+concurrent writers never overwrite each other. Reads are a single row lookup.
+"""
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
+
+from core.counters import counter_rows, increments
+from .models import JobApplication, JobApplicationStats
+
+STATUSES = ('pending', 'reviewed', 'shortlisted', 'rejected', 'hired')
+
+COUNTER_FIELDS = ('total',) + STATUSES
+
+
+def apply_deltas(deltas):
+    """Apply {job_id: Counter({status: delta})} to the counters, one UPDATE per job."""
+    for job_id, by_status in deltas.items():
+        changes = {status: delta for status, delta in by_status.items() if delta}
+        if not changes:
+            continue
+        total = sum(changes.values())
+        rows = counter_rows(JobApplicationStats, changes, job_id=job_id)
+        updates = increments(changes)
+        if total:
+            updates['total'] = models.F('total') + total
+        rows.update(**updates)
+
+
+def record_created(job_id, status):
+    apply_deltas({job_id: Counter({status: 1})})
+
+
+def record_deleted(job_id, status):
+    apply_deltas({job_id: Counter({status: -1})})
+
+
+def record_status_change(job_id, old_status, new_status):
+    if old_status != new_status:
+        apply_deltas({job_id: Counter({old_status: -1, new_status: 1})})
+
+
+def status_change_deltas(transitions):
+    """Collect deltas from (job_id, old_status, new_status) triples."""
+    deltas = defaultdict(Counter)
+    for job_id, old_status, new_status in transitions:
+        if old_status != new_status:
+            deltas[job_id][old_status] -= 1
+            deltas[job_id][new_status] += 1
+    return deltas
+
+
+@transaction.atomic
+def set_status(queryset, new_status, **extra):
+    """queryset.update(status=new_status) that keeps the counters in step. Returns rows updated."""
+    # Lock plain rows and group here: PostgreSQL refuses FOR UPDATE with GROUP BY
+    rows = (
+        queryset.select_for_update(of=('self',))
+        .exclude(status=new_status)
+        .values_list('pk', 'job_id', 'status')
+    )
+    deltas = status_change_deltas((job_id, status, new_status) for pk, job_id, status in rows)
+    updated = queryset.update(status=new_status, **extra)
+    apply_deltas(deltas)
+    return updated
+
+
+def stats_for_job(job_id):
+    stats = JobApplicationStats.objects.filter(job_id=job_id).values(*COUNTER_FIELDS).first()
+    return stats or dict.fromkeys(COUNTER_FIELDS, 0)
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute every counter from the applications table. Returns the number of jobs counted."""
+    aggregates = {field: models.Count('pk', filter=models.Q(status=field)) for field in STATUSES}
+    rows = JobApplication.objects.values('job_id').annotate(total=models.Count('pk'), **aggregates)
+    JobApplicationStats.objects.all().delete()
+    created = JobApplicationStats.objects.bulk_create(
+        [JobApplicationStats(**row) for row in rows.order_by()], batch_size=500
+    )
+    return len(created)
@@ -0,0 +1,29 @@
+from django.utils import timezone
+
+from core.cache import invalidate_catalog
+from . import matching, search
+from .models import Job
+
+
+def close_expired_jobs(now=None, chunk_size=500):
+    """
+    Close approved jobs whose deadline has passed, chunk_size rows per UPDATE.
+
+    Closed jobs leave the live listing, the search index and the matching
+    vectors. Returns the number of jobs closed.
+    """
+    now = now or timezone.now()
+    expired = Job.objects.filter(is_approved=True, is_closed=False, deadline__lte=now)
+    closed = 0
+    while True:
+        ids = list(expired.values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            break
+        Job.objects.filter(pk__in=ids).update(is_closed=True, closed_at=now)
+        chunk = Job.objects.filter(pk__in=ids)
+        search.index_jobs(chunk)
+        matching.index_jobs(chunk)
+        closed += len(ids)
+    if closed:
+        invalidate_catalog('jobs')
+    return closed
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs.expiry import close_expired_jobs
+
+
+class Command(BaseCommand):
+    help = "Close approved jobs whose application deadline has passed"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        closed = close_expired_jobs(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Closed {closed} expired jobs."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from jobs import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-job application counters from the applications table"
+
+    def handle(self, *args, **options):
+        jobs = counters.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt application counters for {jobs} jobs."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from jobs import matching
+from jobs.models import JobSkillTerm, ProfileSkillTerm, SkillTerm
+
+
+class Command(BaseCommand):
+    help = "Rebuild the skill vectors used for job recommendations from scratch"
+
+    def handle(self, *args, **options):
+        matching.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {JobSkillTerm.objects.values('job').distinct().count()} jobs, "
+            f"{ProfileSkillTerm.objects.values('user').distinct().count()} profiles, "
+            f"{SkillTerm.objects.filter(job_count__gt=0).count()} terms."
+        ))
@@ -0,0 +1,147 @@
+"""
+Skill-based job matching.
+
+Job text and UserProfile.skills are tokenized into one shared vocabulary
+(SkillTerm) and stored as sparse vectors: JobSkillTerm rows for listed jobs,
+ProfileSkillTerm rows for users. Recommending jobs is then a sparse dot product
+that the database evaluates with a single grouped query over the term index,
+weighted by inverse document frequency. Vectors are rebuilt one job or one
+profile at a time as they change.
+"""
+import math
+import re
+from collections import Counter
+
+from django.db import models, transaction
+
+from core.models import UserProfile
+from .models import Job, JobSkillTerm, ProfileSkillTerm, SkillTerm
+
+# Keep only the strongest terms of each job so vectors stay small.
+MAX_JOB_TERMS = 64
+
+TITLE_BOOST = 3
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+STOPWORDS = {
+    'a', 'about', 'all', 'an', 'and', 'any', 'are', 'as', 'at', 'be', 'by', 'can', 'for',
+    'from', 'have', 'in', 'into', 'is', 'it', 'its', 'job', 'looking', 'of', 'on', 'or',
+    'our', 'role', 'that', 'the', 'their', 'this', 'to', 'we', 'will', 'with', 'work',
+    'you', 'your',
+}
+
+
+def tokenize(text):
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        token = token.rstrip('.')[:50]
+        if len(token) > 1 and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def job_vector(job):
+    counts = Counter(tokenize(job.description))
+    for token in tokenize(job.title):
+        counts[token] += TITLE_BOOST
+    weights = {term: 1 + math.log(count) for term, count in counts.most_common(MAX_JOB_TERMS)}
+    return _normalize(weights)
+
+
+def skills_vector(skills):
+    terms = set()
+    for skill in skills.split(','):
+        terms.update(tokenize(skill))
+    return _normalize({term: 1.0 for term in terms})
+
+
+def _normalize(weights):
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+
+def _adjust_job_counts(terms, delta):
+    if not terms:
+        return
+    if delta > 0:
+        SkillTerm.objects.bulk_create([SkillTerm(term=term) for term in terms], ignore_conflicts=True)
+    SkillTerm.objects.filter(term__in=terms).update(job_count=models.F('job_count') + delta)
+
+
+@transaction.atomic
+def index_job(job):
+    """Rebuild the vector of one job; jobs that are not listed are dropped from the index."""
+    old_terms = set(JobSkillTerm.objects.filter(job_id=job.pk).values_list('term', flat=True))
+    vector = job_vector(job) if job.is_listed else {}
+
+    JobSkillTerm.objects.filter(job_id=job.pk).delete()
+    JobSkillTerm.objects.bulk_create(
+        [JobSkillTerm(job_id=job.pk, term=term, weight=weight) for term, weight in vector.items()]
+    )
+    _adjust_job_counts(old_terms - set(vector), -1)
+    _adjust_job_counts(set(vector) - old_terms, 1)
+
+
+def index_jobs(queryset):
+    for job in queryset.iterator(chunk_size=500):
+        index_job(job)
+
+
+def remove_job(job):
+    old_terms = set(JobSkillTerm.objects.filter(job_id=job.pk).values_list('term', flat=True))
+    _adjust_job_counts(old_terms, -1)
+
+
+@transaction.atomic
+def index_profile(profile):
+    vector = skills_vector(profile.skills)
+    ProfileSkillTerm.objects.filter(user_id=profile.user_id).delete()
+    ProfileSkillTerm.objects.bulk_create(
+        [ProfileSkillTerm(user_id=profile.user_id, term=term, weight=weight) for term, weight in vector.items()]
+    )
+
+
+def rebuild():
+    """Rebuild every vector and the vocabulary counts from scratch."""
+    with transaction.atomic():
+        JobSkillTerm.objects.all().delete()
+        ProfileSkillTerm.objects.all().delete()
+        SkillTerm.objects.all().delete()
+    index_jobs(Job.objects.filter(is_approved=True, is_closed=False))
+    for profile in UserProfile.objects.exclude(skills='').iterator(chunk_size=500):
+        index_profile(profile)
+
+
+def recommended_jobs(user, limit=10):
+    """
+    Return [(job_id, score)] for the approved jobs that best match the user's skills.
+
+    Only the user's own terms are touched: one query for their idf weights and one
+    grouped query that scores every job sharing at least one term.
+    """
+    profile_weights = dict(ProfileSkillTerm.objects.filter(user=user).values_list('term', 'weight'))
+    if not profile_weights:
+        return []
+
+    total_jobs = Job.objects.filter(is_approved=True, is_closed=False).count()
+    job_counts = dict(SkillTerm.objects.filter(term__in=profile_weights).values_list('term', 'job_count'))
+    query_weights = {
+        term: weight * (math.log((total_jobs + 1) / (job_counts[term] + 1)) + 1)
+        for term, weight in profile_weights.items()
+        if job_counts.get(term)
+    }
+    if not query_weights:
+        return []
+
+    query_weight = models.Case(
+        *[models.When(term=term, then=models.Value(weight)) for term, weight in query_weights.items()],
+        output_field=models.FloatField(),
+    )
+    rows = (
+        JobSkillTerm.objects.filter(term__in=query_weights)
+        .values('job_id')
+        .annotate(score=models.Sum(models.F('weight') * query_weight))
+        .order_by('-score')[:limit]
+    )
+    return [(row['job_id'], row['score']) for row in rows]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:03
+
+from itertools import islice
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from jobs.search import create_index, drop_index
+
+
+def create_search_index(apps, schema_editor):
+    create_index(schema_editor)
+
+    Job = apps.get_model('jobs', 'Job')
+    JobSearchDocument = apps.get_model('jobs', 'JobSearchDocument')
+    jobs = Job.objects.filter(is_approved=True).select_related('company').iterator(chunk_size=500)
+    # Insert in batches, so memory stays bounded however many jobs there are
+    while batch := list(islice(jobs, 500)):
+        JobSearchDocument.objects.bulk_create([
+            JobSearchDocument(
+                job=job,
+                title=job.title,
+                description=job.description,
+                company_name=job.company.name,
+                location=job.location,
+            )
+            for job in batch
+        ])
+
+
+def drop_search_index(apps, schema_editor):
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_job_type_job_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=225)),
+                ('description', models.TextField(blank=True)),
+                ('company_name', models.CharField(blank=True, max_length=225)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='jobs.job')),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_company_website'),
+        ('jobs', '0004_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_approved', '-posted_at', '-id'], name='job_approved_posted_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_company_website'),
+        ('jobs', '0007_resumedocument'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_approved_posted_idx',
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='is_closed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_closed', False)), fields=['is_approved', '-posted_at', '-id'], name='job_approved_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_approved', 'deadline'], name='job_approved_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_application_stats(apps, schema_editor):
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    JobApplicationStats = apps.get_model('jobs', 'JobApplicationStats')
+    statuses = ('pending', 'reviewed', 'shortlisted', 'rejected', 'hired')
+    rows = JobApplication.objects.order_by().values('job_id').annotate(
+        total=models.Count('pk'),
+        **{status: models.Count('pk', filter=models.Q(status=status)) for status in statuses}
+    )
+    JobApplicationStats.objects.bulk_create([JobApplicationStats(**row) for row in rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_expiry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationStats',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='application_stats', serialize=False, to='jobs.job')),
+                ('total', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('reviewed', models.IntegerField(default=0)),
+                ('shortlisted', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('hired', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_application_stats, migrations.RunPython.noop),
+    ]
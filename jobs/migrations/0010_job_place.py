@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_location'),
+        ('jobs', '0009_jobapplicationstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='place',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='core.location'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_place'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchIndexEntry',
+            fields=[
+                ('document', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='index_entry', serialize=False, to='jobs.jobsearchdocument')),
+            ],
+            options={
+                'db_table': 'jobs_jobsearchdocument_fts',
+                'managed': False,
+            },
+        ),
+    ]
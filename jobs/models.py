@@ -1,10 +1,20 @@
 import uuid
 
 from django.db import models
+from django.utils import timezone
 
 from core.models import Company
 
 
+class JobQuerySet(models.QuerySet):
+    def live(self, now=None):
+        """Approved jobs that are still open for applications."""
+        now = now or timezone.now()
+        return self.filter(is_approved=True, is_closed=False).filter(
+            models.Q(deadline__isnull=True) | models.Q(deadline__gt=now)
+        )
+
+
 # Create your models here.
 class Job(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -22,10 +32,35 @@ class Job(models.Model):
         default='Full-time'
     )
     location = models.CharField(max_length=100, blank=True)
+    # Gazetteer match for `location`, kept in sync on save
+    place = models.ForeignKey('core.Location', on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
     is_approved = models.BooleanField(default=False)
     posted_at = models.DateTimeField(auto_now_add=True)
     created_at = models.DateTimeField(auto_now_add=True)
     deadline = models.DateTimeField(blank= True, null= True)
+    # Set by the expiry sweeper (close_expired_jobs) once the deadline has passed;
+    # cleared again when a save extends or removes the deadline (jobs/signals.py)
+    is_closed = models.BooleanField(default=False)
+    closed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serves list_jobs: live jobs newest first, and keyset pages on (posted_at, id).
+            # Partial, so closed postings never enter the hot index.
+            models.Index(
+                fields=['is_approved', '-posted_at', '-id'],
+                name='job_approved_posted_idx',
+                condition=models.Q(is_closed=False),
+            ),
+            # Serves the deadline filter and the expiry sweeper
+            models.Index(fields=['is_approved', 'deadline'], name='job_approved_deadline_idx'),
+        ]
+
+    @property
+    def is_listed(self):
+        return self.is_approved and not self.is_closed
 
     def __str__(self):
         return self.title
@@ -54,5 +89,108 @@ class JobApplication(models.Model):
     class Meta:
         unique_together = ('job', 'applicant')  # Prevent duplicate applications
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so a later save() can move the per-status counters
+        instance._stored_status = instance.__dict__.get('status')
+        return instance
+
     def __str__(self):
         return f"{self.applicant.username} applied for {self.job.title}"
+
+
+class JobApplicationStats(models.Model):
+    # Application counters per job and status, maintained incrementally by
+    # jobs/counters.py; `python manage.py rebuild_application_counters` repairs them.
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='application_stats')
+    total = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    reviewed = models.IntegerField(default=0)
+    shortlisted = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    hired = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Application stats for {self.job_id}"
+
+
+class JobSearchDocument(models.Model):
+    # Denormalized copy of the searchable text of an approved job. The full-text
+    # index itself lives in the database (FTS5 on SQLite, GIN on PostgreSQL),
+    # see jobs/search.py and migration 0004.
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, related_name='search_document')
+    title = models.CharField(max_length=225)
+    description = models.TextField(blank=True)
+    company_name = models.CharField(max_length=225, blank=True)
+    location = models.CharField(max_length=100, blank=True)
+
+    def __str__(self):
+        return self.title
+
+
+class JobSearchIndexEntry(models.Model):
+    # The SQLite FTS5 table over JobSearchDocument, created by migration 0004
+    # rather than by Django; mapped only so searches can join it, see jobs/search.py.
+    document = models.OneToOneField(
+        JobSearchDocument, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid',
+        db_constraint=False, related_name='index_entry'
+    )
+
+    class Meta:
+        managed = False
+        db_table = 'jobs_jobsearchdocument_fts'
+
+
+class SkillTerm(models.Model):
+    # Shared vocabulary of the job matching engine, see jobs/matching.py.
+    # job_count is the number of indexed jobs using the term, for idf weighting.
+    term = models.CharField(max_length=50, unique=True)
+    job_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return self.term
+
+
+class JobSkillTerm(models.Model):
+    # One non-zero entry of an approved job's sparse skill vector
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_terms')
+    term = models.CharField(max_length=50)
+    weight = models.FloatField()
+
+    class Meta:
+        unique_together = ('job', 'term')
+        indexes = [
+            models.Index(fields=['term', 'job', 'weight'], name='jobskillterm_term_idx'),
+        ]
+
+
+class ProfileSkillTerm(models.Model):
+    # One non-zero entry of a user's sparse skill vector, built from UserProfile.skills
+    user = models.ForeignKey('core.User', on_delete=models.CASCADE, related_name='skill_terms')
+    term = models.CharField(max_length=50)
+    weight = models.FloatField()
+
+    class Meta:
+        unique_together = ('user', 'term')
+
+
+class ResumeDocument(models.Model):
+    # Text extracted from JobApplication.resume in the background, see jobs/resumes.py
+    application = models.OneToOneField(JobApplication, on_delete=models.CASCADE, related_name='resume_document')
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('pending', 'Pending'),
+            ('processed', 'Processed'),
+            ('failed', 'Failed')
+        ],
+        default='pending'
+    )
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    text = models.TextField(blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Resume for {self.application_id}"
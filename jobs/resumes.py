@@ -0,0 +1,196 @@
+"""
+Resume text extraction.
+
+apply_for_job stores the uploaded file and queues jobs.tasks.process_resume;
+the worker reads the file back in chunks, hashes it, extracts plain text and
+stores both on a ResumeDocument so employers can search resumes without
+opening the files.
+"""
+import hashlib
+import io
+import re
+import zipfile
+import zlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from django.utils import timezone
+
+from .models import ResumeDocument
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Longest text kept per resume; enough for search, bounded for storage.
+MAX_TEXT_LENGTH = 100_000
+
+# Most bytes inflated from one resume (all PDF streams together, or the DOCX body),
+# so a small compressed upload cannot expand without bound in the worker.
+MAX_INFLATED_SIZE = 20 * 1024 * 1024
+
+# Most bytes tokenized per PDF (its inflated streams, then the file itself),
+# which bounds the time a worker spends on one resume.
+MAX_SCANNED_SIZE = 8 * 1024 * 1024
+
+# One PDF token per match: a literal string, an array bracket, an escape, a
+# run of stray parentheses, a word or whitespace. A string that never closes
+# fails at the next unescaped parenthesis and scanning resumes from there, so
+# every byte is examined a bounded number of times.
+PDF_TOKEN_RE = re.compile(
+    rb'\(+(?=\()|\(([^()\\]*(?:\\.[^()\\]*)*)\)|(\[+|\]+)|(?:\\.)+|\\|[()]\)*|[^()\[\]\\\s]+|\s+',
+    re.S,
+)
+DOCX_TEXT_RE = re.compile(r'<w:t[^>]*>([^<]*)</w:t>|</w:p>')
+
+
+def read_file(field_file, chunk_size=64 * 1024):
+    """Return (content, sha256 hex digest), reading the stored file in chunks."""
+    digest = hashlib.sha256()
+    buffer = io.BytesIO()
+    field_file.open('rb')
+    try:
+        for chunk in field_file.chunks(chunk_size):
+            digest.update(chunk)
+            buffer.write(chunk)
+    finally:
+        field_file.close()
+    return buffer.getvalue(), digest.hexdigest()
+
+
+class ResumeTooLarge(MultiPartParserError):
+    pass
+
+
+class ResumeUploadLimitHandler(FileUploadHandler):
+    """
+    Aborts the request once the 'resume' file passes RESUME_MAX_UPLOAD_SIZE,
+    while it streams in and before later handlers write it to disk.
+    DRF reports the error as a 400.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.field_name == 'resume':
+            self.received += len(raw_data)
+            if self.received > settings.RESUME_MAX_UPLOAD_SIZE:
+                raise ResumeTooLarge(
+                    f"Resume must be at most {settings.RESUME_MAX_UPLOAD_SIZE // (1024 * 1024)} MB."
+                )
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def pdf_streams(content):
+    """Yield the raw body of each stream ... endstream object in content."""
+    position = 0
+    while True:
+        start = content.find(b'stream', position)
+        if start == -1:
+            return
+        start += len(b'stream')
+        if content.startswith(b'\r\n', start):
+            start += 2
+        elif content.startswith(b'\n', start):
+            start += 1
+        else:
+            position = start
+            continue
+        end = content.find(b'endstream', start)
+        if end == -1:
+            return
+        position = end + len(b'endstream')
+        yield content[start:end].removesuffix(b'\n').removesuffix(b'\r')
+
+
+def pdf_text_strings(data):
+    """Yield the strings shown by Tj and TJ operators in a content stream."""
+    operands, array = [], None
+    for match in PDF_TOKEN_RE.finditer(data):
+        string, bracket = match.groups()
+        token = match.group()
+        if string is not None:
+            (operands if array is None else array).append(string)
+        elif bracket and bracket.startswith(b'['):
+            array = []
+        elif bracket:
+            operands, array = array or [], None
+        elif token in (b'Tj', b'TJ'):
+            yield from operands
+            operands = []
+        elif array is None and not token.isspace():
+            operands = []
+
+
+def extract_pdf_text(content):
+    streams = []
+    budget = MAX_INFLATED_SIZE
+    for raw in pdf_streams(content):
+        try:
+            inflated = zlib.decompressobj().decompress(raw, budget + 1)
+        except zlib.error:
+            streams.append(raw)
+            continue
+        budget -= len(inflated)
+        if budget < 0:
+            raise ValueError("PDF expands beyond the extraction limit")
+        streams.append(inflated)
+    streams.append(content)
+    parts, scanned, length = [], 0, 0
+    for stream in streams:
+        stream = stream[:MAX_SCANNED_SIZE - scanned]
+        scanned += len(stream)
+        for string in pdf_text_strings(stream):
+            parts.append(string.replace(rb'\(', b'(').replace(rb'\)', b')'))
+            length += len(string) + 1
+            if length > MAX_TEXT_LENGTH:
+                return b' '.join(parts).decode('latin-1')
+        if scanned >= MAX_SCANNED_SIZE:
+            break
+    return b' '.join(parts).decode('latin-1')
+
+
+def extract_docx_text(content):
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        if archive.getinfo('word/document.xml').file_size > MAX_INFLATED_SIZE:
+            raise ValueError("DOCX expands beyond the extraction limit")
+        with archive.open('word/document.xml') as member:
+            xml = member.read(MAX_INFLATED_SIZE + 1)
+        if len(xml) > MAX_INFLATED_SIZE:
+            raise ValueError("DOCX expands beyond the extraction limit")
+        xml = xml.decode('utf-8')
+    return ''.join(match or '\n' for match in DOCX_TEXT_RE.findall(xml))
+
+
+def extract_text(name, content):
+    name = name.lower()
+    if name.endswith('.pdf'):
+        text = extract_pdf_text(content)
+    elif name.endswith('.docx'):
+        text = extract_docx_text(content)
+    else:
+        text = content.decode('utf-8', errors='replace')
+    return re.sub(r'[ \t]+', ' ', text).strip()[:MAX_TEXT_LENGTH]
+
+
+def process_application_resume(application):
+    document, _ = ResumeDocument.objects.get_or_create(application=application)
+    if not application.resume:
+        document.delete()
+        return None
+    try:
+        content, content_hash = read_file(application.resume)
+        document.text = extract_text(application.resume.name, content)
+        document.content_hash = content_hash
+        document.status = 'processed'
+        document.error = ''
+    except Exception as exc:
+        document.status = 'failed'
+        document.error = str(exc)[:255]
+    document.processed_at = timezone.now()
+    document.save()
+    return document
@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.utils import timezone
+
+from core.ids import parse_uuid
+from . import counters
+from .models import JobApplication
+
+APPLICATION_STATUSES = [choice[0] for choice in JobApplication._meta.get_field('status').choices]
+
+MAX_BULK_REVIEWS = 1000
+
+
+def bulk_review(user, reviews):
+    """
+    Apply [{'id': ..., 'status': ...}] status changes in one transaction.
+
+    Ownership of every application is checked by a single joined query and the
+    changes are written with bulk_update. Returns one result per input item:
+    'updated', 'invalid_id', 'invalid_status' or 'not_found' (missing, or posted
+    by another employer).
+    """
+    results = []
+    targets = {}
+    for review in reviews:
+        if not isinstance(review, dict):
+            review = {}
+        application_id = parse_uuid(review.get('id'))
+        status_value = review.get('status')
+        if application_id is None:
+            results.append({'id': review.get('id'), 'result': 'invalid_id'})
+        elif status_value not in APPLICATION_STATUSES:
+            results.append({'id': str(application_id), 'result': 'invalid_status'})
+        else:
+            targets[application_id] = status_value
+            results.append({'id': str(application_id), 'result': None})
+
+    applications = JobApplication.objects.filter(pk__in=targets)
+    if not user.is_staff:
+        applications = applications.filter(job__company__employer=user)
+
+    now = timezone.now()
+    with transaction.atomic():
+        owned = list(applications.select_for_update().only('id', 'job_id', 'status', 'reviewed_at'))
+        transitions = []
+        for application in owned:
+            transitions.append((application.job_id, application.status, targets[application.pk]))
+            application.status = targets[application.pk]
+            application.reviewed_at = now
+        JobApplication.objects.bulk_update(owned, ['status', 'reviewed_at'], batch_size=500)
+        counters.apply_deltas(counters.status_change_deltas(transitions))
+
+    owned_ids = {str(application.pk) for application in owned}
+    for result in results:
+        if result['result'] is None:
+            result['result'] = 'updated' if result['id'] in owned_ids else 'not_found'
+    return results
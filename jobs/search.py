@@ -0,0 +1,156 @@
+"""
+Full-text search over listed (approved, not closed) jobs.
+
+Searchable text is copied into JobSearchDocument rows (one per listed job)
+and indexed by the database itself:
+
+* SQLite: an external-content FTS5 table kept in sync by triggers, ranked with bm25().
+* PostgreSQL: a GIN index on a weighted tsvector expression, ranked with ts_rank().
+
+search_jobs() joins the index to the jobs table, so listing filters, the
+ranking and pagination all run in one query over every match.
+
+Other backends fall back to the old icontains filtering in list_jobs.
+"""
+import re
+
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+
+from .models import Job, JobSearchDocument, JobSearchIndexEntry
+
+FTS_TABLE = JobSearchIndexEntry._meta.db_table
+
+# Column weights, in FTS column order: title, description, company_name, location
+SQLITE_WEIGHTS = (10.0, 1.0, 5.0, 2.0)
+
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, company_name, location,
+        content='jobs_jobsearchdocument', content_rowid='id',
+        tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_jobsearchdocument_ai AFTER INSERT ON jobs_jobsearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, company_name, location)
+        VALUES (new.id, new.title, new.description, new.company_name, new.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_jobsearchdocument_ad AFTER DELETE ON jobs_jobsearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, company_name, location)
+        VALUES ('delete', old.id, old.title, old.description, old.company_name, old.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_jobsearchdocument_au AFTER UPDATE ON jobs_jobsearchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, company_name, location)
+        VALUES ('delete', old.id, old.title, old.description, old.company_name, old.location);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, company_name, location)
+        VALUES (new.id, new.title, new.description, new.company_name, new.location);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS jobs_jobsearchdocument_ai",
+    "DROP TRIGGER IF EXISTS jobs_jobsearchdocument_ad",
+    "DROP TRIGGER IF EXISTS jobs_jobsearchdocument_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _pg_vector(table=''):
+    column = f'{table}.' if table else ''
+    return (
+        f"(setweight(to_tsvector('english', coalesce({column}title, '')), 'A') || "
+        f"setweight(to_tsvector('english', coalesce({column}company_name, '')), 'B') || "
+        f"setweight(to_tsvector('english', coalesce({column}location, '')), 'C') || "
+        f"setweight(to_tsvector('english', coalesce({column}description, '')), 'D'))"
+    )
+
+
+# The WHERE clause must repeat this expression for PostgreSQL to use the index;
+# qualifying the columns (needed once jobs_job is joined) does not change it.
+PG_VECTOR = _pg_vector()
+
+PG_CREATE = [
+    f"CREATE INDEX IF NOT EXISTS jobs_jobsearchdocument_gin ON jobs_jobsearchdocument USING gin ({PG_VECTOR})",
+]
+
+PG_DROP = [
+    "DROP INDEX IF EXISTS jobs_jobsearchdocument_gin",
+]
+
+
+def is_supported(conn=connection):
+    return conn.vendor in ('sqlite', 'postgresql')
+
+
+def create_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_CREATE, 'postgresql': PG_CREATE}.get(vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_DROP, 'postgresql': PG_DROP}.get(vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def tokenize_query(query):
+    return re.findall(r'\w+', query.lower())[:10]
+
+
+def index_job(job):
+    """Create, refresh or drop the search document for a single job."""
+    if not job.is_listed:
+        JobSearchDocument.objects.filter(job_id=job.pk).delete()
+        return
+    JobSearchDocument.objects.update_or_create(
+        job_id=job.pk,
+        defaults={
+            'title': job.title,
+            'description': job.description,
+            'company_name': job.company.name,
+            'location': job.location,
+        },
+    )
+
+
+def index_jobs(queryset):
+    """Resync the search documents for every job in the queryset."""
+    for job in queryset.select_related('company').iterator(chunk_size=500):
+        index_job(job)
+
+
+def rebuild():
+    JobSearchDocument.objects.all().delete()
+    index_jobs(Job.objects.filter(is_approved=True, is_closed=False))
+
+
+def search_jobs(queryset, query):
+    """
+    Narrow a Job queryset to listed jobs matching the query, annotated with
+    search_rank (ascending = best match first).
+
+    Every word is matched as a prefix so results update while the user is typing.
+    Returns None when the database has no full-text support.
+    """
+    if not is_supported():
+        return None
+    words = tokenize_query(query)
+    if not words:
+        return queryset.none()
+
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{word}"*' for word in words)
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        # The lookup joins the FTS table under its own name, which the raw SQL refers to
+        matches = RawSQL(f"{FTS_TABLE} MATCH %s", [match], output_field=models.BooleanField())
+        rank = RawSQL(f"bm25({FTS_TABLE}, {weights})", [], output_field=models.FloatField())
+        return queryset.filter(matches, search_document__index_entry__isnull=False).annotate(search_rank=rank)
+
+    tsquery = ' & '.join(f'{word}:*' for word in words)
+    vector = _pg_vector(JobSearchDocument._meta.db_table)
+    matches = RawSQL(f"{vector} @@ to_tsquery('english', %s)", [tsquery], output_field=models.BooleanField())
+    rank = RawSQL(f"-ts_rank({vector}, to_tsquery('english', %s))", [tsquery], output_field=models.FloatField())
+    return queryset.filter(matches, search_document__isnull=False).annotate(search_rank=rank)
@@ -1,5 +1,9 @@
+import os
+
+from django.conf import settings
 from rest_framework import serializers
 from .models import Job, JobApplication
+from .resumes import RESUME_EXTENSIONS
 
 
 class JobSerializer(serializers.ModelSerializer):
@@ -8,12 +12,21 @@ class JobSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Job
-        fields = ['id', 'company', 'company_name', 'title', 'description', 'job_type', 'location', 'is_approved', 'posted_at', 'created_at', 'deadline']
-        read_only_fields = ['id', 'posted_at', 'created_at']
+        fields = ['id', 'company', 'company_name', 'title', 'description', 'job_type', 'location', 'is_approved', 'is_closed', 'posted_at', 'created_at', 'deadline']
+        read_only_fields = ['id', 'is_closed', 'posted_at', 'created_at']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._company_cache = {}
 
     def get_company(self, obj):
+        # With many=True this serializer instance is shared by every row, so each
+        # distinct company is serialized once per response. Callers should
+        # select_related('company') to fetch jobs and companies in one query.
         from core.serializers import CompanySerializer
-        return CompanySerializer(obj.company).data
+        if obj.company_id not in self._company_cache:
+            self._company_cache[obj.company_id] = CompanySerializer(obj.company).data
+        return self._company_cache[obj.company_id]
 
     def validate_title(self, value):
         if len(value.strip()) < 3:
@@ -38,4 +51,15 @@ class JobApplicationSerializer(serializers.ModelSerializer):
     def validate_cover_letter(self, value):
         if len(value.strip()) < 50:
             raise serializers.ValidationError("Cover letter must be at least 50 characters long.")
-        return value.strip()
\ No newline at end of file
+        return value.strip()
+
+    def validate_resume(self, value):
+        if value is None:
+            return value
+        if value.size > settings.RESUME_MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(
+                f"Resume must be at most {settings.RESUME_MAX_UPLOAD_SIZE // (1024 * 1024)} MB."
+            )
+        if os.path.splitext(value.name)[1].lower() not in RESUME_EXTENSIONS:
+            raise serializers.ValidationError(f"Resume must be one of: {', '.join(RESUME_EXTENSIONS)}.")
+        return value
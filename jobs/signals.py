@@ -0,0 +1,73 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.cache import invalidate_catalog
+from core.geo import resolve_location
+from core.models import Company, UserProfile
+from . import counters, matching, search
+from .models import Job, JobApplication
+
+
+@receiver(pre_save, sender=Job)
+def resolve_job_place(sender, instance, **kwargs):
+    instance.place = resolve_location(instance.location)
+
+
+@receiver(pre_save, sender=Job)
+def reopen_extended_job(sender, instance, **kwargs):
+    # Jobs are only closed for a passed deadline, so an extended or cleared one reopens them;
+    # the post_save receivers below then put the job back in the indexes
+    if instance.is_closed and (instance.deadline is None or instance.deadline > timezone.now()):
+        instance.is_closed = False
+        instance.closed_at = None
+
+
+@receiver(post_save, sender=Job)
+def sync_job_search_document(sender, instance, **kwargs):
+    search.index_job(instance)
+
+
+@receiver(post_save, sender=Job)
+def sync_job_skill_vector(sender, instance, **kwargs):
+    matching.index_job(instance)
+
+
+@receiver(pre_delete, sender=Job)
+def remove_job_skill_vector(sender, instance, **kwargs):
+    matching.remove_job(instance)
+
+
+@receiver(post_save, sender=UserProfile)
+def sync_profile_skill_vector(sender, instance, **kwargs):
+    matching.index_profile(instance)
+
+
+@receiver(post_save, sender=Company)
+def sync_company_job_search_documents(sender, instance, created, **kwargs):
+    if not created:
+        search.index_jobs(instance.jobs.filter(is_approved=True, is_closed=False))
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_job_catalog(sender, **kwargs):
+    invalidate_catalog('jobs')
+
+
+@receiver(post_save, sender=JobApplication)
+def count_application_save(sender, instance, created, **kwargs):
+    if created:
+        counters.record_created(instance.job_id, instance.status)
+    else:
+        stored_status = getattr(instance, '_stored_status', None)
+        if stored_status is not None:
+            counters.record_status_change(instance.job_id, stored_status, instance.status)
+    instance._stored_status = instance.status
+
+
+@receiver(post_delete, sender=JobApplication)
+def count_application_delete(sender, instance, **kwargs):
+    counters.record_deleted(instance.job_id, getattr(instance, '_stored_status', None) or instance.status)
@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from . import expiry, resumes
+from .models import JobApplication
+
+
+@shared_task
+def process_resume(application_id):
+    application = JobApplication.objects.filter(pk=application_id).first()
+    if application is not None:
+        resumes.process_application_resume(application)
+
+
+@shared_task
+def close_expired_jobs():
+    return expiry.close_expired_jobs()
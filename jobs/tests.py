@@ -1,10 +1,26 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+import time
+import zipfile
+import zlib
+from unittest import mock
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
-from .models import Job, JobApplication
-from core.models import Company
+from django.utils import timezone
+from .models import Job, JobApplication, JobApplicationStats, JobSearchDocument, ResumeDocument, SkillTerm
+from . import counters, resumes, search
+from .resumes import extract_text
+from core.models import Company, UserProfile
 
 User = get_user_model()
 
@@ -66,3 +82,609 @@ class JobApplicationTest(TestCase):
         self.assertEqual(application.job, self.job)
         self.assertEqual(application.applicant, self.applicant)
         self.assertEqual(application.status, 'pending')
+
+class JobSearchTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        self.company = Company.objects.create(
+            name='Tech Corp',
+            description='A tech company',
+            employer=self.employer
+        )
+        self.backend_job = Job.objects.create(
+            company=self.company,
+            title='Python Developer',
+            description='Build Django APIs for our platform',
+            location='Lagos',
+            is_approved=True
+        )
+        self.data_job = Job.objects.create(
+            company=self.company,
+            title='Data Analyst',
+            description='Analyse data with Python and SQL',
+            location='Nairobi',
+            is_approved=True
+        )
+        self.client.force_authenticate(user=self.employer)
+
+    def search(self, query):
+        response = self.client.get(reverse('list-jobs'), {'search': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['title'] for job in response.data['results']]
+
+    def test_results_ranked_by_relevance(self):
+        self.assertEqual(self.search('python'), ['Python Developer', 'Data Analyst'])
+        self.assertEqual(self.search('nairobi'), ['Data Analyst'])
+        self.assertEqual(self.search('pyth'), ['Python Developer', 'Data Analyst'])
+
+    def test_index_follows_approval_and_edits(self):
+        Job.objects.create(
+            company=self.company,
+            title='Python Intern',
+            description='Unapproved posting',
+            is_approved=False
+        )
+        self.assertNotIn('Python Intern', self.search('intern'))
+
+        self.data_job.title = 'Machine Learning Engineer'
+        self.data_job.save()
+        self.assertEqual(self.search('machine learning'), ['Machine Learning Engineer'])
+
+        self.company.name = 'Acme Labs'
+        self.company.save()
+        self.assertEqual(len(self.search('acme')), 2)
+
+    def test_admin_approval_from_filtered_changelist_indexes_jobs(self):
+        intern = Job.objects.create(company=self.company, title='Python Intern', description='Django and SQL')
+        admin_user = User.objects.create_superuser(username='admin', email='admin@example.com', password='adminpass')
+        self.client.force_login(admin_user)
+        self.client.post(reverse('admin:jobs_job_changelist') + '?is_approved__exact=0', {
+            'action': 'approve_jobs',
+            '_selected_action': [intern.pk],
+        })
+        self.assertTrue(JobSearchDocument.objects.filter(job=intern).exists())
+        self.assertIn('Python Intern', self.search('intern'))
+
+    def test_filters_apply_to_every_match(self):
+        # Many stronger matches must not crowd the filtered ones out of the results
+        Job.objects.bulk_create([
+            Job(company=self.company, title=f'Python Engineer {n}', description='Python Python', is_approved=True)
+            for n in range(210)
+        ] + [
+            Job(company=self.company, title=f'Intern {n}', description='Learn python', job_type='Internship',
+                is_approved=True)
+            for n in range(5)
+        ])
+        search.rebuild()
+        url = reverse('list-jobs')
+        self.assertEqual(self.client.get(url, {'search': 'python'}).data['count'], 217)
+        response = self.client.get(url, {'search': 'python', 'job_type': 'Internship'})
+        self.assertEqual(response.data['count'], 5)
+
+        response = self.client.get(url, {'search': 'python', 'pagination': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_queryset_composes_with_orm(self):
+        results = search.search_jobs(Job.objects.filter(company=self.company), 'python')
+        self.assertEqual(list(results.filter(location='Lagos').values_list('title', flat=True)), ['Python Developer'])
+        self.assertEqual(list(results.exclude(location='Lagos').values_list('title', flat=True)), ['Data Analyst'])
+        ranked = results.order_by('search_rank').values_list('title', 'search_rank')
+        self.assertEqual([title for title, rank in ranked], ['Python Developer', 'Data Analyst'])
+
+class JobCursorPaginationTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        company = Company.objects.create(name='Tech Corp', employer=self.employer)
+        for number in range(25):
+            Job.objects.create(
+                company=company,
+                title=f'Job {number}',
+                description='A job posting for testing pagination',
+                is_approved=True
+            )
+        self.client.force_authenticate(user=self.employer)
+
+    def get_page(self, **params):
+        response = self.client.get(reverse('list-jobs'), {'page_size': 10, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_walks_forward_and_back(self):
+        first = self.get_page(pagination='cursor')
+        self.assertIsNone(first['previous'])
+        self.assertNotIn('count', first)
+        second = self.get_page(cursor=first['next'])
+        third = self.get_page(cursor=second['next'])
+        self.assertEqual(len(third['results']), 5)
+        self.assertIsNone(third['next'])
+
+        seen = [job['id'] for page in (first, second, third) for job in page['results']]
+        expected = [str(pk) for pk in Job.objects.order_by('-posted_at', '-id').values_list('id', flat=True)]
+        self.assertEqual(seen, expected)
+
+        back = self.get_page(cursor=third['previous'])
+        self.assertEqual(back['results'], second['results'])
+
+    def test_count_is_opt_in_and_bad_cursor_rejected(self):
+        self.assertEqual(self.get_page(pagination='cursor', count='true')['count'], 25)
+        response = self.client.get(reverse('list-jobs'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class JobListQueryCountTest(APITestCase):
+    def setUp(self):
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@example.com',
+            password='testpass123'
+        )
+        for number in range(3):
+            employer = User.objects.create_user(
+                username=f'employer{number}',
+                email=f'employer{number}@example.com',
+                password='testpass123',
+                is_employer=True
+            )
+            company = Company.objects.create(name=f'Company {number}', employer=employer)
+            for _ in range(10):
+                Job.objects.create(
+                    company=company,
+                    title='Backend Developer',
+                    description='A job posting for testing query counts',
+                    is_approved=True
+                )
+        self.client.force_authenticate(user=self.learner)
+
+    def test_query_count_independent_of_page_size(self):
+        url = reverse('list-jobs')
+        # One COUNT for the paginator and one joined SELECT for the page
+        for page_size in (2, 30):
+            with self.assertNumQueries(2):
+                response = self.client.get(url, {'page_size': page_size})
+            self.assertEqual(len(response.data['results']), page_size)
+        with self.assertNumQueries(1):
+            self.client.get(url, {'pagination': 'cursor', 'page_size': 30})
+
+class JobMatchingTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@example.com',
+            password='testpass123'
+        )
+        company = Company.objects.create(name='Tech Corp', employer=self.employer)
+        self.django_job = Job.objects.create(
+            company=company,
+            title='Django Developer',
+            description='Build REST APIs with Python and Django',
+            is_approved=True
+        )
+        self.design_job = Job.objects.create(
+            company=company,
+            title='Graphic Designer',
+            description='Create marketing assets in Figma',
+            is_approved=True
+        )
+        self.hidden_job = Job.objects.create(
+            company=company,
+            title='Senior Django Engineer',
+            description='Python and Django everywhere',
+            is_approved=False
+        )
+        UserProfile.objects.create(user=self.learner, skills='Python, Django, SQL')
+        self.client.force_authenticate(user=self.learner)
+
+    def test_recommends_only_matching_approved_jobs(self):
+        response = self.client.get(reverse('recommended-jobs'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['title'] for job in response.data['results']], ['Django Developer'])
+        self.assertGreater(response.data['results'][0]['match_score'], 0)
+
+    def test_vectors_follow_profile_and_job_changes(self):
+        self.hidden_job.is_approved = True
+        self.hidden_job.save()
+        self.learner.profile.skills = 'Figma'
+        self.learner.profile.save()
+
+        response = self.client.get(reverse('recommended-jobs'))
+        self.assertEqual([job['title'] for job in response.data['results']], ['Graphic Designer'])
+        self.assertEqual(SkillTerm.objects.get(term='django').job_count, 2)
+
+        self.hidden_job.delete()
+        self.assertEqual(SkillTerm.objects.get(term='django').job_count, 1)
+
+class JobApplicationExportTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        company = Company.objects.create(name='Tech Corp', employer=self.employer)
+        self.job = Job.objects.create(
+            company=company,
+            title='Python Developer',
+            description='We are looking for a Python developer',
+            is_approved=True
+        )
+        for number in range(3):
+            applicant = User.objects.create_user(
+                username=f'applicant{number}',
+                email=f'applicant{number}@example.com',
+                password='testpass123'
+            )
+            UserProfile.objects.create(user=applicant, location='Accra', skills='Python')
+            JobApplication.objects.create(job=self.job, applicant=applicant, cover_letter='Hello')
+        self.url = reverse('export-job-applications', args=[self.job.pk])
+
+    def test_streams_csv_and_ndjson(self):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:4], ['id', 'username', 'email', 'location'])
+        self.assertEqual(len(lines), 4)
+
+        response = self.client.get(self.url, {'type': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['username'] for row in rows], ['applicant0', 'applicant1', 'applicant2'])
+        self.assertEqual(rows[0]['location'], 'Accra')
+
+    def test_only_job_owner_can_export(self):
+        self.client.force_authenticate(user=User.objects.get(username='applicant0'))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ResumePipelineTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        self.applicant = User.objects.create_user(
+            username='applicant',
+            email='applicant@example.com',
+            password='testpass123'
+        )
+        company = Company.objects.create(name='Tech Corp', employer=self.employer)
+        self.job = Job.objects.create(
+            company=company,
+            title='Python Developer',
+            description='We are looking for a Python developer',
+            is_approved=True
+        )
+
+    def apply(self, resume):
+        self.client.force_authenticate(user=self.applicant)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('apply-for-job', args=[self.job.pk]), {
+                'job': self.job.pk,
+                'applicant': self.applicant.pk,
+                'cover_letter': 'I have five years of experience building Django applications.',
+                'resume': resume,
+            }, format='multipart')
+
+    def test_resume_text_extracted_and_searchable(self):
+        response = self.apply(SimpleUploadedFile('cv.txt', b'Skills: Kubernetes, Django, PostgreSQL'))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        document = ResumeDocument.objects.get(application__applicant=self.applicant)
+        self.assertEqual(document.status, 'processed')
+        self.assertIn('Kubernetes', document.text)
+        self.assertEqual(len(document.content_hash), 64)
+
+        self.client.force_authenticate(user=self.employer)
+        url = reverse('job-applications', args=[self.job.pk])
+        self.assertEqual(len(self.client.get(url, {'resume': 'kubernetes'}).data), 1)
+        self.assertEqual(len(self.client.get(url, {'resume': 'cobol'}).data), 0)
+
+    def test_rejects_unsupported_and_oversized_resumes(self):
+        response = self.apply(SimpleUploadedFile('cv.exe', b'MZ'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(RESUME_MAX_UPLOAD_SIZE=10):
+            response = self.apply(SimpleUploadedFile('cv.txt', b'x' * 11))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # Stopped by the upload handler while streaming, not by the serializer afterwards
+        self.assertIn('Resume must be at most', response.data['detail'])
+        self.assertFalse(JobApplication.objects.exists())
+
+    def test_extraction_refuses_decompression_bombs(self):
+        pdf = b'stream\n' + zlib.compress(b'(A) Tj ' * 1000) + b'\nendstream'
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('word/document.xml', '<w:t>A</w:t>' * 1000)
+        with mock.patch.object(resumes, 'MAX_INFLATED_SIZE', 1000):
+            with self.assertRaises(ValueError):
+                extract_text('cv.pdf', pdf)
+            with self.assertRaises(ValueError):
+                extract_text('cv.docx', buffer.getvalue())
+
+    def test_pdf_extraction_is_linear_on_unterminated_strings(self):
+        hostile = [
+            b'(' * 200_000,
+            b'(' + b'\\(' * 100_000,
+            b'(a' * 100_000,
+            b'[' * 200_000,
+            b'stream\n' * 30_000,
+            b'stream\n' + zlib.compress(b'(x [ ' * 100_000) + b'\nendstream',
+        ]
+        for content in hostile:
+            started = time.monotonic()
+            self.assertEqual(extract_text('cv.pdf', content), '')
+            self.assertLess(time.monotonic() - started, 2)
+
+    def test_extracts_pdf_and_docx_text(self):
+        pdf = b'%PDF-1.4\n1 0 obj\n<< /Length 44 >>\nstream\n' + zlib.compress(
+            b'BT /F1 12 Tf (Data Analyst) Tj [(Excel) -250 (SQL)] TJ ET'
+        ) + b'\nendstream\nendobj\n'
+        self.assertEqual(extract_text('cv.pdf', pdf), 'Data Analyst Excel SQL')
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', '<w:p><w:r><w:t>Project Manager</w:t></w:r></w:p>')
+        self.assertEqual(extract_text('cv.docx', buffer.getvalue()), 'Project Manager')
+
+class JobExpiryTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        company = Company.objects.create(name='Tech Corp', employer=self.employer)
+        self.expired_job = Job.objects.create(
+            company=company,
+            title='Expired Python Role',
+            description='Deadline already passed',
+            is_approved=True,
+            deadline=timezone.now() - timedelta(days=1)
+        )
+        self.open_job = Job.objects.create(
+            company=company,
+            title='Open Python Role',
+            description='Still accepting applications',
+            is_approved=True,
+            deadline=timezone.now() + timedelta(days=7)
+        )
+        self.client.force_authenticate(user=self.employer)
+
+    def test_sweeper_closes_expired_jobs(self):
+        out = io.StringIO()
+        call_command('close_expired_jobs', chunk_size=1, stdout=out)
+        self.assertIn('Closed 1 expired jobs', out.getvalue())
+
+        self.expired_job.refresh_from_db()
+        self.assertTrue(self.expired_job.is_closed)
+        self.assertFalse(JobSearchDocument.objects.filter(job=self.expired_job).exists())
+        self.assertFalse(Job.objects.get(pk=self.open_job.pk).is_closed)
+
+    def test_extending_deadline_reopens_job(self):
+        call_command('close_expired_jobs', stdout=io.StringIO())
+        deadline = (timezone.now() + timedelta(days=30)).isoformat()
+        response = self.client.put(reverse('update-job', args=[self.expired_job.pk]), {'deadline': deadline})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.expired_job.refresh_from_db()
+        self.assertFalse(self.expired_job.is_closed)
+        self.assertIsNone(self.expired_job.closed_at)
+        self.assertTrue(Job.objects.live().filter(pk=self.expired_job.pk).exists())
+        self.assertTrue(JobSearchDocument.objects.filter(job=self.expired_job).exists())
+
+    def test_listing_hides_expired_jobs_before_sweep(self):
+        response = self.client.get(reverse('list-jobs'))
+        self.assertEqual([job['title'] for job in response.data['results']], ['Open Python Role'])
+
+class BulkApplicationReviewTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        other_employer = User.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        self.job = Job.objects.create(
+            company=Company.objects.create(name='Tech Corp', employer=self.employer),
+            title='Python Developer',
+            description='We are looking for a Python developer',
+            is_approved=True
+        )
+        other_job = Job.objects.create(
+            company=Company.objects.create(name='Other Corp', employer=other_employer),
+            title='Designer',
+            description='We are looking for a designer',
+            is_approved=True
+        )
+        self.applications = []
+        for number in range(40):
+            applicant = User.objects.create(username=f'applicant{number}', email=f'applicant{number}@example.com')
+            self.applications.append(JobApplication.objects.create(job=self.job, applicant=applicant))
+        self.foreign_application = JobApplication.objects.create(job=other_job, applicant=applicant)
+        self.url = reverse('bulk-review-applications')
+        self.client.force_authenticate(user=self.employer)
+
+    def test_reports_per_item_results(self):
+        response = self.client.post(self.url, {'reviews': [
+            {'id': str(self.applications[0].pk), 'status': 'shortlisted'},
+            {'id': str(self.applications[1].pk), 'status': 'promoted'},
+            {'id': str(self.foreign_application.pk), 'status': 'rejected'},
+            {'id': 'not-a-uuid', 'status': 'rejected'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(
+            [result['result'] for result in response.data['results']],
+            ['updated', 'invalid_status', 'not_found', 'invalid_id']
+        )
+        self.applications[0].refresh_from_db()
+        self.assertEqual(self.applications[0].status, 'shortlisted')
+        self.assertIsNotNone(self.applications[0].reviewed_at)
+        self.foreign_application.refresh_from_db()
+        self.assertEqual(self.foreign_application.status, 'pending')
+
+    def test_query_count_independent_of_batch_size(self):
+        def review(applications):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(self.url, {'reviews': [
+                    {'id': str(application.pk), 'status': 'reviewed'} for application in applications
+                ]}, format='json')
+            return len(queries)
+
+        self.assertEqual(review(self.applications[:2]), review(self.applications))
+        self.assertEqual(JobApplication.objects.filter(status='reviewed').count(), 40)
+
+class ApplicationCounterTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        self.job = Job.objects.create(
+            company=Company.objects.create(name='Tech Corp', employer=self.employer),
+            title='Python Developer',
+            description='We are looking for a Python developer',
+            is_approved=True
+        )
+        self.applications = [
+            JobApplication.objects.create(
+                job=self.job,
+                applicant=User.objects.create(username=f'applicant{number}', email=f'applicant{number}@example.com')
+            )
+            for number in range(4)
+        ]
+        self.client.force_authenticate(user=self.employer)
+
+    def stats(self):
+        return self.client.get(reverse('job-application-stats', args=[self.job.pk])).data
+
+    def test_counters_follow_every_write_path(self):
+        self.assertEqual(self.stats()['pending'], 4)
+
+        self.client.put(reverse('review-application', args=[self.applications[0].pk]), {'status': 'hired'})
+        self.client.post(reverse('bulk-review-applications'), {'reviews': [
+            {'id': str(self.applications[1].pk), 'status': 'rejected'},
+        ]}, format='json')
+        self.client.force_login(self.admin)
+        self.client.post(reverse('admin:jobs_jobapplication_changelist'), {
+            'action': 'mark_shortlisted',
+            '_selected_action': [self.applications[2].pk, self.applications[1].pk],
+        })
+        JobApplication.objects.get(pk=self.applications[3].pk).delete()
+
+        self.assertEqual(self.stats(), {
+            'total': 3, 'pending': 0, 'reviewed': 0, 'shortlisted': 2, 'rejected': 0, 'hired': 1,
+        })
+        dashboard = self.client.get(reverse('dashboard-stats')).data
+        self.assertEqual(dashboard['total_applications'], 3)
+        self.assertEqual(dashboard['applications_by_status']['shortlisted'], 2)
+
+    def test_set_status_locks_without_grouping(self):
+        # PostgreSQL rejects FOR UPDATE together with GROUP BY
+        with CaptureQueriesContext(connection) as queries:
+            updated = counters.set_status(JobApplication.objects.filter(job=self.job), 'reviewed')
+        self.assertEqual(updated, 4)
+        self.assertFalse(any('GROUP BY' in query['sql'] for query in queries.captured_queries))
+        self.assertEqual(self.stats()['reviewed'], 4)
+
+    def test_repair_command_rebuilds_counters(self):
+        JobApplicationStats.objects.filter(job=self.job).update(total=99, pending=0)
+        call_command('rebuild_application_counters', stdout=io.StringIO())
+        self.assertEqual(self.stats()['total'], 4)
+        self.assertEqual(self.stats()['pending'], 4)
+
+class NearbyJobsTest(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@example.com',
+            password='testpass123',
+            is_employer=True
+        )
+        self.learner = User.objects.create_user(
+            username='learner',
+            email='learner@example.com',
+            password='testpass123'
+        )
+        company = Company.objects.create(name='Tech Corp', employer=self.employer)
+        for title, location in [('Lagos Role', 'Lagos'), ('Abeokuta Role', 'Abeokuta, Nigeria'),
+                                ('Ibadan Role', 'Ibadan'), ('Remote Role', 'Remote')]:
+            Job.objects.create(
+                company=company,
+                title=title,
+                description='A job posting for testing locations',
+                location=location,
+                is_approved=True
+            )
+        UserProfile.objects.create(user=self.learner, location='lagos,  Nigeria')
+        self.client.force_authenticate(user=self.learner)
+
+    def test_jobs_within_radius_of_profile(self):
+        self.assertEqual(self.learner.profile.place.name, 'Lagos')
+        response = self.client.get(reverse('nearby-jobs'), {'radius_km': 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['title'] for job in response.data['results']], ['Lagos Role', 'Abeokuta Role'])
+        self.assertAlmostEqual(response.data['results'][1]['distance_km'], 69, delta=2)
+
+        response = self.client.get(reverse('nearby-jobs'), {'radius_km': 150, 'lat': 7.38, 'lon': 3.95})
+        self.assertEqual(response.data['results'][0]['title'], 'Ibadan Role')
+
+    def test_rejects_invalid_coordinates_and_radius(self):
+        url = reverse('nearby-jobs')
+        for params in [{'lat': 'nan', 'lon': '3.4'}, {'lat': '6.5', 'lon': 'nan'}, {'radius_km': 'nan'},
+                       {'lat': 'inf', 'lon': '3.4'}, {'radius_km': 'inf'}, {'lat': '91', 'lon': '3.4'},
+                       {'lat': '6.5', 'lon': '-181'}, {'radius_km': '-5'}, {'radius_km': '0'}]:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_limit_keeps_the_closest_jobs(self):
+        company = Company.objects.get()
+        for index in range(3):
+            Job.objects.create(company=company, title=f'Ibadan Role {index}', description='Farther away',
+                               location='Ibadan', is_approved=True)
+        with mock.patch('jobs.views.NEARBY_JOBS_LIMIT', 2):
+            response = self.client.get(reverse('nearby-jobs'), {'radius_km': 150})
+        self.assertEqual([job['title'] for job in response.data['results']], ['Lagos Role', 'Abeokuta Role'])
+
+    def test_location_filter_uses_gazetteer(self):
+        response = self.client.get(reverse('list-jobs'), {'location': 'LAGOS'})
+        self.assertEqual([job['title'] for job in response.data['results']], ['Lagos Role'])
+        # Text the gazetteer cannot resolve still matches by substring
+        Job.objects.create(company=Company.objects.get(), title='Lekki Role', description='Unresolved place',
+                           location='Lekki, Lagos', is_approved=True)
+        response = self.client.get(reverse('list-jobs'), {'location': 'Lagos'})
+        self.assertEqual(sorted(job['title'] for job in response.data['results']), ['Lagos Role', 'Lekki Role'])
+        response = self.client.get(reverse('list-jobs'), {'location': 'remo'})
+        self.assertEqual([job['title'] for job in response.data['results']], ['Remote Role'])
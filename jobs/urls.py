@@ -1,12 +1,15 @@
 from django.urls import path
 from .views import (
-    list_jobs, create_job, get_job, update_job, delete_job,
-    apply_for_job, my_applications, job_applications, review_application
+    list_jobs, recommended_jobs, nearby_jobs, create_job, get_job, update_job, delete_job,
+    apply_for_job, my_applications, job_applications, job_application_stats, export_job_applications,
+    review_application, bulk_review_applications
 )
 
 urlpatterns = [
     path('', list_jobs, name='list-jobs'),
     path('create/', create_job, name='create-job'),
+    path('recommended/', recommended_jobs, name='recommended-jobs'),
+    path('nearby/', nearby_jobs, name='nearby-jobs'),
     path('<uuid:job_id>/', get_job, name='get-job'),
     path('<uuid:job_id>/update/', update_job, name='update-job'),
     path('<uuid:job_id>/delete/', delete_job, name='delete-job'),
@@ -15,5 +18,8 @@ urlpatterns = [
     path('<uuid:job_id>/apply/', apply_for_job, name='apply-for-job'),
     path('my-applications/', my_applications, name='my-applications'),
     path('<uuid:job_id>/applications/', job_applications, name='job-applications'),
+    path('<uuid:job_id>/applications/stats/', job_application_stats, name='job-application-stats'),
+    path('<uuid:job_id>/applications/export/', export_job_applications, name='export-job-applications'),
     path('applications/<uuid:application_id>/review/', review_application, name='review-application'),
+    path('applications/bulk-review/', bulk_review_applications, name='bulk-review-applications'),
 ]
\ No newline at end of file
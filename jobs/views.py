@@ -1,47 +1,80 @@
+import math
+
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.paginator import Paginator
+from django.http import StreamingHttpResponse
+from . import counters, matching, reviews, search
 from .models import Job, JobApplication
-from core.models import User, Company
+from .resumes import ResumeUploadLimitHandler
+from core.cache import cache_catalog_response
+from core.conditional import catalog_etag, etag_response
+from core.geo import locations_within, resolve_location
+from core.models import User, Company, UserProfile
+from core.pagination import InvalidCursor, keyset_paginate
+from core.streaming import csv_lines, ndjson_lines
 from .serializers import JobSerializer, JobApplicationSerializer
+from .tasks import process_resume
+
+JOB_CURSOR_ORDERING = ['-posted_at', '-id']
+
+NEARBY_JOBS_LIMIT = 200
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@etag_response(catalog_etag('jobs'))
+@cache_catalog_response('jobs')
 def list_jobs(request):
-    jobs = Job.objects.filter(is_approved=True)
-    
-    # Search functionality
-    search = request.GET.get('search', '')
-    if search:
-        jobs = jobs.filter(
-            models.Q(title__icontains=search) |
-            models.Q(description__icontains=search) |
-            models.Q(company__name__icontains=search)
-        )
+    jobs = Job.objects.live().select_related('company')
+    
+    # Search functionality, ranked by relevance when the full-text index is available
+    search_query = request.GET.get('search', '')
+    ranked = False
+    if search_query:
+        searched = search.search_jobs(jobs, search_query)
+        ranked = searched is not None
+        if ranked:
+            jobs = searched
+        else:
+            jobs = jobs.filter(
+                models.Q(title__icontains=search_query) |
+                models.Q(description__icontains=search_query) |
+                models.Q(company__name__icontains=search_query)
+            )
     
     # Filter by job type
     job_type = request.GET.get('job_type', '')
     if job_type:
         jobs = jobs.filter(job_type=job_type)
     
-    # Filter by location
+    # Filter by location, through the gazetteer index when the name is known
     location = request.GET.get('location', '')
     if location:
-        jobs = jobs.filter(location__icontains=location)
+        place = resolve_location(location)
+        if place is not None:
+            # Postings whose own text did not resolve still match on the text, as before
+            jobs = jobs.filter(
+                models.Q(place=place) | models.Q(place__isnull=True, location__icontains=location)
+            )
+        else:
+            jobs = jobs.filter(location__icontains=location)
     
     # Filter by company
     company_id = request.GET.get('company', '')
     if company_id:
         jobs = jobs.filter(company__id=company_id)
     
-    # Order by most recent
-    jobs = jobs.order_by('-posted_at')
+    # Order by relevance for ranked searches, otherwise by most recent
+    if ranked:
+        jobs = jobs.order_by('search_rank', '-posted_at')
+    else:
+        jobs = jobs.order_by('-posted_at')
     
     # Pagination
     page = request.GET.get('page', 1)
@@ -55,6 +88,30 @@ def list_jobs(request):
         page = 1
         page_size = 10
     
+    # Cursor (keyset) pagination: ?pagination=cursor for the first page, then ?cursor=<next/previous>.
+    # Pages are ordered by (posted_at, id) and served from the matching index; counting is opt-in.
+    # Relevance order cannot be keyset-paginated, so searches use page numbers.
+    cursor = request.GET.get('cursor', '')
+    if cursor or request.GET.get('pagination') == 'cursor':
+        if search_query:
+            return Response({"message": "Cursor pagination is not available with search; use page"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            jobs_page, next_cursor, previous_cursor = keyset_paginate(
+                jobs, JOB_CURSOR_ORDERING, cursor=cursor, page_size=max(page_size, 1)
+            )
+        except InvalidCursor:
+            return Response({"message": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+        data = {
+            'results': JobSerializer(jobs_page, many=True).data,
+            'next': next_cursor,
+            'previous': previous_cursor,
+            'page_size': page_size,
+        }
+        if request.GET.get('count') == 'true':
+            data['count'] = jobs.count()
+        return Response(data)
+
     paginator = Paginator(jobs, page_size)
     jobs_page = paginator.get_page(page)
     
@@ -71,6 +128,64 @@ def list_jobs(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def recommended_jobs(request):
+    try:
+        limit = min(int(request.GET.get('limit', 10)), 50)
+    except ValueError:
+        limit = 10
+
+    scores = dict(matching.recommended_jobs(request.user, limit=max(limit, 1)))
+    jobs = Job.objects.live().filter(pk__in=scores).select_related('company')
+    jobs = sorted(jobs, key=lambda job: scores[job.pk], reverse=True)
+
+    results = JobSerializer(jobs, many=True).data
+    for job, data in zip(jobs, results):
+        data['match_score'] = round(scores[job.pk], 4)
+    return Response({'results': results})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def nearby_jobs(request):
+    # Centre on ?lat=&lon= when given, otherwise on the user's profile location
+    try:
+        radius_km = float(request.GET.get('radius_km', 50))
+        if request.GET.get('lat') and request.GET.get('lon'):
+            latitude, longitude = float(request.GET['lat']), float(request.GET['lon'])
+        else:
+            profile = UserProfile.objects.select_related('place').filter(user=request.user).first()
+            if profile is None or profile.place is None:
+                return Response({"message": "Set a recognised profile location or pass lat and lon"},
+                                status=status.HTTP_400_BAD_REQUEST)
+            latitude, longitude = profile.place.latitude, profile.place.longitude
+    except ValueError:
+        return Response({"message": "Invalid coordinates or radius"}, status=status.HTTP_400_BAD_REQUEST)
+    # Comparisons with NaN are false, so these also reject non-numbers; infinities fail the ranges
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180 and 0 < radius_km < math.inf):
+        return Response({"message": "Invalid coordinates or radius"}, status=status.HTTP_400_BAD_REQUEST)
+    radius_km = min(radius_km, 1000)
+    
+    # Closest first, so the cap drops the farthest jobs rather than the oldest
+    distances = locations_within(latitude, longitude, radius_km)
+    jobs = []
+    if distances:
+        distance = models.Case(
+            *[models.When(place_id=place_id, then=models.Value(km)) for place_id, km in distances.items()],
+            output_field=models.FloatField(),
+        )
+        jobs = list(
+            Job.objects.live().filter(place__in=distances).annotate(distance_km=distance)
+            .select_related('company').order_by('distance_km', '-posted_at')[:NEARBY_JOBS_LIMIT]
+        )
+    
+    results = JobSerializer(jobs, many=True).data
+    for job, data in zip(jobs, results):
+        data['distance_km'] = round(job.distance_km, 1)
+    return Response({'results': results, 'radius_km': radius_km})
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_job(request):
@@ -105,8 +220,9 @@ def create_job(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@etag_response(catalog_etag('jobs'))
 def get_job(request, job_id):
-    job = get_object_or_404(Job, pk=job_id)
+    job = get_object_or_404(Job.objects.select_related('company'), pk=job_id)
     serializer = JobSerializer(job)
     return Response(serializer.data)
 
@@ -144,6 +260,8 @@ def delete_job(request, job_id):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def apply_for_job(request, job_id):
+    # Must be installed before request.data is first read
+    request.upload_handlers.insert(0, ResumeUploadLimitHandler(request))
     job = get_object_or_404(Job, pk=job_id)
     
     # Check if job is approved
@@ -155,7 +273,7 @@ def apply_for_job(request, job_id):
         return Response({"message": "Already applied for this job"}, status=status.HTTP_400_BAD_REQUEST)
     
     # Check if deadline has passed
-    if job.deadline and timezone.now() > job.deadline:
+    if job.is_closed or (job.deadline and timezone.now() > job.deadline):
         return Response({"message": "Application deadline has passed"}, status=status.HTTP_400_BAD_REQUEST)
     
     serializer = JobApplicationSerializer(data=request.data)
@@ -168,6 +286,10 @@ def apply_for_job(request, job_id):
         resume=serializer.validated_data.get('resume', None)
     )
     
+    # Text extraction runs on a worker once the application row is committed
+    if application.resume:
+        transaction.on_commit(lambda: process_resume.delay(application.pk))
+    
     response_serializer = JobApplicationSerializer(application)
     return Response({"message": "Application submitted successfully", "application": response_serializer.data}, 
                    status=status.HTTP_201_CREATED)
@@ -176,7 +298,7 @@ def apply_for_job(request, job_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_applications(request):
-    applications = JobApplication.objects.filter(applicant=request.user)
+    applications = JobApplication.objects.filter(applicant=request.user).select_related('job', 'applicant')
     serializer = JobApplicationSerializer(applications, many=True)
     return Response(serializer.data)
 
@@ -190,11 +312,69 @@ def job_applications(request, job_id):
     if not (job.company.employer == request.user or request.user.is_staff):
         return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
     
-    applications = JobApplication.objects.filter(job=job)
+    applications = JobApplication.objects.filter(job=job).select_related('job', 'applicant')
+    
+    # Search the text extracted from applicants' resumes
+    resume_query = request.GET.get('resume', '')
+    if resume_query:
+        applications = applications.filter(
+            resume_document__status='processed',
+            resume_document__text__icontains=resume_query
+        )
+    
     serializer = JobApplicationSerializer(applications, many=True)
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_application_stats(request, job_id):
+    job = get_object_or_404(Job.objects.select_related('company'), pk=job_id)
+    
+    # Only employer who posted the job or admin can view application stats
+    if not (job.company.employer_id == request.user.pk or request.user.is_staff):
+        return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
+    
+    return Response(counters.stats_for_job(job.pk))
+
+
+# Columns of the application export, fetched with a single joined query
+APPLICATION_EXPORT_FIELDS = [
+    'id', 'applicant__username', 'applicant__email', 'applicant__profile__location',
+    'applicant__profile__skills', 'applicant__profile__experience_level', 'status',
+    'cover_letter', 'resume', 'applied_at', 'reviewed_at',
+]
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_job_applications(request, job_id):
+    job = get_object_or_404(Job.objects.select_related('company'), pk=job_id)
+
+    # Only employer who posted the job or admin can export applications
+    if not (job.company.employer_id == request.user.pk or request.user.is_staff):
+        return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+    export_type = request.GET.get('type', 'csv')
+    if export_type not in ('csv', 'ndjson'):
+        return Response({"message": "Export type must be csv or ndjson"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Rows are pulled in chunks (server-side cursor on PostgreSQL) while the response streams
+    rows = (
+        JobApplication.objects.filter(job=job)
+        .order_by('applied_at', 'id')
+        .values_list(*APPLICATION_EXPORT_FIELDS)
+        .iterator(chunk_size=1000)
+    )
+    header = [field.split('__')[-1] for field in APPLICATION_EXPORT_FIELDS]
+    if export_type == 'csv':
+        response = StreamingHttpResponse(csv_lines(header, rows), content_type='text/csv')
+    else:
+        response = StreamingHttpResponse(ndjson_lines(header, rows), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="job-{job.pk}-applications.{export_type}"'
+    return response
+
+
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def review_application(request, application_id):
@@ -213,4 +393,24 @@ def review_application(request, application_id):
     application.save()
     
     serializer = JobApplicationSerializer(application)
-    return Response(serializer.data)
\ No newline at end of file
+    return Response(serializer.data)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_review_applications(request):
+    if not (request.user.is_employer or request.user.is_staff):
+        return Response({"message": "Not Authorized"}, status=status.HTTP_403_FORBIDDEN)
+    
+    items = request.data.get('reviews')
+    if not isinstance(items, list) or not items:
+        return Response({"message": "reviews must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > reviews.MAX_BULK_REVIEWS:
+        return Response({"message": f"At most {reviews.MAX_BULK_REVIEWS} reviews per request"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    results = reviews.bulk_review(request.user, items)
+    return Response({
+        'updated': sum(1 for result in results if result['result'] == 'updated'),
+        'results': results
+    })
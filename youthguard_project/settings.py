@@ -88,10 +88,85 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Take the write lock at BEGIN so concurrent wallet writers queue
+            # (up to `timeout` seconds) instead of failing on lock upgrades.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        'TEST': {
+            # A file rather than shared-cache memory, so tests can use several connections
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
 
+# Cache
+# Redis (via django-redis) when REDIS_URL is set, otherwise per-process local memory.
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a cached catalog listing (jobs, courses, tasks) may live; writes invalidate it sooner.
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', 300))
+
+# Buffer course progress pings and flush them in batches (see courses/progress.py).
+# On by default only with Redis, since the local fallback is per process.
+COURSE_PROGRESS_BUFFERING = os.getenv('COURSE_PROGRESS_BUFFERING', 'true' if REDIS_URL else 'false').lower() == 'true'
+
+# Withdrawal payouts are settled in batches by this backend (see earn/payouts.py).
+PAYOUT_BACKEND = os.getenv('PAYOUT_BACKEND', 'earn.payouts.LocalGateway')
+PAYOUT_BATCH_SIZE = int(os.getenv('PAYOUT_BATCH_SIZE', 100))
+
+
+# Background tasks (Celery)
+# Without a broker, tasks run inline in the calling process (development and tests).
+
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
+
+# Periodic tasks, run by `celery -A youthguard_project beat`
+CELERY_BEAT_SCHEDULE = {
+    'close-expired-jobs': {
+        'task': 'jobs.tasks.close_expired_jobs',
+        'schedule': 15 * 60,
+    },
+    'flush-course-progress': {
+        'task': 'courses.tasks.flush_progress',
+        'schedule': 30,
+    },
+    'reclaim-expired-work-leases': {
+        'task': 'earn.tasks.reclaim_expired_leases',
+        'schedule': 5 * 60,
+    },
+    'settle-payouts': {
+        'task': 'earn.tasks.settle_payouts',
+        'schedule': 60,
+    },
+    'rebuild-course-recommendations': {
+        'task': 'courses.tasks.rebuild_recommendations',
+        'schedule': 24 * 60 * 60,
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -128,6 +203,13 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files (avatars, resumes)
+
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+RESUME_MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 